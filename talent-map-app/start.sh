@@ -1,26 +1,57 @@
 #!/bin/bash
+# Démarrage du conteneur : ./start.sh [web|release|all] (défaut : $START_MODE, sinon web)
+#   web     : attente active de la base, migrations seulement s'il en manque (MIGRATE_ON_START=1,
+#             défaut), puis le serveur. Les fichiers statiques sont collectés à la construction de l'image.
+#   release : étape de mise en production, une fois par déploiement (preDeployCommand sur Render) :
+#             migrations manquantes et réglages effectifs de la base. Avec elle, MIGRATE_ON_START=0.
+#   all     : release, collectstatic puis le serveur (image sans fichiers statiques, développement).
+set -e
 
-# Attendre que la base de données soit prête (si PostgreSQL)
-if [ "$DATABASE_URL" != "" ]; then
-  echo "En attente de la base de données..."
-  sleep 2
-fi
-
-# Appliquer les migrations
-echo "Application des migrations..."
-python manage.py migrate --noinput
+MODE=${1:-${START_MODE:-web}}
+STARTED=$(date +%s%N)
 
-# Collecter les fichiers statiques
-echo "Collecte des fichiers statiques..."
-python manage.py collectstatic --noinput --clear
+# Migrations manquantes appliquées après une attente active de la base (une seule initialisation de Django)
+release() {
+  python manage.py release --timeout "${DB_WAIT_TIMEOUT:-30}"
+}
 
-# Créer un superutilisateur si nécessaire (optionnel, peut être fait manuellement)
-# python manage.py createsuperuser --noinput || true
+case "$MODE" in
+  release)
+    release
+    exit 0
+    ;;
+  all)
+    release
+    echo "Collecte des fichiers statiques..."
+    python manage.py collectstatic --noinput --clear
+    ;;
+  web)
+    if [ "${MIGRATE_ON_START:-1}" = "1" ]; then
+      release
+    else
+      python manage.py wait_for_db --timeout "${DB_WAIT_TIMEOUT:-30}"
+    fi
+    # image construite sans collectstatic : rattrapage (sans --clear, seuls les fichiers modifiés sont retraités)
+    if [ ! -f staticfiles/staticfiles.json ]; then
+      echo "Fichiers statiques absents de l'image, collecte..."
+      python manage.py collectstatic --noinput
+    fi
+    ;;
+  *)
+    echo "Mode inconnu : $MODE (web, release ou all)" >&2
+    exit 2
+    ;;
+esac
 
 # Utiliser le port fourni par Render ou 8000 par défaut
 PORT=${PORT:-8000}
 
-# Démarrer le serveur Gunicorn
-echo "Démarrage du serveur sur le port $PORT..."
-exec gunicorn talent_map_project.wsgi:application --bind 0.0.0.0:$PORT --workers 2 --timeout 120
-
+# Démarrer le serveur Gunicorn : WSGI par défaut, SERVER_MODE=asgi pour les vues de lecture asynchrones
+SERVER_MODE=${SERVER_MODE:-wsgi}
+WEB_WORKERS=${WEB_WORKERS:-2}
+echo "Préparation terminée en $(( ($(date +%s%N) - STARTED) / 1000000 )) ms."
+echo "Démarrage du serveur ($SERVER_MODE) sur le port $PORT..."
+if [ "$SERVER_MODE" = "asgi" ]; then
+  exec gunicorn talent_map_project.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT --workers $WEB_WORKERS --timeout 120
+fi
+exec gunicorn talent_map_project.wsgi:application --bind 0.0.0.0:$PORT --workers $WEB_WORKERS --timeout 120
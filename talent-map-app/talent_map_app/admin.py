@@ -1,4 +1,34 @@
 from django.contrib import admin
-from .models import UserProfile
+from .models import UserProfile, Skill, SkillAlias
+from . import review
 
-admin.site.register(UserProfile)
\ No newline at end of file
+
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'education_level', 'is_validated', 'validated_at', 'rejected_at', 'created_at')
+    list_filter = ('is_validated', 'education_level')
+    search_fields = ('user__username', 'user__email')
+    list_select_related = ('user',)
+    actions = ['validate_profiles', 'reject_profiles']
+
+    @admin.action(description="Valider les profils sélectionnés")
+    def validate_profiles(self, request, queryset):
+        count = review.apply_review(queryset.values_list('pk', flat=True), review.VALIDATE, request.user)
+        self.message_user(request, f"{count} profil(s) validé(s).")
+
+    @admin.action(description="Refuser les profils sélectionnés")
+    def reject_profiles(self, request, queryset):
+        count = review.apply_review(queryset.values_list('pk', flat=True), review.REJECT, request.user)
+        self.message_user(request, f"{count} profil(s) refusé(s).")
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key')
+    search_fields = ('key',)
+
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = ('alias', 'canonical')
+    search_fields = ('key', 'canonical_key')
@@ -0,0 +1,205 @@
+"""
+Carte des talents de l'organisation : graphe de co-occurrence compétences / passions
+sur l'ensemble des profils validés.
+
+Les compteurs sont tenus à jour de façon incrémentale : à chaque sauvegarde d'un profil,
+on calcule la différence entre son ancienne contribution (mémorisée dans
+`TalentMapEntry`) et la nouvelle, puis on applique ce delta aux lignes `TalentMapCount`
+avec des `UPDATE ... SET count = count + n`. Aucune requête ne relit tous les profils.
+
+Chaque contribution est ventilée par niveau d'études et par langue ('*' = tous), pour
+servir les filtres de la carte sans recalcul.
+"""
+import hashlib
+from collections import Counter
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import F
+
+from .skills import normalize_key, split_list
+
+ALL = '*'
+NODE, EDGE = 'node', 'edge'
+# au-delà, les arêtes d'un profil (n² / 2) ne sont calculées que pour ses premiers éléments
+MAX_EDGE_NODES = 15
+
+
+def count_key(education_level, language, kind, source, target=''):
+    raw = '|'.join((education_level, language, kind, source, target))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def profile_snapshot(is_validated, education_level, languages, skills, passions):
+    """Données normalisées dont dépend la contribution d'un profil (mémorisées dans TalentMapEntry)."""
+    if not is_validated:
+        return {}
+    nodes = {}
+    for prefix, items in (('s', skills), ('p', passions)):
+        for label in items:
+            key = normalize_key(label)[:80]
+            if key:
+                nodes.setdefault(f'{prefix}:{key}', label[:100])
+    return {
+        'education_level': education_level or '',
+        'languages': sorted({normalize_key(l)[:50] for l in languages} - {''}),
+        'nodes': nodes,
+    }
+
+
+def contribution(snapshot):
+    """Lignes de compteurs (tuple -> 1) correspondant à un profil."""
+    rows = Counter()
+    if not snapshot:
+        return rows
+    node_ids = sorted(snapshot['nodes'])
+    edges = list(combinations(node_ids[:MAX_EDGE_NODES], 2))
+    for education_level in {snapshot['education_level'], ALL}:
+        for language in [ALL, *snapshot['languages']]:
+            for node in node_ids:
+                rows[(education_level, language, NODE, node, '')] += 1
+            for source, target in edges:
+                rows[(education_level, language, EDGE, source, target)] += 1
+    return rows
+
+
+def apply_delta(count_model, old_snapshot, new_snapshot):
+    """Applique (nouvelle - ancienne) contribution aux compteurs ; 4 à 5 requêtes quel que soit le profil."""
+    delta = contribution(new_snapshot)
+    delta.subtract(contribution(old_snapshot))
+    labels = {**(old_snapshot or {}).get('nodes', {}), **(new_snapshot or {}).get('nodes', {})}
+    apply_counts(count_model, delta, labels)
+
+
+def apply_counts(count_model, delta, labels):
+    """Ajoute `delta` (ligne -> n, positif ou négatif) aux compteurs ; `labels` : libellés des nœuds."""
+    delta = {row: n for row, n in delta.items() if n}
+    if not delta:
+        return
+    by_key = {count_key(*row): row for row in delta}
+    with transaction.atomic():
+        # lignes manquantes créées à 0, puis incrément atomique groupé par valeur du delta
+        count_model.objects.bulk_create([
+            count_model(
+                key=key, education_level=row[0], language=row[1], kind=row[2],
+                source=row[3], target=row[4], label=labels.get(row[3], '') if row[2] == NODE else '',
+                count=0,
+            )
+            for key, row in by_key.items() if delta[row] > 0
+        ], ignore_conflicts=True, batch_size=500)
+        by_value = {}
+        for key, row in by_key.items():
+            by_value.setdefault(delta[row], []).append(key)
+        for value, keys in by_value.items():
+            for i in range(0, len(keys), 500):
+                count_model.objects.filter(key__in=keys[i:i + 500]).update(count=F('count') + value)
+        count_model.objects.filter(key__in=[k for k, row in by_key.items() if delta[row] < 0], count__lte=0).delete()
+
+
+def snapshot_for(profile):
+    return profile_snapshot(
+        profile.is_validated, profile.education_level,
+        split_list(profile.languages), split_list(profile.skills), split_list(profile.passions),
+    )
+
+
+def update_profile(profile):
+    """
+    Met à jour les compteurs pour un profil sauvegardé (signals.py) ou revu (review.py).
+
+    La ligne du profil est verrouillée et relue dans la même requête : deux mises à jour
+    concurrentes du même profil (sauvegarde et tâche de validation, par ex.) passent
+    l'une après l'autre, la seconde partant de l'instantané écrit par la première ; un
+    delta n'est jamais appliqué deux fois.
+    """
+    from .models import TalentMapCount, TalentMapEntry, UserProfile
+    with transaction.atomic(savepoint=False):
+        current = (
+            UserProfile.objects.select_for_update().filter(pk=profile.pk)
+            .values_list('is_validated', 'education_level', 'languages', 'skills', 'passions').first()
+        )
+        if current is None:
+            return
+        is_validated, education_level, languages, skills, passions = current
+        new = profile_snapshot(
+            is_validated, education_level, split_list(languages), split_list(skills), split_list(passions),
+        )
+        entry = TalentMapEntry.objects.filter(profile_id=profile.pk).first()
+        old = entry.snapshot if entry else {}
+        if old == new:
+            return
+        apply_delta(TalentMapCount, old, new)
+        TalentMapEntry.objects.update_or_create(profile_id=profile.pk, defaults={'snapshot': new})
+
+
+def add_profiles(profiles):
+    """Ajoute d'un coup la contribution de profils nouvellement créés (import en masse, sans signaux)."""
+    from .models import TalentMapCount, TalentMapEntry
+    totals = Counter()
+    labels = {}
+    entries = []
+    for profile in profiles:
+        snapshot = snapshot_for(profile)
+        if snapshot:
+            totals.update(contribution(snapshot))
+            labels.update(snapshot['nodes'])
+            entries.append(TalentMapEntry(profile_id=profile.pk, snapshot=snapshot))
+    apply_counts(TalentMapCount, totals, labels)
+    TalentMapEntry.objects.bulk_create(entries, batch_size=500)
+
+
+def remove_profile(profile_id):
+    """Retire la contribution d'un profil supprimé."""
+    from .models import TalentMapCount, TalentMapEntry
+    with transaction.atomic(savepoint=False):
+        entry = TalentMapEntry.objects.select_for_update().filter(profile_id=profile_id).first()
+        if entry is not None:
+            apply_delta(TalentMapCount, entry.snapshot, {})
+            entry.delete()
+
+
+def rebuild(profile_model, count_model, entry_model):
+    """Recalcule tous les compteurs (migration initiale, commande `rebuild_talent_map`)."""
+    totals = Counter()
+    labels = {}
+    entries = []
+    profiles = profile_model.objects.filter(is_validated=True).only(
+        'id', 'is_validated', 'education_level', 'languages', 'skills', 'passions',
+    )
+    for profile in profiles.iterator(chunk_size=500):
+        snapshot = snapshot_for(profile)
+        totals.update(contribution(snapshot))
+        labels.update({k: v for k, v in snapshot.get('nodes', {}).items() if k not in labels})
+        entries.append(entry_model(profile_id=profile.pk, snapshot=snapshot))
+    with transaction.atomic():
+        count_model.objects.all().delete()
+        entry_model.objects.all().delete()
+        count_model.objects.bulk_create([
+            count_model(
+                key=count_key(*row), education_level=row[0], language=row[1], kind=row[2],
+                source=row[3], target=row[4], label=labels.get(row[3], '') if row[2] == NODE else '', count=n,
+            )
+            for row, n in totals.items()
+        ], batch_size=500)
+        entry_model.objects.bulk_create(entries, batch_size=500)
+
+
+def graph_payload(count_model, education_level='', language='', max_nodes=100):
+    """
+    Graphe filtré au format compact :
+    {"nodes": [[id, libellé, "skill"|"passion", nb profils], ...], "edges": [[i, j, poids], ...]}
+    (i, j = indices dans `nodes`). Deux requêtes indexées sur (niveau, langue, type).
+    """
+    education_level = education_level or ALL
+    language = normalize_key(language)[:50] or ALL
+    base = count_model.objects.filter(education_level=education_level, language=language)
+    nodes = list(base.filter(kind=NODE).order_by('-count', 'source').values_list('source', 'label', 'count')[:max_nodes])
+    index = {source: i for i, (source, _, _) in enumerate(nodes)}
+    edges = [
+        [index[s], index[t], n]
+        for s, t, n in base.filter(kind=EDGE, source__in=index, target__in=index).values_list('source', 'target', 'count')
+    ]
+    return {
+        'nodes': [[source, label, 'skill' if source.startswith('s:') else 'passion', n] for source, label, n in nodes],
+        'edges': edges,
+    }
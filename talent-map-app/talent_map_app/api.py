@@ -0,0 +1,284 @@
+"""
+API JSON en lecture seule (tableaux de bord internes).
+
+- GET /api/profiles/                 liste paginée (mêmes filtres que la recherche : q, education_level, ...)
+- GET /api/search/                   alias de la liste
+- GET /api/profiles/<user_id>/       détail d'un profil
+- GET /api/profiles/<user_id>/map/   données de la carte de talents
+- GET /api/talent-map/               graphe agrégé de l'organisation (education_level, language)
+- GET /skills/autocomplete/?prefix=py  suggestions de compétences (public, formulaires d'inscription)
+- GET /api/match/?skills=a,b&k=10    profils les plus proches de compétences requises
+- POST /api/review/                  {"action": "validate"|"reject", "ids": [...]} (staff)
+- GET /api/collaborations/<id>/matches/  idem pour une demande de collaboration (demandeur ou staff)
+
+`?fields=a,b` limite les champs sérialisés (et les colonnes lues en base).
+Chaque réponse porte un `ETag` et un `Last-Modified` calculés à partir de
+`UserProfile.updated_at` par une requête d'agrégat légère : un client qui renvoie
+`If-None-Match` / `If-Modified-Since` reçoit un 304 sans aucune sérialisation.
+L'ETag de la liste / recherche inclut en plus la génération du vocabulaire (fuzzy.py) :
+un synonyme ajouté ou modifié change les termes étendus, donc les résultats, sans
+toucher aux profils.
+Les GET lisent sur une réplique si elles sont configurées (`replicas.read_replica`).
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
+
+from . import aggregation, autocomplete, fuzzy, matching, review
+from .cache import cached_by_generation
+from .forms import SearchForm
+from .models import Collaboration, TalentMapCount, UserProfile
+from .replicas import read_replica
+from .search import search_criteria, search_page
+from .sessions import current_profile
+from .skills import normalize_key
+
+# nom du champ exposé -> (colonnes à charger, fonction de sérialisation)
+API_FIELDS = {
+    'id': (('user_id',), lambda p: p.user_id),
+    'username': (('user__username',), lambda p: p.user.username),
+    'name': (('user__username', 'user__first_name', 'user__last_name'),
+             lambda p: p.user.get_full_name() or p.user.username),
+    'education_level': (('education_level',), lambda p: p.education_level),
+    'bio': (('bio',), lambda p: p.bio or ''),
+    'skills': (('parsed_skills',), lambda p: p.skills_list),
+    'languages': (('parsed_languages',), lambda p: p.languages_list),
+    'passions': (('parsed_passions',), lambda p: p.passions_list),
+    'projects': (('projects',), lambda p: p.projects or ''),
+    'links': (('linkedin', 'github', 'youtube', 'website'),
+              lambda p: {k: getattr(p, k) for k in ('linkedin', 'github', 'youtube', 'website') if getattr(p, k)}),
+    'is_validated': (('is_validated',), lambda p: p.is_validated),
+    'created_at': (('created_at',), lambda p: p.created_at.isoformat()),
+    'updated_at': (('updated_at',), lambda p: p.updated_at.isoformat()),
+}
+LIST_FIELDS = ('id', 'username', 'name', 'education_level', 'skills')
+DETAIL_FIELDS = tuple(API_FIELDS)
+
+MATCH_LIMIT = 50
+
+# colonnes toujours nécessaires (clés, pagination par curseur)
+_BASE_COLUMNS = ('id', 'user_id', 'user__id', 'created_at', 'updated_at')
+
+
+def compact_json(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False})
+
+
+def api_login_required(view):
+    """Comme login_required, mais répond 401 en JSON au lieu de rediriger vers la page de connexion."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return compact_json({'detail': 'Authentification requise.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def requested_fields(request, default):
+    """Champs demandés via `?fields=` (inconnus ignorés), sinon `default`."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return default
+    fields = tuple(f for f in (s.strip() for s in raw.split(',')) if f in API_FIELDS)
+    return fields or default
+
+
+def columns_for(fields):
+    columns = list(_BASE_COLUMNS)
+    for field in fields:
+        columns.extend(c for c in API_FIELDS[field][0] if c not in columns)
+    return columns
+
+
+def serialize(profile, fields):
+    return {field: API_FIELDS[field][1](profile) for field in fields}
+
+
+def _etag(*parts):
+    return hashlib.md5('|'.join(str(p) for p in parts).encode(), usedforsecurity=False).hexdigest()
+
+
+# --- Validateurs conditionnels (une requête d'agrégat, mémorisée sur la requête) ---
+
+def _collection_state(request):
+    if not hasattr(request, '_api_collection_state'):
+        request._api_collection_state = UserProfile.objects.aggregate(last=Max('updated_at'), total=Count('pk'))
+    return request._api_collection_state
+
+
+def collection_etag(request, *args, **kwargs):
+    state = _collection_state(request)
+    return _etag(state['last'], state['total'], request.user.pk, request.GET.urlencode())
+
+
+def search_etag(request, *args, **kwargs):
+    return _etag(collection_etag(request), fuzzy.vocabulary_generation())
+
+
+def collection_last_modified(request, *args, **kwargs):
+    return _collection_state(request)['last']
+
+
+def _profile_updated_at(request, pk):
+    if not hasattr(request, '_api_profile_updated_at'):
+        request._api_profile_updated_at = (
+            UserProfile.objects.filter(user_id=pk).values_list('updated_at', flat=True).first()
+        )
+    return request._api_profile_updated_at
+
+
+def profile_etag(request, pk, **kwargs):
+    updated_at = _profile_updated_at(request, pk)
+    if updated_at is None:
+        return None
+    return _etag(pk, updated_at.timestamp(), request.path, request.GET.urlencode())
+
+
+def profile_last_modified(request, pk, **kwargs):
+    return _profile_updated_at(request, pk)
+
+
+# --- Vues ---
+
+@read_replica
+@require_GET
+@api_login_required
+@condition(etag_func=search_etag, last_modified_func=collection_last_modified)
+def profiles(request):
+    """Liste / recherche de profils (hors utilisateur connecté), paginée comme la recherche HTML."""
+    form = SearchForm(request.GET or None)
+    if request.GET and not form.is_valid():
+        return compact_json({'errors': form.errors}, status=400)
+    fields = requested_fields(request, LIST_FIELDS)
+    criteria = search_criteria(form.cleaned_data if form.is_bound else None)
+    page = search_page(criteria, request.GET, exclude_user_id=request.user.pk, only_fields=columns_for(fields))
+    next_query = None
+    if page.has_next:
+        params = request.GET.copy()
+        for name in ('page', 'cursor'):
+            params.pop(name, None)
+        params.update(page.next_params)
+        next_query = params.urlencode()
+    return compact_json({
+        'results': [serialize(p, fields) for p in page],
+        'next': f"{request.path}?{next_query}" if next_query else None,
+    })
+
+
+@read_replica
+@require_GET
+@api_login_required
+@condition(etag_func=profile_etag, last_modified_func=profile_last_modified)
+def profile_detail(request, pk):
+    fields = requested_fields(request, DETAIL_FIELDS)
+    profile = (
+        UserProfile.objects.select_related('user').only(*columns_for(fields))
+        .filter(user_id=pk).first()
+    )
+    if profile is None:
+        return compact_json({'detail': 'Profil non trouvé.'}, status=404)
+    return compact_json(serialize(profile, fields))
+
+
+@read_replica
+@require_GET
+@api_login_required
+@condition(etag_func=profile_etag, last_modified_func=profile_last_modified)
+def talent_map(request, pk):
+    profile = UserProfile.objects.only('id', 'parsed_skills', 'parsed_passions').filter(user_id=pk).first()
+    if profile is None:
+        return compact_json({'detail': 'Profil non trouvé.'}, status=404)
+    return compact_json(profile.talent_data())
+
+
+@read_replica
+@require_GET
+@api_login_required
+@condition(etag_func=collection_etag, last_modified_func=collection_last_modified)
+def organization_map(request):
+    """Graphe de co-occurrence compétences / passions des profils validés (compteurs pré-agrégés)."""
+    education_level = request.GET.get('education_level', '')
+    if education_level and education_level not in dict(UserProfile.EDUCATION_CHOICES):
+        return compact_json({'errors': {'education_level': ['Niveau inconnu.']}}, status=400)
+    language = request.GET.get('language', '')
+    payload = cached_by_generation(
+        'talent_map', (education_level, normalize_key(language)),
+        lambda: aggregation.graph_payload(TalentMapCount, education_level, language),
+    )
+    return compact_json(payload)
+
+
+def _requested_k(request, default=10):
+    try:
+        return min(max(int(request.GET.get('k', default)), 1), MATCH_LIMIT)
+    except ValueError:
+        return default
+
+
+def _match_response(request, matches):
+    """Profils classés (une requête pour les k profils retenus), avec score et nombre de compétences communes."""
+    fields = requested_fields(request, LIST_FIELDS)
+    profiles = UserProfile.objects.select_related('user').only(*columns_for(fields)).in_bulk(
+        [m.profile_id for m in matches]
+    )
+    return compact_json({'results': [
+        {**serialize(profiles[m.profile_id], fields), 'score': m.score, 'matched_skills': m.matched}
+        for m in matches if m.profile_id in profiles
+    ]})
+
+
+@read_replica
+@require_GET
+@api_login_required
+def match(request):
+    skills = request.GET.get('skills', '')
+    profile = current_profile(request)
+    exclude = [profile.pk] if profile else []
+    return _match_response(request, matching.match_profiles(skills, _requested_k(request), exclude=exclude))
+
+
+@read_replica
+@require_GET
+@api_login_required
+def collaboration_matches(request, pk):
+    collaboration = get_object_or_404(Collaboration, pk=pk)
+    if collaboration.requester_id != request.user.pk and not request.user.is_staff:
+        return compact_json({'detail': 'Accès refusé.'}, status=403)
+    return _match_response(request, matching.candidates_for(collaboration, _requested_k(request)))
+
+
+@read_replica
+@require_GET
+@cache_control(max_age=60)
+def skill_autocomplete(request):
+    """Sans authentification : utilisé aussi par le formulaire d'inscription. Servi depuis la mémoire."""
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        limit = 10
+    return compact_json({'results': autocomplete.suggest(request.GET.get('prefix', ''), max(limit, 1))})
+
+
+@require_POST
+@api_login_required
+def review_profiles(request):
+    """Validation / refus en masse (ids de profils) ; les suites sont traitées en arrière-plan."""
+    if not request.user.is_staff:
+        return compact_json({'detail': 'Accès refusé.'}, status=403)
+    try:
+        payload = json.loads(request.body or b'{}')
+        action = payload.get('action')
+        ids = [int(pk) for pk in payload.get('ids', [])]
+    except (ValueError, TypeError, AttributeError):
+        return compact_json({'detail': 'JSON invalide.'}, status=400)
+    if action not in review.ACTIONS:
+        return compact_json({'errors': {'action': [f"Valeurs possibles : {', '.join(review.ACTIONS)}."]}}, status=400)
+    if len(ids) > review.MAX_BATCH:
+        return compact_json({'errors': {'ids': [f"{review.MAX_BATCH} profils au maximum par lot."]}}, status=400)
+    return compact_json({'updated': review.apply_review(ids, action, request.user)})
@@ -2,4 +2,12 @@ from django.apps import AppConfig
 
 class TalentMapAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'talent_map_app'
\ No newline at end of file
+    name = 'talent_map_app'
+
+    def ready(self):
+        from django.core import checks
+        from django.db.backends.signals import connection_created
+        from . import db, performance, signals  # noqa: F401
+        connection_created.connect(db.configure_connection, dispatch_uid='talent_map_app.db')
+        connection_created.connect(performance.install_query_wrapper, dispatch_uid='talent_map_app.performance')
+        checks.register(db.check_database_settings, checks.Tags.database)
@@ -0,0 +1,293 @@
+"""
+Chaîne des fichiers statiques : minification à la collecte et poids des pages.
+
+`MinifiedManifestStaticFilesStorage` minifie les scripts et feuilles de style de
+l'application (`js/*.js`, `css/*.css`) juste avant que WhiteNoise ne les renomme avec
+leur empreinte et ne les précompresse (gzip, et brotli si le paquet `Brotli` est
+installé). Les fichiers à empreinte sont servis par WhiteNoise avec
+`Cache-Control: max-age=315360000, public, immutable`.
+
+Les minifieurs sont volontairement prudents : ils retirent commentaires et blancs sans
+réécrire le code. Les sauts de ligne du JavaScript sont conservés là où l'insertion
+automatique de points-virgules pourrait en dépendre.
+"""
+import gzip
+import logging
+import os
+import re
+from fnmatch import fnmatch
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - WhiteNoise se limite alors à gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MINIFY_PATTERNS = ('js/*.js', 'css/*.css')
+
+# --- JavaScript ---
+
+# blancs supprimés autour de ces caractères (ni + - / * . : `a - -b`, `a / b`...)
+_JS_TIGHT = set('{}()[];,:=<>!?&|')
+# saut de ligne supprimé après (resp. avant) ces caractères : aucune insertion de ';' possible
+_JS_JOIN_AFTER = set('{([,;=:&|?')
+_JS_JOIN_BEFORE = set('})].,;:?&|')
+# après ces caractères ou mots-clés, un '/' ouvre une expression régulière
+# (sauf après `++` / `--` postfixés : `i++ / 2` est une division)
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield'}
+_WORD = re.compile(r'[\w$]+$')
+
+
+def _regex_allowed(out):
+    code = ''.join(out[-40:]).rstrip()
+    if not code:
+        return True
+    if code.endswith(('++', '--')):
+        return False
+    if code[-1] in _REGEX_AFTER:
+        return True
+    word = _WORD.search(code)
+    return bool(word) and word.group() in _REGEX_KEYWORDS
+
+
+def _skip_string(source, i, quote):
+    """Indice suivant la fin de la chaîne (ou du littéral regex) ouverte en `i`."""
+    n = len(source)
+    i += 1
+    in_class = False
+    while i < n:
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if quote == '/' and c == '[':
+            in_class = True
+        elif quote == '/' and c == ']':
+            in_class = False
+        elif c == quote and not in_class:
+            return i + 1
+        elif c == '\n' and quote != '`':
+            raise ValueError("Chaîne non terminée")
+        i += 1
+    raise ValueError("Chaîne non terminée")
+
+
+def minify_js(source):
+    """Retire commentaires et blancs superflus ; ne modifie ni chaînes, ni gabarits, ni regex."""
+    out = []
+    templates = []  # profondeur d'accolades de chaque `${` ouvert
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+        if c in ' \t\r\n\f\v':
+            j = i
+            while j < n and source[j] in ' \t\r\n\f\v':
+                j += 1
+            # un commentaire qui suit fait partie du blanc
+            if source.startswith('//', j) or source.startswith('/*', j):
+                if source.startswith('//', j):
+                    end = source.find('\n', j)
+                    end = n if end == -1 else end
+                else:
+                    end = source.find('*/', j + 2)
+                    if end == -1:
+                        raise ValueError("Commentaire non terminé")
+                    end += 2
+                newline = '\n' in source[i:end]
+                source = source[:i] + ('\n' if newline else ' ') + source[end:]
+                n = len(source)
+                continue
+            gap = source[i:j]
+            prev = out[-1][-1] if out else ''
+            following = source[j] if j < n else ''
+            if not prev or not following:
+                pass
+            elif '\n' in gap:
+                if prev not in _JS_JOIN_AFTER and following not in _JS_JOIN_BEFORE:
+                    out.append('\n')
+            elif prev not in _JS_TIGHT and following not in _JS_TIGHT:
+                out.append(' ')
+            i = j
+            continue
+        if c == '/' and nxt == '/':
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if c == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            if end == -1:
+                raise ValueError("Commentaire non terminé")
+            # `a/**/b` : le commentaire sépare deux mots
+            source = source[:i] + ' ' + source[end + 2:]
+            n = len(source)
+            continue
+        if c in '\'"' or (c == '/' and _regex_allowed(out)):
+            end = _skip_string(source, i, c)
+            if c == '/':
+                while end < n and (source[end].isalnum() or source[end] in '_$'):
+                    end += 1  # drapeaux
+            out.append(source[i:end])
+            i = end
+            continue
+        if c == '`' or (c == '}' and templates and templates[-1] == 0):
+            if c == '}':
+                templates.pop()
+            j = i + 1
+            while j < n:
+                if source[j] == '\\':
+                    j += 2
+                    continue
+                if source[j] == '`':
+                    j += 1
+                    break
+                if source.startswith('${', j):
+                    templates.append(0)
+                    j += 2
+                    break
+                j += 1
+            else:
+                raise ValueError("Gabarit non terminé")
+            out.append(source[i:j])
+            i = j
+            continue
+        if templates and c == '{':
+            templates[-1] += 1
+        elif templates and c == '}':
+            templates[-1] -= 1
+        out.append(c)
+        i += 1
+    return ''.join(out).strip() + '\n'
+
+
+# --- CSS ---
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_STRING = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+_CSS_SPACE = re.compile(r'\s+')
+# pas de ':' à gauche (`a :hover` ≠ `a:hover`) ni de + (calc)
+_CSS_AROUND = re.compile(r'\s*([{};,>])\s*')
+_CSS_AFTER_COLON = re.compile(r':\s+')
+
+
+def minify_css(source):
+    """Retire commentaires, blancs et derniers points-virgules ; les chaînes sont intactes."""
+    strings = []
+
+    def keep(match):
+        strings.append(match.group())
+        return f'\x00{len(strings) - 1}\x00'
+
+    parts = []
+    pos = 0
+    # chaînes d'abord : elles peuvent contenir `/*`
+    for match in _CSS_STRING.finditer(source):
+        parts.append(_CSS_COMMENT.sub('', source[pos:match.start()]))
+        parts.append(keep(match))
+        pos = match.end()
+    parts.append(_CSS_COMMENT.sub('', source[pos:]))
+    css = _CSS_SPACE.sub(' ', ''.join(parts))
+    css = _CSS_AROUND.sub(r'\1', css)
+    css = _CSS_AFTER_COLON.sub(':', css).replace(';}', '}')
+    css = re.sub('\x00(\\d+)\x00', lambda m: strings[int(m.group(1))], css)
+    return css.strip() + '\n'
+
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+
+class MinifiedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Stockage WhiteNoise (empreintes + gzip/brotli) précédé d'une minification des fichiers de l'application."""
+
+    minify_patterns = MINIFY_PATTERNS
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name, (storage, path) in list(paths.items()):
+                if self.minify(name, storage, path):
+                    # l'empreinte et la compression se calculent sur la copie minifiée, pas sur la source
+                    paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run, **options)
+
+    def minify(self, name, storage, path):
+        """
+        Écrit dans STATIC_ROOT la version minifiée de la source de `name` ; faux si non concerné.
+        Source que le minifieur ne sait pas lire : copiée telle quelle, avec un avertissement.
+        """
+        minifier = MINIFIERS.get(os.path.splitext(name)[1])
+        if not minifier or not any(fnmatch(name, pattern) for pattern in self.minify_patterns):
+            return False
+        # toujours depuis la source : la copie peut dater d'une collecte précédente (déjà minifiée)
+        with storage.open(path) as f:
+            source = f.read().decode('utf-8')
+        try:
+            minified = minifier(source)
+        except ValueError as exc:
+            logger.warning("%s non minifié : %s", name, exc)
+            minified = source
+        with open(self.path(name), 'w', encoding='utf-8') as f:
+            f.write(minified if len(minified) < len(source) else source)
+        return True
+
+
+# --- Poids des pages ---
+
+_ASSET = re.compile(r'<(?:script[^>]*\bsrc|link[^>]*\bhref)="([^"]+)"', re.I)
+
+
+def page_assets(html):
+    """URL des scripts et feuilles de style référencés par une page HTML."""
+    return [url for url in _ASSET.findall(html) if url.endswith(('.js', '.css')) or '.js?' in url or '.css?' in url]
+
+
+def static_path(url):
+    """Chemin du fichier statique servi à `url` (STATIC_ROOT, sinon les dossiers sources)."""
+    name = url.split('?')[0][len(settings.STATIC_URL):]
+    collected = os.path.join(settings.STATIC_ROOT, name)
+    if os.path.exists(collected):
+        return collected
+    return finders.find(name)
+
+
+def encoded_sizes(path):
+    """Tailles brute, gzip et brotli d'un fichier (fichiers précompressés s'ils existent)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = {'raw': len(data)}
+    sizes['gzip'] = (os.path.getsize(path + '.gz') if os.path.exists(path + '.gz')
+                     else len(gzip.compress(data, compresslevel=9, mtime=0)))
+    if os.path.exists(path + '.br'):
+        sizes['br'] = os.path.getsize(path + '.br')
+    elif brotli:
+        sizes['br'] = len(brotli.compress(data))
+    return sizes
+
+
+def page_weight(html):
+    """Poids d'une page : HTML, puis scripts et styles locaux par encodage ; les CDN sont comptés à part."""
+    body = html.encode('utf-8')
+    weight = {
+        'html': {'raw': len(body), 'gzip': len(gzip.compress(body, compresslevel=9, mtime=0))},
+        'assets': {},
+        'external': [],
+    }
+    if brotli:
+        weight['html']['br'] = len(brotli.compress(body))
+    for url in page_assets(html):
+        if not url.startswith(settings.STATIC_URL):
+            weight['external'].append(url)
+            continue
+        path = static_path(url)
+        if path:
+            weight['assets'][url] = encoded_sizes(path)
+    weight['total'] = {
+        encoding: weight['html'].get(encoding, 0) + sum(s.get(encoding, 0) for s in weight['assets'].values())
+        for encoding in weight['html']
+    }
+    return weight
@@ -0,0 +1,98 @@
+"""
+Versions asynchrones des vues de lecture, servies quand l'application tourne sous ASGI
+(`talent_map_project/asgi.py` active `TALENT_ASYNC_VIEWS`).
+
+Sous Django 4.2, l'ORM asynchrone (`afirst()`, ...) exécute chaque requête SQL sur
+l'unique thread « sensible » de l'application : deux recherches lentes s'y
+succéderaient. Les traitements lourds (recherche, rendu des gabarits) passent donc par
+un petit pool de threads dédié (`ASYNC_SEARCH_THREADS`), chacun avec sa propre
+connexion, pendant que la boucle d'événements continue de servir les autres requêtes.
+Avec `ASYNC_SEARCH_THREADS=0`, tout reste sur le thread sensible (tests).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.db import close_old_connections
+from django.http import Http404
+from django.shortcuts import redirect, render
+
+from .models import UserProfile
+from .replicas import read_replica
+from .similarity import similar_profiles
+from .views import search_results
+
+_executor = None
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.ASYNC_SEARCH_THREADS, thread_name_prefix='talent-async')
+    return _executor
+
+
+def _in_worker(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+async def run_sync(fn, *args, **kwargs):
+    """Exécute `fn` (code synchrone, ORM compris) hors de la boucle d'événements."""
+    if not getattr(settings, 'ASYNC_SEARCH_THREADS', 0):
+        return await sync_to_async(fn)(*args, **kwargs)
+    return await sync_to_async(_in_worker(fn), thread_sensitive=False, executor=_pool())(*args, **kwargs)
+
+
+def async_login_required(view):
+    """Équivalent de `login_required` pour une vue `async def` (Django 4.2 n'en fournit pas)."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # request.user est paresseux : session et utilisateur sont lus en base à la première évaluation
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@read_replica
+@async_login_required
+async def search_profiles(request):
+    """Version asynchrone de `views.search_profiles`."""
+    user_id = request.user.pk
+
+    def respond():
+        template, context = search_results(request, user_id)
+        return render(request, template, context)
+
+    return await run_sync(respond)
+
+
+@read_replica
+@async_login_required
+async def profile_detail(request, pk):
+    profile = await UserProfile.objects.select_related('user').filter(user__id=pk).afirst()
+    if profile is None:
+        messages.error(request, 'Profil non trouvé.')
+        return redirect('home')
+    context = {'profile': profile, 'similar': similar_profiles(profile)}  # lu au rendu, dans le thread
+    return await run_sync(partial(render, request, 'profile/detail.html', context))
+
+
+@read_replica
+@async_login_required
+async def talent_map(request, pk):
+    profile = await UserProfile.objects.select_related('user').filter(user__id=pk).afirst()
+    if profile is None:
+        raise Http404("Profil non trouvé.")
+    context = {'profile': profile, 'talent_data': profile.talent_data()}
+    return await run_sync(partial(render, request, 'talent_map/visualization.html', context))
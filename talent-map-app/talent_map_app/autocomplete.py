@@ -0,0 +1,170 @@
+"""
+Suggestions de compétences pour la saisie (`/skills/autocomplete/?prefix=`).
+
+Le vocabulaire est gardé en mémoire dans chaque processus sous forme de tableau trié de
+clés normalisées : les clés commençant par un préfixe forment une tranche contiguë,
+trouvée par dichotomie (`bisect`). Les suggestions sont classées par popularité (nombre
+de profils déclarant la compétence). Une requête ne touche pas la base.
+
+Les sauvegardes de profil faites par le processus ajustent directement les poids, après
+commit (`record_links`) ; un compteur de version dans le cache Django indique aux autres
+processus de recharger le tableau (une requête d'agrégat) à la demande suivante. Sans
+cache partagé (locmem), ce compteur ne voit pas les autres workers : la vérification de
+fond commune aux index (`cache.check_indexes`) reconstruit alors le tableau hors requête
+quand les liens en base ne correspondent plus à ceux qu'il a lus.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .cache import register_index_refresher
+from .skills import normalize_key
+
+GENERATION_KEY = 'tm:autocomplete:generation'
+MAX_SUGGESTIONS = 20
+# au-delà, les préfixes très courts ne parcourent que les premières clés de la tranche
+MAX_SCAN = 5000
+
+
+class PrefixIndex:
+    """Tableau trié de (clé, skill_id) avec libellé et popularité de chaque compétence."""
+
+    def __init__(self, rows=()):
+        self.entries = []
+        self.names = {}
+        self.weights = {}
+        for skill_id, key, name, weight in rows:
+            self.names[skill_id] = name
+            self.weights[skill_id] = weight
+            self.entries.append((key, skill_id))
+        self.entries.sort()
+        self.version = None
+
+    @classmethod
+    def from_database(cls):
+        """Index et version des liens lus (nombre, plus grand id ; voir `cache.skill_tables_version`), même requête."""
+        from .models import Skill
+        rows = Skill.objects.annotate(weight=Count('profile_links'), last_link=Max('profile_links__id'))
+        count, last = 0, 0
+
+        def entries():
+            nonlocal count, last
+            for skill_id, key, name, weight, last_link in rows.values_list(
+                'id', 'key', 'name', 'weight', 'last_link',
+            ).iterator(chunk_size=5000):
+                count += weight
+                last = max(last, last_link or 0)
+                yield skill_id, key, name, weight
+
+        index = cls(entries())
+        index.version = (count, last)
+        return index
+
+    def add(self, skill_id, key, name):
+        if skill_id not in self.names:
+            self.names[skill_id] = name
+            self.weights[skill_id] = 0
+            insort(self.entries, (key, skill_id))
+
+    def adjust(self, skill_id, delta):
+        if skill_id in self.weights:
+            self.weights[skill_id] = max(self.weights[skill_id] + delta, 0)
+
+    def suggest(self, prefix, limit=10):
+        """Libellés des compétences utilisées dont la clé commence par `prefix`, les plus populaires d'abord."""
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self.entries, (prefix,))
+        candidates = []
+        for key, skill_id in self.entries[start:start + MAX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            weight = self.weights[skill_id]
+            if weight:
+                candidates.append((weight, key, skill_id))
+        best = heapq.nsmallest(limit, candidates, key=lambda c: (-c[0], c[1]))
+        return [self.names[skill_id] for _, _, skill_id in best]
+
+
+_index = None
+_generation = None
+_lock = threading.Lock()
+
+
+def generation():
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        value = cache.get(GENERATION_KEY, 0)
+    return value
+
+
+def _bump():
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        return generation()
+
+
+def prefix_index():
+    """Index du processus courant, rechargé si un autre processus a modifié les compétences."""
+    global _index, _generation
+    current = generation()
+    with _lock:
+        if _index is None or _generation != current:
+            _index, _generation = PrefixIndex.from_database(), current
+        return _index
+
+
+@register_index_refresher
+def refresh_prefix_index(version):
+    """Vérification de fond : reconstruit le tableau chargé si les liens en base ont changé (autres workers)."""
+    global _index, _generation
+    if _index is None or _index.version == version.links:
+        return
+    current = generation()
+    index = PrefixIndex.from_database()  # hors verrou : les requêtes gardent l'ancien tableau en attendant
+    with _lock:
+        _index, _generation = index, current
+
+
+def suggest(prefix, limit=10):
+    return prefix_index().suggest(prefix, min(limit, MAX_SUGGESTIONS))
+
+
+def record_links(added=(), removed=(), new_skills=()):
+    """
+    Met à jour les poids après modification des compétences d'un ou plusieurs profils :
+    `added` / `removed` : skill_ids liés / déliés (un par lien), `new_skills` : (id, clé, libellé).
+    Appliqué après commit : une sauvegarde annulée ne fausse pas les poids.
+    """
+    changes = (list(added), list(removed), list(new_skills))
+    transaction.on_commit(lambda: _publish(*changes))
+
+
+def _publish(added, removed, new_skills):
+    global _generation
+    current = _bump()
+    with _lock:
+        if _index is not None:
+            for skill_id, key, name in new_skills:
+                _index.add(skill_id, key, name)
+            for skill_id in added:
+                _index.adjust(skill_id, 1)
+            for skill_id in removed:
+                _index.adjust(skill_id, -1)
+        # à jour avant ce changement (appliqué localement) : pas de rechargement
+        if _generation is not None and _generation + 1 == current:
+            _generation = current
+
+
+def invalidate():
+    """Rechargement complet par tous les processus (suppression de profils, import...)."""
+    _bump()
+    transaction.on_commit(_bump)
@@ -0,0 +1,109 @@
+"""
+Mesures de performance des pages principales (commande `benchmark`).
+
+Chaque scénario envoie des requêtes au processus courant via le client de test Django
+(sans serveur ni réseau) et relève la durée et le nombre de requêtes SQL de chacune. Les
+résultats peuvent être enregistrés comme référence (JSON) puis comparés aux mesures
+suivantes : une requête SQL de plus, ou une moyenne nettement plus lente, est une régression.
+Le p95 de quelques dizaines de mesures est trop bruité pour servir de seuil, et la médiane
+saute d'une requête à l'autre quand un scénario alterne des requêtes de durées différentes.
+"""
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+SEARCHES = {
+    'search_single': [{'q': term} for term in ('python', 'react', 'docker', 'figma', 'rust')],
+    'search_multi': [{'q': q} for q in ('python django', 'react typescript node.js', 'sql pandas statistiques')],
+    'search_filters': [
+        {'q': 'python', 'education_level': 'master', 'language': 'anglais'},
+        {'education_level': 'licence', 'language': 'espagnol'},
+    ],
+    'search_sort_oldest': [{'sort_by': 'oldest'}, {'q': 'java', 'sort_by': 'oldest'}],
+    'search_sort_relevance': [{'q': 'machine learning', 'sort_by': 'relevance'}, {'q': 'web', 'sort_by': 'relevance'}],
+}
+SCENARIOS = tuple(SEARCHES) + ('profile_detail', 'talent_map', 'signup')
+SIGNUP_PREFIX = 'bench_signup'
+# écart de moyenne (ms) en dessous duquel une différence est considérée comme du bruit
+NOISE_FLOOR_MS = 5.0
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def scenario_request(name, i, profile_ids, run_id):
+    """(méthode, chemin, données, statut attendu) de la i-ème requête du scénario `name`."""
+    if name in SEARCHES:
+        params = SEARCHES[name]
+        return 'get', '/search/', params[i % len(params)], 200
+    if name == 'profile_detail':
+        return 'get', f'/profile/{profile_ids[i % len(profile_ids)]}/', None, 200
+    if name == 'talent_map':
+        return 'get', f'/profile/{profile_ids[i % len(profile_ids)]}/map/', None, 200
+    if name == 'signup':
+        username = f'{SIGNUP_PREFIX}_{run_id}_{i}'
+        return 'post', '/signup/', {
+            'username': username, 'email': f'{username}@example.com',
+            'password1': 'Bench-pass-2024!', 'password2': 'Bench-pass-2024!',
+            'bio': 'Profil de mesure', 'skills': 'Python, Django', 'education_level': 'licence',
+            'languages': 'Français',
+        }, 302
+    raise ValueError(f"Scénario inconnu : {name}")
+
+
+def measure(client, name, iterations, warmup, profile_ids, run_id, before_each=None):
+    """Durées (ms) et nombres de requêtes SQL des `iterations` requêtes mesurées."""
+    durations, queries = [], []
+    for i in range(warmup + iterations):
+        if before_each:
+            before_each()
+        method, path, data, expected = scenario_request(name, i, profile_ids, run_id)
+        if name == 'signup':
+            client.logout()
+        with ExitStack() as stack:
+            # toutes les bases (répliques comprises, voir replicas.py)
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            start = time.perf_counter()
+            response = getattr(client, method)(path, data)
+            elapsed = time.perf_counter() - start
+        if response.status_code != expected:
+            raise RuntimeError(f"{name} : {method.upper()} {path} a répondu {response.status_code} (attendu {expected})")
+        if i >= warmup:
+            durations.append(elapsed * 1000)
+            queries.append(sum(len(c) for c in captured))
+    return summarize(durations, queries)
+
+
+def summarize(durations, queries):
+    return {
+        'n': len(durations),
+        'mean_ms': round(statistics.mean(durations), 2),
+        'p50_ms': round(percentile(durations, 0.50), 2),
+        'p95_ms': round(percentile(durations, 0.95), 2),
+        'p99_ms': round(percentile(durations, 0.99), 2),
+        'max_ms': round(max(durations), 2),
+        'queries': statistics.median_low(queries),
+        'queries_max': max(queries),
+    }
+
+
+def compare(results, baseline, threshold=0.25):
+    """Régressions (textes) par rapport à une référence enregistrée : requêtes SQL en plus, moyenne plus lente."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name} : {previous['queries']} -> {current['queries']} requêtes SQL")
+        slower = current['mean_ms'] - previous['mean_ms']
+        if slower > NOISE_FLOOR_MS and current['mean_ms'] > previous['mean_ms'] * (1 + threshold):
+            regressions.append(f"{name} : moyenne {previous['mean_ms']} -> {current['mean_ms']} ms")
+    return regressions
@@ -0,0 +1,296 @@
+"""
+Cache des fragments rendus (cartes de profil, page détail, carte de talents), des pages
+anonymes et des résultats de recherche.
+
+Les clés contiennent l'id du profil et son `updated_at` : une modification du profil
+produit naturellement une nouvelle clé. Les signaux (`signals.py`) suppriment en plus
+les anciennes entrées dès la sauvegarde / suppression d'un profil ou de son utilisateur,
+pour ne pas attendre l'expiration.
+
+Les résultats de recherche (listes ordonnées d'ids) sont gardés dans un LRU en mémoire
+par processus, avec TTL ; la clé inclut un compteur de génération stocké dans le cache
+Django et incrémenté à chaque écriture de profil. Avec un backend partagé (Redis,
+Memcached, fichiers) tous les processus sont invalidés d'un coup ; avec locmem, les
+autres workers le sont au plus tard à l'expiration du TTL. Il en va de même des agrégats
+mis en cache par génération (`cached_by_generation`), gardés `GENERATION_CACHE_TIMEOUT`
+secondes (60 par défaut avec locmem, `TALENT_CACHE_TIMEOUT` avec un cache partagé).
+
+Les index gardés en mémoire par processus (matrice de correspondance, vocabulaire,
+autocomplétion) suivent aussi des compteurs de génération. Sans cache partagé, ces
+compteurs ne voient pas les écritures des autres workers : un thread de fond par
+processus serveur (`start_index_watcher`, lancé par wsgi.py / asgi.py) lit toutes les
+`INDEX_RECHECK_SECONDS` la version des tables de compétences, en une requête pour tous
+les index (`skill_tables_version`), et reconstruit hors requête ceux qui ont changé.
+Les requêtes ne touchent jamais la base pour cette vérification ; en contrepartie, un
+worker sert l'ancien index jusqu'à la fin de la reconstruction suivante.
+
+Le backend est celui de `CACHES['default']` (locmem ou fichiers en local, tout backend
+Django en production, voir `settings.CACHE_BACKEND`).
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'tm'
+# Types de fragments mis en cache par profil (voir templatetags/profile_cache.py)
+FRAGMENT_KINDS = ('card', 'detail', 'map')
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(kind, outcome):
+    with _stats_lock:
+        _stats[f'{kind}_{outcome}'] += 1
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    """Compteurs hit/miss du processus courant (globaux et par type de fragment)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.setdefault('hits', 0)
+    stats.setdefault('misses', 0)
+    return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def timeout():
+    return getattr(settings, 'TALENT_CACHE_TIMEOUT', 600)
+
+
+def fragment_key(kind, profile_id, updated_at):
+    stamp = updated_at.timestamp() if updated_at else 0
+    return f'{KEY_PREFIX}:frag:{kind}:{profile_id}:{stamp}'
+
+
+def get_or_render_fragment(kind, profile, render):
+    """Retourne le fragment `kind` du profil depuis le cache, ou l'obtient via `render()` et le stocke."""
+    key = fragment_key(kind, profile.pk, profile.updated_at)
+    html = cache.get(key)
+    if html is not None:
+        _count(kind, 'hits')
+        return html
+    _count(kind, 'misses')
+    html = render()
+    cache.set(key, html, timeout())
+    return html
+
+
+def invalidate_profile(profile_id, updated_at):
+    """Supprime tous les fragments d'une version donnée d'un profil."""
+    cache.delete_many([fragment_key(kind, profile_id, updated_at) for kind in FRAGMENT_KINDS])
+
+
+def page_key(name):
+    return f'{KEY_PREFIX}:page:{name}'
+
+
+def get_page(name):
+    content = cache.get(page_key(name))
+    _count(f'page_{name}', 'hits' if content is not None else 'misses')
+    return content
+
+
+def set_page(name, content):
+    cache.set(page_key(name), content, timeout())
+
+
+class LRUCache:
+    """Dictionnaire borné (éviction du moins récemment utilisé) dont les entrées expirent après `ttl` secondes."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+SEARCH_GENERATION_KEY = f'{KEY_PREFIX}:search:generation'
+SKILL_LINKS_GENERATION_KEY = f'{KEY_PREFIX}:skill_links:generation'
+_search_results = None
+
+
+def search_results_cache():
+    global _search_results
+    if _search_results is None:
+        _search_results = LRUCache(
+            maxsize=getattr(settings, 'SEARCH_CACHE_SIZE', 256),
+            ttl=getattr(settings, 'SEARCH_CACHE_TTL', 60),
+        )
+    return _search_results
+
+
+def generation(key):
+    value = cache.get(key)
+    if value is None:
+        # clé absente (démarrage, cache vidé ou expulsion) : repartir d'une valeur jamais utilisée
+        # pour ne pas retomber sur des entrées calculées avant la perte du compteur
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key, 0)
+    return value
+
+
+def bump_generation(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return generation(key)
+
+
+def search_generation():
+    return generation(SEARCH_GENERATION_KEY)
+
+
+def bump_search_generation():
+    """Invalide tous les résultats de recherche en cache (appelé à chaque écriture de profil)."""
+    bump_generation(SEARCH_GENERATION_KEY)
+
+
+def skill_links_generation():
+    return generation(SKILL_LINKS_GENERATION_KEY)
+
+
+def skill_links_changed():
+    """Liens profil -> compétence modifiés (matrice de correspondance) : tout de suite et après commit."""
+    bump_generation(SKILL_LINKS_GENERATION_KEY)
+    transaction.on_commit(lambda: bump_generation(SKILL_LINKS_GENERATION_KEY))
+
+
+SkillTablesVersion = namedtuple('SkillTablesVersion', 'links last_skill aliases')
+_index_refreshers = []
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def skill_tables_version():
+    """
+    Version des tables lues par les index en mémoire, en une requête : (nombre de liens
+    profil -> compétence, plus grand id), plus grand id de compétence, (nombre de
+    synonymes, plus grand id). Les ids n'étant jamais réutilisés, tout ajout ou
+    suppression la change.
+    """
+    from .models import ProfileSkill, Skill, SkillAlias
+    links, skills, aliases = (connection.ops.quote_name(m._meta.db_table) for m in (ProfileSkill, Skill, SkillAlias))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT (SELECT COUNT(*) FROM {links}), (SELECT MAX(id) FROM {links}), (SELECT MAX(id) FROM {skills}), "
+            f"(SELECT COUNT(*) FROM {aliases}), (SELECT MAX(id) FROM {aliases})"
+        )
+        link_count, last_link, last_skill, alias_count, last_alias = cursor.fetchone()
+    return SkillTablesVersion((link_count, last_link or 0), last_skill or 0, (alias_count, last_alias or 0))
+
+
+def register_index_refresher(refresh):
+    """Décorateur : `refresh(version)` met à jour un index en mémoire déjà chargé s'il ne correspond plus à `version`."""
+    _index_refreshers.append(refresh)
+    return refresh
+
+
+def check_indexes():
+    """Une vérification commune : version des tables lue une fois, transmise à chaque index."""
+    version = skill_tables_version()
+    for refresh in _index_refreshers:
+        refresh(version)
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            check_indexes()
+        except Exception:
+            logger.exception("Échec de la vérification des index en mémoire")
+        finally:
+            connections.close_all()
+
+
+def start_index_watcher():
+    """
+    Lance, une fois par processus, le thread qui appelle `check_indexes()` toutes les
+    `INDEX_RECHECK_SECONDS` (0 : jamais, le cache partagé suffit). Appelé par les points
+    d'entrée du serveur, pas par les commandes ni les tests.
+    """
+    global _watcher
+    interval = getattr(settings, 'INDEX_RECHECK_SECONDS', 0)
+    with _watcher_lock:
+        if interval and _watcher is None:
+            _watcher = threading.Thread(target=_watch, args=(interval,), name='talent-index-watch', daemon=True)
+            _watcher.start()
+
+
+def cached_search_ids(criteria, compute):
+    """
+    Liste ordonnée de (profile_id, user_id) pour ces critères, depuis le LRU ou via `compute()`.
+    `compute()` peut retourner None (résultat trop volumineux) : rien n'est alors mis en cache.
+    """
+    key = (search_generation(), criteria)
+    rows = search_results_cache().get(key)
+    if rows is not None:
+        _count('search', 'hits')
+        return rows
+    _count('search', 'misses')
+    rows = compute()
+    if rows is not None:
+        rows = tuple(rows)
+        search_results_cache().set(key, rows)
+    return rows
+
+
+def cached_by_generation(name, parts, compute):
+    """
+    Valeur dérivée de l'ensemble des profils (carte de l'organisation, facettes...),
+    stockée dans le cache Django sous une clé liée à la génération courante : toute
+    écriture de profil la rend obsolète.
+    """
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    key = f'{KEY_PREFIX}:{name}:{search_generation()}:{digest}'
+    value = cache.get(key)
+    if value is not None:
+        _count(name, 'hits')
+        return value
+    _count(name, 'misses')
+    value = compute()
+    # borne le retard des autres workers quand le compteur n'est pas partagé (locmem)
+    cache.set(key, value, getattr(settings, 'GENERATION_CACHE_TIMEOUT', timeout()))
+    return value
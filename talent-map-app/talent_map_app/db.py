@@ -0,0 +1,90 @@
+"""
+Réglages des connexions à la base.
+
+SQLite : les PRAGMA de `settings.SQLITE_PRAGMAS` (WAL, synchronous, busy_timeout) sont
+appliqués à chaque nouvelle connexion via le signal `connection_created` ; sans eux, une
+inscription verrouille toute la base et les écritures concurrentes échouent aussitôt.
+PostgreSQL : connexions persistantes vérifiées (`CONN_MAX_AGE`, `CONN_HEALTH_CHECKS`),
+réglées dans settings.py.
+
+`effective_settings()` relit les valeurs réellement en vigueur ; la vérification système
+`check_database_settings` les compare à la configuration (lancée par `migrate` au
+démarrage) et la commande `db_settings` les affiche.
+"""
+from django.conf import settings
+from django.core.checks import Warning
+from django.db import connections
+
+SYNCHRONOUS_LEVELS = {0: 'off', 1: 'normal', 2: 'full', 3: 'extra'}
+# valeurs de PRAGMA acceptées telles quelles (éviter une injection via l'environnement)
+ALLOWED_PRAGMAS = {
+    'journal_mode': {'delete', 'truncate', 'persist', 'memory', 'wal', 'off'},
+    'synchronous': set(SYNCHRONOUS_LEVELS.values()),
+}
+
+
+def sqlite_pragmas():
+    pragmas = dict(getattr(settings, 'SQLITE_PRAGMAS', {}))
+    for name, allowed in ALLOWED_PRAGMAS.items():
+        if name in pragmas and str(pragmas[name]).lower() not in allowed:
+            raise ValueError(f"Valeur invalide pour PRAGMA {name} : {pragmas[name]}")
+    if 'busy_timeout' in pragmas:
+        pragmas['busy_timeout'] = int(pragmas['busy_timeout'])
+    return pragmas
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Récepteur de `connection_created` : PRAGMA SQLite de la nouvelle connexion."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def effective_settings(alias='default'):
+    """Réglages en vigueur sur la connexion `alias` (ouverte si besoin)."""
+    connection = connections[alias]
+    values = {
+        'vendor': connection.vendor,
+        'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+        'conn_health_checks': connection.settings_dict.get('CONN_HEALTH_CHECKS'),
+    }
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in ('journal_mode', 'synchronous', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {name}')
+                values[name] = cursor.fetchone()[0]
+            values['synchronous'] = SYNCHRONOUS_LEVELS.get(values['synchronous'], values['synchronous'])
+        elif connection.vendor == 'postgresql':
+            for name in ('server_version', 'max_connections', 'statement_timeout'):
+                cursor.execute(f'SHOW {name}')
+                values[name] = cursor.fetchone()[0]
+            values['server_side_cursors'] = not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')
+    return values
+
+
+def check_database_settings(app_configs=None, databases=None, **kwargs):
+    """Vérification système (tag `database`) : les réglages demandés sont-ils appliqués ?"""
+    warnings = []
+    for alias in databases or ():
+        connection = connections[alias]
+        values = effective_settings(alias)
+        if connection.vendor == 'sqlite':
+            expected = {name: str(value).lower() for name, value in sqlite_pragmas().items()}
+            if connection.is_in_memory_db():
+                expected.pop('journal_mode', None)  # toujours "memory"
+            for name, value in expected.items():
+                if str(values.get(name)).lower() != value:
+                    warnings.append(Warning(
+                        f"PRAGMA {name} = {values.get(name)} sur '{alias}' (attendu : {value}).",
+                        hint="Système de fichiers sans prise en charge de WAL, ou base ouverte en lecture seule ?",
+                        id='talent_map_app.W001',
+                    ))
+        elif connection.vendor == 'postgresql' and not values['conn_max_age']:
+            warnings.append(Warning(
+                f"CONN_MAX_AGE = 0 sur '{alias}' : une connexion PostgreSQL est ouverte à chaque requête.",
+                hint="Définir DB_CONN_MAX_AGE, ou placer PgBouncer devant la base (DB_PGBOUNCER=1).",
+                id='talent_map_app.W002',
+            ))
+    return warnings
@@ -0,0 +1,142 @@
+"""
+Compteurs de facettes de la recherche : niveaux d'études, langues et compétences les plus
+fréquentes parmi les profils correspondant à la recherche en cours.
+
+Les trois facettes sont calculées par une seule requête (`UNION ALL` de trois agrégats) :
+- niveaux : `GROUP BY education_level` sur les profils ;
+- compétences : `GROUP BY` sur l'index normalisé `ProfileSkill` -> `Skill`, limité aux
+  `FACET_SIZE` plus fréquentes ;
+- langues : éléments de `parsed_languages` dépliés par le SGBD (`json_each` sous SQLite,
+  `jsonb_array_elements_text` sous PostgreSQL ; facette absente ailleurs) et comptés par
+  graphie exacte ; les graphies sont regroupées ensuite par `normalize_key` (casse et
+  accents). Un profil citant deux graphies de la même langue compte deux fois : rare, et
+  trois fois moins cher qu'un `COUNT(DISTINCT)` sur `LOWER(value)`.
+
+Les termes de recherche (plein texte + compétences) sont évalués une seule fois, dans
+une CTE matérialisée partagée par les trois agrégats. Chaque facette ignore son propre
+filtre (sinon choisir "Master" ne laisserait plus que "Master" dans la liste) mais
+applique les autres. Le visiteur est compté comme les autres profils : le résultat ne
+dépend que des critères et se met en cache par génération (`cache.cached_by_generation`),
+donc invalidé à chaque écriture de profil.
+"""
+from collections import namedtuple
+
+from django.db import connection, connections, router
+from django.db.models.expressions import RawSQL
+
+from .cache import cached_by_generation
+from .models import ProfileSkill, Skill, UserProfile
+from .search import filter_profiles, search_queryset
+from .skills import normalize_key
+
+FACET_SIZE = 10
+# table temporaire (CTE) des profils correspondant aux termes de recherche
+HITS = 'facet_hits'
+
+# dépliage d'une liste JSON en lignes (colonne `value`), selon le SGBD
+JSON_ELEMENTS = {
+    'sqlite': 'json_each(p.parsed_languages) AS j',
+    'postgresql': 'jsonb_array_elements_text(p.parsed_languages) AS j(value)',
+}
+
+Facets = namedtuple('Facets', 'education_level language skills')
+
+
+def _hits_sql(criteria):
+    """(sql, params) des ids de profils correspondant aux termes seuls (sans niveau ni langue)."""
+    terms_only = criteria._replace(education_level='', language='', sort_by='newest')
+    return search_queryset(terms_only, only_fields=('id',)).order_by().values('pk').query.sql_with_params()
+
+
+def _scope(criteria, column='p.id'):
+    """Clause WHERE restreignant `column` aux profils de la recherche, vide sans filtre."""
+    qs = UserProfile.objects.order_by()
+    if criteria.terms:
+        qs = qs.filter(pk__in=RawSQL(f'SELECT id FROM {HITS}', ()))
+    qs = filter_profiles(qs, criteria)
+    if qs.query.where:
+        sql, params = qs.values('pk').query.sql_with_params()
+        return f' WHERE {column} IN ({sql})', list(params)
+    return '', []
+
+
+def _materialized():
+    """Indication MATERIALIZED pour la CTE, si le SGBD la comprend (PostgreSQL 12+, SQLite 3.35+)."""
+    if connection.vendor == 'postgresql':
+        return 'MATERIALIZED '
+    if connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35):
+        return 'MATERIALIZED '
+    return ''
+
+
+def facet_query(criteria, size=FACET_SIZE):
+    """(sql, params) de la requête unique : lignes (facette, valeur, libellé, nombre de profils)."""
+    profiles = connection.ops.quote_name(UserProfile._meta.db_table)
+    links = connection.ops.quote_name(ProfileSkill._meta.db_table)
+    skills = connection.ops.quote_name(Skill._meta.db_table)
+
+    where, params = _scope(criteria._replace(education_level=''))
+    parts = [
+        f"SELECT 'education_level' AS facet, p.education_level AS value, p.education_level AS label, "
+        f"COUNT(*) AS n FROM {profiles} p{where} GROUP BY p.education_level"
+    ]
+
+    where, scope_params = _scope(criteria, 'ps.profile_id')
+    # regroupement sur skill_id (index couvrant), libellés joints pour les seules retenues
+    parts.append(
+        f"SELECT 'skills' AS facet, s.key AS value, s.name AS label, top_skills.n AS n "
+        f"FROM (SELECT ps.skill_id, COUNT(*) AS n FROM {links} ps{where} "
+        f"GROUP BY ps.skill_id ORDER BY n DESC, ps.skill_id LIMIT %s) top_skills "
+        f"INNER JOIN {skills} s ON s.id = top_skills.skill_id"
+    )
+    params += scope_params + [size]
+
+    elements = JSON_ELEMENTS.get(connection.vendor)
+    if elements:
+        where, scope_params = _scope(criteria._replace(language=''))
+        # peu de langues distinctes : pas de limite, le regroupement final se fait en Python
+        parts.append(
+            f"SELECT 'language' AS facet, j.value AS value, j.value AS label, COUNT(*) AS n "
+            f"FROM {profiles} p, {elements}{where} GROUP BY j.value"
+        )
+        params += scope_params
+
+    sql = ' UNION ALL '.join(parts)
+    if criteria.terms:
+        # correspondance plein texte + compétences évaluée une fois pour les trois facettes
+        hits, hits_params = _hits_sql(criteria)
+        sql = f'WITH {HITS} (id) AS {_materialized()}({hits}) {sql}'
+        params = list(hits_params) + params
+    return sql, params
+
+
+def compute_facets(criteria, size=FACET_SIZE):
+    sql, params = facet_query(criteria, size)
+    # requête brute : base choisie par le routeur, comme pour l'ORM (réplique des vues de lecture)
+    with connections[router.db_for_read(UserProfile)].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    levels = {value: n for facet, value, label, n in rows if facet == 'education_level'}
+    top_skills = sorted(((label, n) for facet, value, label, n in rows if facet == 'skills'),
+                        key=lambda item: (-item[1], item[0]))
+    spellings = {}
+    for facet, value, label, n in rows:
+        if facet == 'language' and normalize_key(label):
+            spellings.setdefault(normalize_key(label), []).append((n, label))
+    # libellé affiché : la graphie la plus fréquente
+    top_languages = sorted(
+        ((max(variants)[1], sum(n for n, _ in variants)) for variants in spellings.values()),
+        key=lambda item: (-item[1], item[0]),
+    )[:size]
+    return Facets(
+        education_level=[(value, label, levels.get(value, 0)) for value, label in UserProfile.EDUCATION_CHOICES],
+        language=top_languages,
+        skills=top_skills,
+    )
+
+
+def search_facets(criteria, size=FACET_SIZE):
+    """Facettes de la recherche `criteria`, en cache par critères normalisés (le tri n'y change rien)."""
+    return cached_by_generation('facets', (criteria._replace(sort_by=''), size),
+                                lambda: compute_facets(criteria, size))
@@ -1,10 +1,37 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import BaseUserCreationForm
 from django.contrib.auth.models import User
 from .models import UserProfile, Collaboration
+from .skills import unique_by_key
 
+# index uniques insensibles à la casse (migration 0009) -> champ en conflit ;
+# auth_user_username_key : contrainte UNIQUE de la colonne sous PostgreSQL (nom identique)
+UNIQUE_INDEX_FIELDS = {
+    'auth_user_username_ci': 'username',
+    'auth_user_email_ci': 'email',
+    'auth_user_username_key': 'username',
+}
 
-class UserRegistrationForm(UserCreationForm):
+
+def violated_index(exc):
+    """
+    Nom de l'index unique violé : diagnostic du pilote (psycopg), sinon nom cité dans le
+    message (SQLite : "UNIQUE constraint failed: index 'auth_user_email_ci'"). Le reste du
+    message n'est pas lu : il peut contenir la valeur saisie (DETAIL sous PostgreSQL).
+    """
+    name = getattr(getattr(exc.__cause__, 'diag', None), 'constraint_name', None)
+    if name:
+        return name
+    message = str(exc)
+    return next((index for index in UNIQUE_INDEX_FIELDS if f"'{index}'" in message), None)
+
+
+class UserRegistrationForm(BaseUserCreationForm):
+    """
+    Unicité du nom d'utilisateur et de l'e-mail (casse ignorée) garantie par les index uniques
+    de la base (migration 0009) : pas de requête d'existence avant l'insertion, les conflits
+    sont rattachés au bon champ par `add_integrity_error`.
+    """
     email = forms.EmailField(required=True, help_text="Adresse e‑mail valide (obligatoire).")
     first_name = forms.CharField(required=False)
     last_name = forms.CharField(required=False)
@@ -13,11 +40,21 @@ class UserRegistrationForm(UserCreationForm):
         model = User
         fields = ("username", "first_name", "last_name", "email", "password1", "password2")
 
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email__iexact=email).exists():
-            raise forms.ValidationError("Un compte utilise déjà cette adresse e‑mail.")
-        return email
+    def validate_unique(self):
+        pass
+
+    def add_integrity_error(self, exc):
+        """
+        Reporte sur le formulaire la violation d'unicité levée à l'insertion de l'utilisateur.
+        Toute autre erreur d'intégrité (profil, clé étrangère...) est relevée telle quelle.
+        """
+        field = UNIQUE_INDEX_FIELDS.get(violated_index(exc))
+        if field is None:
+            raise exc
+        if field == 'email':
+            self.add_error('email', "Un compte utilise déjà cette adresse e‑mail.")
+        else:
+            self.add_error('username', "Le nom d'utilisateur est déjà utilisé. Choisissez-en un autre.")
 
     def save(self, commit=True):
         user = super().save(commit=False)
@@ -52,6 +89,7 @@ class UserProfileForm(forms.ModelForm):
         """
         Récupère toutes les valeurs POST nommées 'skills' (plusieurs inputs possibles)
         puis normalise en chaîne séparée par des virgules stockée en base.
+        Les doublons (casse / accents) sont retirés : ils pointeraient vers la même `Skill`.
         """
         # self.data est un QueryDict => getlist retourne toutes les valeurs du même nom
         raw_list = []
@@ -61,8 +99,11 @@ class UserProfileForm(forms.ModelForm):
             raw_val = self.cleaned_data.get('skills') or ''
             raw_list = [raw_val]
 
-        cleaned = [s.strip() for s in raw_list if s and s.strip()]
-        return ', '.join(cleaned)
+        cleaned = []
+        for raw in raw_list:
+            # un même input peut contenir "Python, Django" (fallback texte libre)
+            cleaned.extend(s.strip() for s in (raw or '').split(',') if s.strip())
+        return ', '.join(unique_by_key(cleaned))
 
 
 class CollaborationForm(forms.ModelForm):
@@ -81,10 +122,10 @@ class CollaborationForm(forms.ModelForm):
 class SearchForm(forms.Form):
     """
     Formulaire de recherche pour trouver des collaborateurs.
-    - q : recherche libre (skills, bio, projets, nom)
+    - q : recherche libre plein texte (skills, bio, passions, projets, nom), voir fulltext.py
     - education_level : filtre par niveau d'études
     - language : filtre par langue (recherche partielle)
-    - sort_by : tri simple ('relevance' ou 'newest')
+    - sort_by : 'relevance' (score plein texte), 'newest' ou 'oldest'
     """
     q = forms.CharField(required=False, widget=forms.TextInput(attrs={
         'class': 'form-control', 'placeholder': 'Ex: Python, Django, IA, UX...'
@@ -94,4 +135,11 @@ class SearchForm(forms.Form):
     sort_by = forms.ChoiceField(required=False, choices=[
         ('relevance', 'Pertinence'),
         ('newest', 'Les plus récents'),
-    ], initial='relevance', widget=forms.Select(attrs={'class': 'form-select'}))
\ No newline at end of file
+        ('oldest', 'Les plus anciens'),
+    ], initial='relevance', widget=forms.Select(attrs={'class': 'form-select'}))
+
+    def show_counts(self, facets):
+        """Ajoute à chaque niveau d'études le nombre de profils correspondant aux autres filtres."""
+        self.fields['education_level'].choices = [('', 'Tous niveaux')] + [
+            (value, f'{label} ({count})') for value, label, count in facets.education_level
+        ]
@@ -0,0 +1,258 @@
+"""
+Moteur de recherche plein texte des profils (paramètre `q` de `SearchForm`).
+
+Trois implémentations partagent la même interface :
+- `PostgresSearchBackend` : table `talent_map_app_profile_search` (tsvector + index GIN) ;
+- `SQLiteSearchBackend` : table virtuelle FTS5 `talent_map_app_profile_fts` ;
+- `BasicSearchBackend` : repli en `icontains`, sans classement (autres SGBD).
+
+Le texte indexé est replié (casse + accents) côté Python avec `normalize_key`,
+la recherche se comporte donc de la même façon quel que soit le moteur.
+Le choix se fait via `settings.TALENT_SEARCH_BACKEND` ('auto' par défaut = selon le SGBD).
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .skills import normalize_key
+
+# Pondération des colonnes indexées : noms et compétences comptent plus que la bio
+INDEXED_COLUMNS = ('names', 'skills', 'passions', 'bio', 'projects')
+COLUMN_WEIGHTS = {'names': 3.0, 'skills': 4.0, 'passions': 2.0, 'bio': 1.0, 'projects': 1.0}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def profile_document(names, skills, passions, bio, projects):
+    """Retourne le tuple de colonnes indexées (textes repliés) pour un profil."""
+    return tuple(normalize_key(value) for value in (names, skills, passions, bio, projects))
+
+
+def query_tokens(terms):
+    """Découpe les termes de recherche en jetons alphanumériques repliés (sans doublons)."""
+    tokens = []
+    for term in terms:
+        for token in _TOKEN_RE.findall(normalize_key(term)):
+            if token not in tokens:
+                tokens.append(token)
+    return tokens
+
+
+class BaseSearchBackend:
+    """Interface commune : indexation incrémentale + filtre/score utilisables dans un QuerySet."""
+
+    profile_table = 'talent_map_app_userprofile'
+
+    def index_profile(self, profile):
+        user = profile.user
+        names = ' '.join(filter(None, [user.username, user.first_name, user.last_name]))
+        self.index_rows([(profile.pk, *profile_document(
+            names, profile.skills, profile.passions, profile.bio, profile.projects,
+        ))])
+
+    def index_rows(self, rows):
+        """Indexe des tuples (profile_id, names, skills, passions, bio, projects) déjà repliés."""
+        raise NotImplementedError
+
+    def remove_profile(self, profile_id):
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Réindexe tous les profils (commande `rebuild_search_index`)."""
+        from .models import UserProfile
+        self.clear()
+        batch = []
+        rows = UserProfile.objects.values_list(
+            'pk', 'user__username', 'user__first_name', 'user__last_name',
+            'skills', 'passions', 'bio', 'projects',
+        ).order_by('pk')
+        for pk, username, first, last, skills, passions, bio, projects in rows.iterator(chunk_size=500):
+            names = ' '.join(filter(None, [username, first, last]))
+            batch.append((pk, *profile_document(names, skills, passions, bio, projects)))
+            if len(batch) >= 500:
+                self.index_rows(batch)
+                batch = []
+        if batch:
+            self.index_rows(batch)
+
+    def clear(self):
+        raise NotImplementedError
+
+    def match(self, terms):
+        """Q() à appliquer sur un QuerySet de UserProfile pour ne garder que les profils trouvés."""
+        raise NotImplementedError
+
+    def rank(self, terms):
+        """Expression (float, plus grand = plus pertinent) à annoter sur le QuerySet."""
+        return Value(0.0, output_field=FloatField())
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """Repli sans index : LIKE sur les champs, pas de classement."""
+
+    def index_rows(self, rows):
+        pass
+
+    def remove_profile(self, profile_id):
+        pass
+
+    def clear(self):
+        pass
+
+    def match(self, terms):
+        q_filter = Q()
+        for term in terms:
+            q_filter |= (
+                Q(skills__icontains=term) |
+                Q(passions__icontains=term) |
+                Q(bio__icontains=term) |
+                Q(projects__icontains=term) |
+                Q(user__username__icontains=term) |
+                Q(user__first_name__icontains=term) |
+                Q(user__last_name__icontains=term)
+            )
+        return q_filter
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 : une ligne par profil (rowid = id du profil), score bm25 pondéré par colonne."""
+
+    table = 'talent_map_app_profile_fts'
+
+    @classmethod
+    def create_sql(cls):
+        return (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {cls.table} USING fts5("
+            f"{', '.join(INDEXED_COLUMNS)}, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def index_rows(self, rows):
+        rows = list(rows)
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, {', '.join(INDEXED_COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove_profile(self, profile_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [profile_id])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def _expression(self, terms):
+        # recherche par préfixe sur chaque jeton : "pyth"* OR "djan"*
+        return ' OR '.join(f'"{token}"*' for token in query_tokens(terms))
+
+    def match(self, terms):
+        expression = self._expression(terms)
+        if not expression:
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [expression]))
+
+    def rank(self, terms):
+        expression = self._expression(terms)
+        if not expression:
+            return super().rank(terms)
+        weights = ', '.join(str(COLUMN_WEIGHTS[c]) for c in INDEXED_COLUMNS)
+        # Scores calculés par un seul MATCH puis cherchés par rowid : corrélé directement au
+        # profil, le MATCH (et l'expansion des préfixes) serait réévalué pour chaque ligne.
+        # "ORDER BY 1 LIMIT -1" empêche SQLite d'aplatir la sous-requête.
+        return RawSQL(
+            f"SELECT score FROM (SELECT rowid AS profile_id, -bm25({self.table}, {weights}) AS score "
+            f"FROM {self.table} WHERE {self.table} MATCH %s ORDER BY 1 LIMIT -1) "
+            f"WHERE profile_id = {self.profile_table}.id",
+            [expression],
+            output_field=FloatField(),
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector pondéré (A-D) + index GIN, score `ts_rank_cd`."""
+
+    table = 'talent_map_app_profile_search'
+    config = 'simple'
+    column_classes = {'names': 'A', 'skills': 'A', 'passions': 'B', 'bio': 'C', 'projects': 'D'}
+
+    @classmethod
+    def create_sql(cls):
+        return [
+            f"CREATE TABLE IF NOT EXISTS {cls.table} ("
+            f"profile_id bigint PRIMARY KEY REFERENCES {cls.profile_table} (id) ON DELETE CASCADE "
+            f"DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS {cls.table}_document_gin ON {cls.table} USING gin (document)",
+        ]
+
+    def index_rows(self, rows):
+        vector = ' || '.join(
+            f"setweight(to_tsvector('{self.config}', %s), '{self.column_classes[c]}')" for c in INDEXED_COLUMNS
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (profile_id, document) VALUES (%s, {vector}) "
+                f"ON CONFLICT (profile_id) DO UPDATE SET document = EXCLUDED.document",
+                list(rows),
+            )
+
+    def remove_profile(self, profile_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE profile_id = %s", [profile_id])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {self.table}")
+
+    def _expression(self, terms):
+        return ' | '.join(f"{token}:*" for token in query_tokens(terms))
+
+    def match(self, terms):
+        expression = self._expression(terms)
+        if not expression:
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(
+            f"SELECT profile_id FROM {self.table} WHERE document @@ to_tsquery('{self.config}', %s)",
+            [expression],
+        ))
+
+    def rank(self, terms):
+        expression = self._expression(terms)
+        if not expression:
+            return super().rank(terms)
+        return RawSQL(
+            f"SELECT ts_rank_cd(document, to_tsquery('{self.config}', %s)) FROM {self.table} "
+            f"WHERE {self.table}.profile_id = {self.profile_table}.id",
+            [expression],
+            output_field=FloatField(),
+        )
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+_backend = None
+
+
+def get_search_backend():
+    """Retourne (et mémorise) le moteur configuré ou, en mode 'auto', celui du SGBD courant."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'TALENT_SEARCH_BACKEND', 'auto')
+        if path == 'auto':
+            backend_class = BACKENDS.get(connection.vendor, BasicSearchBackend)
+            table = getattr(backend_class, 'table', None)
+            if table and table not in connection.introspection.table_names():
+                # index non créé (ex. SQLite compilé sans FTS5) : repli LIKE
+                backend_class = BasicSearchBackend
+        else:
+            backend_class = import_string(path)
+        _backend = backend_class()
+    return _backend
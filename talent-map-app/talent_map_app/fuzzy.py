@@ -0,0 +1,211 @@
+"""
+Correspondance approximative des compétences : "Djnago" -> Django, "JS" -> JavaScript.
+
+Un index de trigrammes sur le vocabulaire `Skill` (clés normalisées) est gardé en mémoire
+dans chaque processus, avec la table des synonymes `SkillAlias`. Un terme de recherche
+inconnu est comparé aux seules clés partageant au moins un trigramme avec lui, puis
+retenu si sa distance d'édition (transpositions comprises) reste sous un seuil qui
+dépend de sa longueur.
+
+L'index est chargé une fois puis complété de façon incrémentale : les compétences
+créées par ce processus y sont ajoutées après commit (`register_skills`) et un compteur
+de version du vocabulaire, dans le cache Django, signale aux autres processus qu'ils
+doivent lire les compétences plus récentes que la dernière lue (`id > dernier id`) et
+les synonymes. Ce compteur n'est partagé qu'avec un cache commun (Redis, Memcached,
+fichiers) : avec locmem, la vérification de fond commune aux index (`cache.check_indexes`)
+fait cette relecture hors requête quand une compétence ou un synonyme a été ajouté ou
+supprimé ailleurs. Un synonyme modifié sur place n'est vu par les autres workers
+qu'avec un cache partagé.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .cache import register_index_refresher
+from .skills import normalize_key
+
+VOCABULARY_GENERATION_KEY = 'tm:skills:generation'
+# nombre maximal de compétences proposées pour un terme inconnu
+MAX_EXPANSIONS = 3
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance(term):
+    """Nombre de fautes tolérées : aucune sous 4 caractères (synonymes uniquement), 1 jusqu'à 5, puis 2."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    """
+    Distance de Damerau-Levenshtein restreinte (une transposition compte pour 1),
+    ou `limit + 1` dès qu'elle dépasse `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # une transposition peut encore s'appuyer sur la ligne précédente
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class TrigramIndex:
+    """Vocabulaire de compétences (clé -> libellé), index de trigrammes et synonymes."""
+
+    def __init__(self):
+        self.names = {}
+        self.postings = defaultdict(set)
+        self.aliases = {}
+        # dernier id lu en base ; les ajouts locaux ne l'avancent pas (ids d'autres processus intercalés)
+        self.last_id = 0
+        # (nombre, plus grand id) des synonymes lus, comparé à `cache.skill_tables_version`
+        self.aliases_version = (0, 0)
+
+    def add(self, key, name):
+        if key and key not in self.names:
+            self.names[key] = name
+            for gram in trigrams(key):
+                self.postings[gram].add(key)
+
+    def set_aliases(self, pairs):
+        self.aliases = {alias: canonical for alias, canonical in pairs if alias and canonical}
+
+    def lookup(self, term):
+        """Clés canoniques correspondant à un terme normalisé (vide si déjà connu tel quel ou sans équivalent)."""
+        if not term or term in self.names:
+            return []
+        if term in self.aliases:
+            return [self.aliases[term]]
+        limit = max_distance(term)
+        if not limit:
+            return []
+        shared = Counter()
+        for gram in trigrams(term):
+            shared.update(self.postings.get(gram, ()))
+        best, found = limit + 1, []
+        for key in shared:
+            distance = edit_distance(term, key, min(limit, best))
+            if distance < best:
+                best, found = distance, [key]
+            elif distance == best:
+                found.append(key)
+        return sorted(found, key=lambda k: (-shared[k], k))[:MAX_EXPANSIONS] if best <= limit else []
+
+
+_index = None
+_generation = None
+_lock = threading.Lock()
+
+
+def vocabulary_generation():
+    generation = cache.get(VOCABULARY_GENERATION_KEY)
+    if generation is None:
+        cache.add(VOCABULARY_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(VOCABULARY_GENERATION_KEY, 0)
+    return generation
+
+
+def bump_vocabulary_generation():
+    try:
+        return cache.incr(VOCABULARY_GENERATION_KEY)
+    except ValueError:
+        return vocabulary_generation()
+
+
+def _read(last_id):
+    """Compétences plus récentes que `last_id` et synonymes (id, clé, clé canonique)."""
+    from .models import Skill, SkillAlias
+    skills = list(Skill.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'key', 'name'))
+    aliases = list(SkillAlias.objects.values_list('id', 'key', 'canonical_key'))
+    return skills, aliases
+
+
+def _apply(index, skills, aliases):
+    for skill_id, key, name in skills:
+        index.add(key, name)
+        index.last_id = max(index.last_id, skill_id)
+    index.set_aliases((key, canonical) for _, key, canonical in aliases)
+    index.aliases_version = (len(aliases), max((alias_id for alias_id, _, _ in aliases), default=0))
+
+
+def skill_index():
+    """Index du processus courant, complété si le vocabulaire a changé ailleurs."""
+    global _index, _generation
+    generation = vocabulary_generation()
+    with _lock:
+        if _index is None or _generation != generation:
+            index = _index or TrigramIndex()
+            _apply(index, *_read(index.last_id))
+            _index, _generation = index, generation
+        return _index
+
+
+@register_index_refresher
+def refresh_vocabulary(version):
+    """Vérification de fond : lit les compétences et synonymes ajoutés ou supprimés par d'autres workers."""
+    global _generation
+    index = _index
+    if index is None or (version.last_skill <= index.last_id and version.aliases == index.aliases_version):
+        return
+    rows = _read(index.last_id)  # hors verrou : les requêtes continuent avec l'index courant
+    with _lock:
+        _apply(index, *rows)
+        # termes étendus différents : nouvelle génération locale (ETag de la recherche de l'API)
+        _generation = bump_vocabulary_generation()
+
+
+def register_skills(rows):
+    """
+    Ajoute des compétences (id, clé, libellé) créées par ce processus, après commit : une
+    transaction annulée ne laisse rien dans l'index. Les autres processus sont prévenus au
+    même moment, quand les nouvelles lignes leur sont visibles.
+    """
+    rows = list(rows)
+    transaction.on_commit(lambda: _publish_new_skills(rows))
+
+
+def _publish_new_skills(rows):
+    global _generation
+    generation = bump_vocabulary_generation()
+    with _lock:
+        if _index is not None:
+            for skill_id, key, name in rows:
+                _index.add(key, name)
+        # l'index était à jour avant cet ajout : il le reste sans relecture
+        if _generation is not None and _generation + 1 == generation:
+            _generation = generation
+
+
+def aliases_changed():
+    """Force le rechargement des synonymes (et des nouvelles compétences) par tous les processus."""
+    bump_vocabulary_generation()
+    transaction.on_commit(bump_vocabulary_generation)
+
+
+def expand_keys(keys):
+    """Compétences canoniques (clés) pour des clés de recherche inconnues, fautes de frappe ou synonymes."""
+    if not keys:
+        return set()
+    index = skill_index()
+    expanded = set()
+    for key in keys:
+        expanded.update(index.lookup(normalize_key(key)))
+    return expanded - set(keys)
@@ -0,0 +1,111 @@
+import json
+import os
+import platform
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from talent_map_app import benchmarks
+from talent_map_app.cache import bump_search_generation
+from talent_map_app.models import UserProfile
+
+VIEWER = 'bench_viewer'
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure latences (p50/p95/p99) et nombre de requêtes SQL de la recherche, du détail d'un profil, "
+        "de la carte des talents et de l'inscription sur la base courante (voir seed_profiles). "
+        "--save enregistre une référence, --compare la confronte aux mesures du jour."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', dest='scenarios', choices=benchmarks.SCENARIOS,
+                            help="Scénario à mesurer (répétable, défaut : tous)")
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--cold', action='store_true',
+                            help="Invalide les résultats de recherche en cache avant chaque requête")
+        parser.add_argument('--save', metavar='PATH', help="Enregistre les résultats (JSON)")
+        parser.add_argument('--compare', metavar='PATH', help="Référence JSON : échec si régression")
+        parser.add_argument('--threshold', type=float, default=0.25, help="Hausse tolérée de la moyenne (0.25 = 25 %%)")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations doit être positif.")
+        profiles = UserProfile.objects.count()
+        profile_ids = list(UserProfile.objects.order_by('?').values_list('user_id', flat=True)[:200])
+        if not profile_ids:
+            raise CommandError("Aucun profil : lancez d'abord seed_profiles --count N.")
+
+        overrides = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+        }
+        if not os.path.exists(os.path.join(settings.STATIC_ROOT, 'staticfiles.json')):
+            # pas de collectstatic : le manifeste WhiteNoise ne peut pas résoudre les URL
+            overrides['STATICFILES_STORAGE'] = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+        viewer, _ = User.objects.get_or_create(username=VIEWER)
+        client = Client()
+        run_id = time.strftime('%Y%m%d%H%M%S')
+        results = {}
+        try:
+            with override_settings(**overrides):
+                for name in options['scenarios'] or benchmarks.SCENARIOS:
+                    client.force_login(viewer)
+                    results[name] = benchmarks.measure(
+                        client, name, options['iterations'], options['warmup'], profile_ids, run_id,
+                        before_each=bump_search_generation if options['cold'] else None,
+                    )
+                    self.report(name, results[name])
+        except RuntimeError as exc:
+            raise CommandError(exc)
+        finally:
+            User.objects.filter(username__startswith=f'{benchmarks.SIGNUP_PREFIX}_{run_id}_').delete()
+
+        run = {
+            'profiles': profiles,
+            'vendor': connection.vendor,
+            'date': timezone.now().isoformat(timespec='seconds'),
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'cold': options['cold'],
+            'results': results,
+        }
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as f:
+                json.dump(run, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+            self.stdout.write(f"Référence enregistrée : {options['save']}")
+        if options['compare']:
+            self.check_baseline(run, options['compare'], options['threshold'])
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<22} n={result['n']:<4} p50={result['p50_ms']:>8.1f} ms  p95={result['p95_ms']:>8.1f} ms  "
+            f"p99={result['p99_ms']:>8.1f} ms  requêtes SQL={result['queries']}"
+        )
+
+    def check_baseline(self, run, path, threshold):
+        try:
+            with open(path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Référence illisible : {exc}")
+        if baseline.get('profiles') != run['profiles']:
+            self.stderr.write(
+                f"Attention : référence mesurée sur {baseline.get('profiles')} profils, base actuelle : {run['profiles']}."
+            )
+        if baseline.get('cold') != run['cold']:
+            self.stderr.write("Attention : référence et mesure n'utilisent pas la même option --cold.")
+        regressions = benchmarks.compare(run['results'], baseline, threshold)
+        if regressions:
+            raise CommandError("Régressions :\n" + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"Aucune régression par rapport à {path}."))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from talent_map_app import similarity
+from talent_map_app.models import SimilarProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcule les profils similaires (Jaccard sur compétences, passions et langues, MinHash + LSH). "
+        "Sans option, recalcule tout ; --incremental ne reprend que les profils modifiés depuis le dernier calcul."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help="Profils modifiés depuis le dernier calcul et leurs voisins seulement")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        since = similarity.last_build() if options['incremental'] else None
+        if since is None:
+            count = similarity.build()
+            done = f"{count} profils traités"
+        else:
+            count = similarity.update(since)
+            done = f"{count} profils recalculés (modifications depuis le {since:%d/%m/%Y %H:%M})"
+        self.stdout.write(self.style.SUCCESS(
+            f"{done} en {time.perf_counter() - started:.1f} s ; "
+            f"{SimilarProfile.objects.count()} voisins enregistrés."
+        ))
@@ -0,0 +1,23 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from talent_map_app import db
+
+
+class Command(BaseCommand):
+    help = "Affiche les réglages effectifs de la connexion à la base (PRAGMA SQLite, paramètres PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        values = db.effective_settings(options['database'])
+        if options['json']:
+            self.stdout.write(json.dumps(values))
+            return
+        for key, value in values.items():
+            self.stdout.write(f"{key:>20} : {value}")
+        for warning in db.check_database_settings(databases=[options['database']]):
+            self.stderr.write(f"{warning.id} {warning.msg}")
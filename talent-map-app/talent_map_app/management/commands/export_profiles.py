@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from talent_map_app.models import UserProfile
+from talent_map_app.profile_io import FORMATS, export_records, guess_format, write_records
+
+
+class Command(BaseCommand):
+    help = "Exporte les profils en CSV ou JSON Lines, en flux (mémoire constante)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="Fichier de sortie ('-' : sortie standard)")
+        parser.add_argument('--format', choices=FORMATS, help="Format (déduit de l'extension par défaut, sinon csv)")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Lignes lues par aller-retour en base")
+        parser.add_argument('--validated-only', action='store_true', help="Uniquement les profils validés")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        queryset = UserProfile.objects.all()
+        if options['validated_only']:
+            queryset = queryset.filter(is_validated=True)
+        records = export_records(queryset, chunk_size=options['chunk_size'])
+        if path == '-':
+            write_records(self.stdout, fmt, records)
+            return
+        with open(path, 'w', newline='', encoding='utf-8') as stream:
+            count = write_records(stream, fmt, records)
+        self.stderr.write(self.style.SUCCESS(f"{count} profils exportés dans {path}."))
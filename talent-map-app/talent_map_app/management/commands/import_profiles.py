@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from talent_map_app.profile_io import FORMATS, guess_format, import_records, read_records
+
+
+class Command(BaseCommand):
+    help = "Importe des utilisateurs et leurs profils depuis un fichier CSV ou JSON Lines (par lots)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier à importer ('-' pour l'entrée standard)")
+        parser.add_argument('--format', choices=FORMATS, help="Format (déduit de l'extension par défaut, sinon csv)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Profils insérés par transaction")
+        parser.add_argument('--dry-run', action='store_true', help="Valide le fichier sans rien écrire")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être positif.")
+        try:
+            stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(exc)
+        try:
+            report = import_records(read_records(stream, fmt), options['batch_size'], options['dry_run'])
+        except ValueError as exc:  # JSON ou CSV mal formé
+            raise CommandError(f"Fichier illisible : {exc}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for number, message in report.errors:
+            self.stderr.write(f"ligne {number} : {message}" if number else message)
+        verb = "seraient créés" if options['dry_run'] else "créés"
+        self.stdout.write(self.style.SUCCESS(f"{report.created} profils {verb}, {report.skipped} ignorés."))
@@ -0,0 +1,109 @@
+import json
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+from django.core.management.base import BaseCommand, CommandError
+
+from talent_map_app.benchmarks import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge un serveur en marche (WSGI ou ASGI) avec N clients concurrents et mesure "
+        "débit et latences. Ex. : load_test --base-url http://127.0.0.1:8000 --username demo --password ..."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help="Chemin à interroger (répétable), défaut : /search/?q=python")
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=400, help="Nombre total de requêtes")
+        parser.add_argument('--username')
+        parser.add_argument('--password')
+        parser.add_argument('--json', action='store_true', help="Résultat au format JSON (comparaison de runs)")
+
+    def login(self, base_url, username, password):
+        jar = CookieJar()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+        page = opener.open(f'{base_url}/login/').read().decode()
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page)
+        if not token:
+            raise CommandError("Jeton CSRF introuvable sur /login/.")
+        data = urllib.parse.urlencode({
+            'username': username, 'password': password, 'csrfmiddlewaretoken': token.group(1),
+        }).encode()
+        request = urllib.request.Request(f'{base_url}/login/', data=data, headers={'Referer': f'{base_url}/login/'})
+        opener.open(request).read()
+        cookies = {c.name: c.value for c in jar}
+        if 'sessionid' not in cookies:
+            raise CommandError("Connexion refusée.")
+        return '; '.join(f'{k}={v}' for k, v in cookies.items())
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        paths = options['paths'] or ['/search/?q=python']
+        cookie = ''
+        if options['username']:
+            cookie = self.login(base_url, options['username'], options['password'] or '')
+
+        latencies, errors = [], []
+        by_path = {path: [] for path in paths}
+        lock = threading.Lock()
+
+        def hit(i):
+            path = paths[i % len(paths)]
+            url = base_url + path
+            request = urllib.request.Request(url, headers={'Cookie': cookie} if cookie else {})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            except OSError as exc:
+                status = str(exc)
+            elapsed = time.perf_counter() - start
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                    by_path[path].append(elapsed)
+                else:
+                    errors.append(status)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(hit, range(options['requests'])))
+        duration = time.perf_counter() - started
+
+        result = {
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'errors': len(errors),
+            'duration_s': round(duration, 3),
+            'throughput_rps': round(len(latencies) / duration, 1) if duration else 0.0,
+            'mean_ms': round(statistics.mean(latencies) * 1000, 1) if latencies else 0.0,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'paths': {
+                path: {'p50_ms': round(percentile(values, 0.50) * 1000, 1),
+                       'p95_ms': round(percentile(values, 0.95) * 1000, 1)}
+                for path, values in by_path.items()
+            },
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(result))
+            return
+        for key, value in result.items():
+            self.stdout.write(f"{key:>15} : {value}")
+        if errors:
+            self.stderr.write(f"Premières erreurs : {errors[:5]}")
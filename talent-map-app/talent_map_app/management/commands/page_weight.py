@@ -0,0 +1,81 @@
+import json
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from talent_map_app.assets import page_weight
+from talent_map_app.models import UserProfile
+
+VIEWER = 'bench_viewer'
+ENCODINGS = ('raw', 'gzip', 'br')
+
+
+class Command(BaseCommand):
+    help = (
+        "Poids des pages principales : HTML, scripts et feuilles de style locaux (brut, gzip, brotli). "
+        "Lancer collectstatic avant pour mesurer les fichiers minifiés et précompressés servis en production. "
+        "--save enregistre le relevé, --compare affiche l'écart avec un relevé précédent."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--save', metavar='PATH', help="Enregistre le relevé (JSON)")
+        parser.add_argument('--compare', metavar='PATH', help="Relevé JSON de référence (avant/après)")
+
+    def handle(self, *args, **options):
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        collected = os.path.exists(os.path.join(settings.STATIC_ROOT, 'staticfiles.json'))
+        if not collected:
+            self.stderr.write("Pas de collectstatic : fichiers sources, ni minifiés ni précompressés.")
+            overrides['STATICFILES_STORAGE'] = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+        profile = UserProfile.objects.order_by('pk').first()
+        pages = {'home': ('/', False), 'login': ('/login/', False), 'signup': ('/signup/', False),
+                 'search': ('/search/?q=python', True), 'organization_map': ('/talent-map/', True)}
+        if profile:
+            pages['profile_detail'] = (f'/profile/{profile.user_id}/', True)
+            pages['talent_map'] = (f'/profile/{profile.user_id}/map/', True)
+
+        viewer, _ = User.objects.get_or_create(username=VIEWER)
+        report = {}
+        with override_settings(**overrides):
+            for name, (path, logged_in) in pages.items():
+                client = Client()
+                if logged_in:
+                    client.force_login(viewer)
+                response = client.get(path)
+                if response.status_code != 200:
+                    raise CommandError(f"{name} : GET {path} a répondu {response.status_code}")
+                report[name] = page_weight(response.content.decode())
+
+        previous = self.load(options['compare']) if options['compare'] else {}
+        for name, weight in report.items():
+            self.report(name, weight, previous.get(name))
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+            self.stdout.write(f"Relevé enregistré : {options['save']}")
+
+    def load(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Relevé illisible : {exc}")
+
+    def report(self, name, weight, before):
+        columns = []
+        for encoding in ENCODINGS:
+            if encoding not in weight['total']:
+                continue
+            size = weight['total'][encoding]
+            column = f"{encoding}={size / 1024:7.1f} Ko"
+            if before and encoding in before['total']:
+                column += f" ({(size - before['total'][encoding]) / 1024:+.1f})"
+            columns.append(column)
+        self.stdout.write(
+            f"{name:<17} {'  '.join(columns)}  fichiers locaux={len(weight['assets'])}  CDN={len(weight['external'])}"
+        )
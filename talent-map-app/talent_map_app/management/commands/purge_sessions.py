@@ -0,0 +1,29 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime les sessions expirées de la table django_session, par lots (courtes transactions). "
+        "À planifier régulièrement (cron quotidien) ; sans effet utile avec SESSION_MODE=signed_cookies ou cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by()
+        total = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            with transaction.atomic():
+                deleted, _ = Session.objects.filter(session_key__in=keys).delete()
+            total += deleted
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} session(s) expirée(s) supprimée(s) ; {Session.objects.count()} restante(s)."
+        ))
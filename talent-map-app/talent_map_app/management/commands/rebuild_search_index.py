@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from talent_map_app.fulltext import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstruit entièrement l'index plein texte des profils."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Index reconstruit ({backend.__class__.__name__})."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from talent_map_app import aggregation
+from talent_map_app.models import TalentMapCount, TalentMapEntry, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Recalcule entièrement les compteurs de la carte des talents de l'organisation."
+
+    def handle(self, *args, **options):
+        aggregation.rebuild(UserProfile, TalentMapCount, TalentMapEntry)
+        self.stdout.write(self.style.SUCCESS(
+            f"{TalentMapCount.objects.count()} compteurs pour {TalentMapEntry.objects.count()} profils validés."
+        ))
@@ -0,0 +1,36 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from talent_map_app.startup import unapplied_migrations
+
+
+class Command(BaseCommand):
+    help = (
+        "Étape de mise en production : attend la base, applique les migrations seulement s'il en manque, "
+        "puis affiche les réglages effectifs de la base. --check signale les migrations manquantes sans les appliquer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--timeout', type=float, default=30.0, help="Attente maximale de la base (secondes)")
+        parser.add_argument('--check', action='store_true',
+                            help="Échoue s'il reste des migrations à appliquer, sans rien modifier")
+
+    def handle(self, *args, **options):
+        database = options['database']
+        call_command('wait_for_db', database=database, timeout=options['timeout'], stdout=self.stdout)
+        pending = unapplied_migrations(connections[database])
+        if options['check']:
+            if pending:
+                raise CommandError(f"{len(pending)} migration(s) à appliquer : "
+                                   + ', '.join(f'{app}.{name}' for app, name in pending))
+            self.stdout.write("Aucune migration en attente.")
+            return
+        if pending:
+            self.stdout.write(f"{len(pending)} migration(s) à appliquer.")
+            call_command('migrate', database=database, interactive=False, verbosity=options['verbosity'],
+                         stdout=self.stdout)
+        else:
+            self.stdout.write("Aucune migration en attente.")
+        call_command('db_settings', database=database, stdout=self.stdout, stderr=self.stderr)
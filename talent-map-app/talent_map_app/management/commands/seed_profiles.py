@@ -0,0 +1,37 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from talent_map_app.profile_io import import_records
+from talent_map_app.seeding import synthetic_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Crée N profils synthétiques (compétences, langues et niveaux réalistes) pour les mesures "
+        "de performance. Ex. : seed_profiles --count 10000"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, required=True)
+        parser.add_argument('--seed', type=int, default=0, help="Graine du générateur (mêmes profils à graine égale)")
+        parser.add_argument('--prefix', default='seed', help="Préfixe des noms d'utilisateur")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['count'] < 1 or options['batch_size'] < 1:
+            raise CommandError("--count et --batch-size doivent être positifs.")
+        prefix = options['prefix']
+        # relancer la commande ajoute des profils à la suite des précédents
+        start = User.objects.filter(username__startswith=f'{prefix}_').count()
+        started = time.perf_counter()
+        report = import_records(
+            synthetic_records(options['count'], options['seed'], start, prefix), options['batch_size'],
+        )
+        for number, message in report.errors[:10]:
+            self.stderr.write(f"{number} : {message}" if number else message)
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.created} profils créés en {time.perf_counter() - started:.1f} s "
+            f"({User.objects.filter(username__startswith=f'{prefix}_').count()} profils '{prefix}' au total)."
+        ))
@@ -0,0 +1,53 @@
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from talent_map_app import benchmarks
+from talent_map_app.models import UserProfile
+
+VIEWER = 'bench_viewer'
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+# (mode de session, cache de l'utilisateur en secondes)
+MODES = [('db', 0), ('cached_db', 0), ('cached_db', 300), ('signed_cookies', 300)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Requêtes SQL et latence de la page de recherche (résultats en cache) pour un visiteur connecté, "
+        "selon le moteur de sessions et le cache de l'utilisateur (voir talent_map_app/sessions.py)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--scenario', default='search_single', choices=benchmarks.SCENARIOS[:-1])
+
+    def handle(self, *args, **options):
+        profile_ids = list(UserProfile.objects.order_by('?').values_list('user_id', flat=True)[:200])
+        if not profile_ids:
+            raise CommandError("Aucun profil : lancez d'abord seed_profiles --count N.")
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        if not os.path.exists(os.path.join(settings.STATIC_ROOT, 'staticfiles.json')):
+            overrides['STATICFILES_STORAGE'] = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+        viewer, _ = User.objects.get_or_create(username=VIEWER)
+        baseline = None
+        for mode, user_cache in MODES:
+            with override_settings(**overrides, SESSION_ENGINE=ENGINES[mode], AUTH_USER_CACHE_TIMEOUT=user_cache):
+                client = Client()  # nouveau client : SessionMiddleware charge le moteur à l'initialisation
+                client.force_login(viewer)
+                result = benchmarks.measure(client, options['scenario'], options['iterations'], options['warmup'],
+                                            profile_ids, run_id='sessions')
+            baseline = baseline or result
+            label = f"{mode}{' + utilisateur en cache' if user_cache else ''}"
+            self.stdout.write(
+                f"{label:<38} p50={result['p50_ms']:>7.1f} ms  requêtes SQL={result['queries']} "
+                f"({result['queries'] - baseline['queries']:+d})"
+            )
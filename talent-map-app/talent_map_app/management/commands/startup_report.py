@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# exécuté par un interpréteur neuf : l'horloge est relevée avant tout import
+CHILD = (
+    "import time; started = time.time()\n"
+    "import json, sys\n"
+    "from talent_map_app.startup import measure_startup\n"
+    "print(json.dumps({'started': started, **measure_startup(sys.argv[1:])}))\n"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Temps de démarrage mesuré dans un processus neuf : interpréteur, import de Django, réglages, "
+        "django.setup(), middlewares, URL, puis première et deuxième requête sur chaque chemin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths', help="Chemin à demander (défaut : / et /login/)")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/', '/login/']
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'talent_map_project.settings')}
+        spawned = time.time()
+        child = subprocess.run([sys.executable, '-c', CHILD, *paths], cwd=settings.BASE_DIR, env=env,
+                               capture_output=True, text=True)
+        total = (time.time() - spawned) * 1000
+        if child.returncode:
+            raise CommandError(f"Échec de la mesure :\n{child.stderr}")
+        report = json.loads(child.stdout.strip().splitlines()[-1])
+        report['phases'] = {'interpreter': round((report.pop('started') - spawned) * 1000, 1), **report['phases']}
+        report['total'] = round(total, 1)
+
+        if not report['collected']:
+            self.stderr.write("Pas de collectstatic : fichiers statiques servis depuis les sources.")
+        if options['json']:
+            self.stdout.write(json.dumps(report))
+            return
+        for name, ms in report['phases'].items():
+            self.stdout.write(f"{name:<12} {ms:8.1f} ms")
+        ready = sum(report['phases'].values())
+        self.stdout.write(f"{'prêt':<12} {ready:8.1f} ms")
+        for path, timing in report['requests'].items():
+            self.stdout.write(
+                f"GET {path} ({timing['status']}) : première requête {timing['first']:.1f} ms, "
+                f"deuxième {timing['second']:.1f} ms"
+            )
+        self.stdout.write(f"processus complet : {report['total']:.1f} ms")
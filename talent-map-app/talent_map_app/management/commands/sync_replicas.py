@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from talent_map_app.replicas import copy_sqlite, replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "Développement : copie la base SQLite principale vers les répliques SQLite de DATABASE_REPLICA_URLS "
+        "(réplication simulée ; sous PostgreSQL, la réplication est assurée par le serveur)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', help="Alias de réplique (toutes par défaut)")
+
+    def handle(self, *args, **options):
+        replicas = options['database'] or replica_aliases()
+        if not replicas:
+            raise CommandError("Aucune réplique configurée : définissez DATABASE_REPLICA_URLS.")
+        source = connections[DEFAULT_DB_ALIAS]
+        for alias in replicas:
+            target = connections[alias]
+            if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+                raise CommandError(f"'{alias}' : copie possible uniquement entre bases SQLite.")
+            started = time.perf_counter()
+            copy_sqlite(source, target)
+            self.stdout.write(f"{alias} : copie de '{DEFAULT_DB_ALIAS}' en {(time.perf_counter() - started) * 1000:.0f} ms.")
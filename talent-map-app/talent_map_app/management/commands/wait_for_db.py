@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+
+from talent_map_app.startup import wait_for_database
+
+
+class Command(BaseCommand):
+    help = "Attend que la base accepte les connexions (SELECT 1, tentatives espacées de 0,1 à 2 s)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--timeout', type=float, default=30.0, help="Délai maximal (secondes)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            attempts = wait_for_database(connections[options['database']], timeout=options['timeout'])
+        except OperationalError as exc:
+            raise CommandError(f"Base '{options['database']}' injoignable après {options['timeout']:g} s : {exc}")
+        self.stdout.write(
+            f"Base '{options['database']}' prête en {(time.perf_counter() - started) * 1000:.0f} ms "
+            f"({attempts} tentative(s))."
+        )
@@ -0,0 +1,165 @@
+"""
+Moteur de correspondance compétences requises -> profils (demandes de collaboration).
+
+Chaque profil est un vecteur creux sur le vocabulaire `Skill` (1 si le profil a la
+compétence), pondéré par l'IDF de la compétence : une compétence rare pèse plus qu'une
+compétence que tout le monde déclare. La matrice profils x compétences est stockée au
+format colonne compressé (CSC) dans des `array` de la bibliothèque standard :
+
+- `indptr[j]:indptr[j + 1]` délimite, dans `rows`, les profils ayant la compétence j ;
+- `norms[i]` est la norme du vecteur pondéré du profil i.
+
+Le score d'une requête ne parcourt que les colonnes des compétences demandées (produit
+matrice creuse x vecteur) : le coût dépend du nombre de profils concernés, pas du nombre
+total de profils, et aucun objet ORM n'est chargé avant la sélection du top-k.
+
+La matrice est construite en deux requêtes et gardée en mémoire par processus ; elle est
+reconstruite à la demande suivante quand le compteur `skill_links_generation` (cache.py)
+avance, c'est-à-dire quand des compétences de profils sont ajoutées ou retirées (une
+modification de la bio ne coûte rien). Sans cache partagé, les écritures des autres
+workers sont vues par la vérification de fond commune aux index (`cache.check_indexes`),
+qui reconstruit la matrice hors requête.
+"""
+import heapq
+import math
+import threading
+from array import array
+from collections import namedtuple
+
+from .cache import register_index_refresher, skill_links_generation
+from .models import ProfileSkill, Skill
+from .skills import normalize_key, split_list
+
+Match = namedtuple('Match', 'profile_id score matched')
+
+
+class SkillMatrix:
+    """Matrice profils x compétences (CSC, pondération IDF) et recherche des k meilleurs profils."""
+
+    def __init__(self, pairs, vocabulary):
+        """
+        `pairs` : couples (profile_id, skill_id) triés par skill_id ;
+        `vocabulary` : dict clé normalisée -> skill_id.
+        """
+        self.profile_ids = array('q')
+        self.rows = array('l')
+        self.indptr = array('l', [0])
+        self.columns = {}  # skill_id -> indice de colonne
+        row_of = {}
+        for profile_id, skill_id in pairs:
+            if skill_id not in self.columns:
+                if self.columns:
+                    self.indptr.append(len(self.rows))
+                self.columns[skill_id] = len(self.columns)
+            row = row_of.get(profile_id)
+            if row is None:
+                row = row_of[profile_id] = len(self.profile_ids)
+                self.profile_ids.append(profile_id)
+            self.rows.append(row)
+        if self.columns:
+            self.indptr.append(len(self.rows))
+        self.keys = {key: self.columns[skill_id] for key, skill_id in vocabulary.items() if skill_id in self.columns}
+
+        total = len(self.profile_ids)
+        self.idf = array('d', (
+            math.log((1 + total) / (1 + self.indptr[j + 1] - self.indptr[j])) + 1.0
+            for j in range(len(self.columns))
+        ))
+        squares = array('d', bytes(8 * total))
+        for j in range(len(self.columns)):
+            weight = self.idf[j] ** 2
+            for i in self.rows[self.indptr[j]:self.indptr[j + 1]]:
+                squares[i] += weight
+        self.norms = array('d', map(math.sqrt, squares))
+
+    @classmethod
+    def from_database(cls):
+        """Matrice et version des liens lus (nombre, plus grand id ; voir `cache.skill_tables_version`)."""
+        links = ProfileSkill.objects.order_by('skill_id', 'profile_id').values_list('id', 'profile_id', 'skill_id')
+        vocabulary = dict(Skill.objects.values_list('key', 'id'))
+        version = [0, 0]
+
+        def pairs():
+            for link_id, profile_id, skill_id in links.iterator(chunk_size=5000):
+                version[0] += 1
+                version[1] = max(version[1], link_id)
+                yield profile_id, skill_id
+
+        matrix = cls(pairs(), vocabulary)
+        matrix.version = tuple(version)
+        return matrix
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    def query_columns(self, skills):
+        """Colonnes correspondant à une liste de libellés (inconnus ignorés, doublons retirés)."""
+        columns = []
+        for name in skills:
+            column = self.keys.get(normalize_key(name))
+            if column is not None and column not in columns:
+                columns.append(column)
+        return columns
+
+    def top_k(self, skills, k=10, exclude=()):
+        """Les `k` profils les plus proches (cosinus pondéré IDF) des compétences `skills`."""
+        columns = self.query_columns(skills)
+        if not columns:
+            return []
+        query_norm = math.sqrt(sum(self.idf[j] ** 2 for j in columns))
+        scores = {}
+        matched = {}
+        for j in columns:
+            weight = self.idf[j] ** 2
+            for i in self.rows[self.indptr[j]:self.indptr[j + 1]]:
+                scores[i] = scores.get(i, 0.0) + weight
+                matched[i] = matched.get(i, 0) + 1
+        excluded = set(exclude)
+        best = heapq.nlargest(
+            k,
+            ((score / (self.norms[i] * query_norm), matched[i], -self.profile_ids[i], i)
+             for i, score in scores.items() if self.profile_ids[i] not in excluded),
+        )
+        return [Match(self.profile_ids[i], round(score, 4), n) for score, n, _, i in best]
+
+
+_matrix = None
+_matrix_generation = None
+_matrix_lock = threading.Lock()
+
+
+def get_matrix():
+    """Matrice du processus courant, reconstruite si des compétences de profils ont changé depuis sa construction."""
+    global _matrix, _matrix_generation
+    generation = skill_links_generation()
+    with _matrix_lock:
+        if _matrix is None or _matrix_generation != generation:
+            _matrix = SkillMatrix.from_database()
+            _matrix_generation = generation
+        return _matrix
+
+
+@register_index_refresher
+def refresh_matrix(version):
+    """Vérification de fond : reconstruit la matrice chargée si les liens en base ont changé (autres workers)."""
+    global _matrix, _matrix_generation
+    if _matrix is None or _matrix.version == version.links:
+        return
+    generation = skill_links_generation()
+    matrix = SkillMatrix.from_database()  # hors verrou : les requêtes gardent l'ancienne matrice en attendant
+    with _matrix_lock:
+        _matrix, _matrix_generation = matrix, generation
+
+
+def match_profiles(skills, k=10, exclude=()):
+    """Top-k pour une liste de compétences ou un texte séparé par des virgules."""
+    if isinstance(skills, str):
+        skills = split_list(skills)
+    return get_matrix().top_k(skills, k, exclude)
+
+
+def candidates_for(collaboration, k=10):
+    """Profils recommandés pour une demande de collaboration (hors demandeur)."""
+    from .models import UserProfile
+    exclude = UserProfile.objects.filter(user_id=collaboration.requester_id).values_list('pk', flat=True)
+    return match_profiles(collaboration.required_skills or '', k, exclude=list(exclude))
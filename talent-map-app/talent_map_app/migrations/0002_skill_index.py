@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-18 06:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Libellé tel que saisi la première fois', max_length=100)),
+                ('key', models.CharField(help_text='Libellé normalisé (minuscules, sans accents)', max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Compétence',
+                'verbose_name_plural': 'Compétences',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='education_level',
+            field=models.CharField(choices=[('bac', 'Baccalauréat'), ('licence', 'Licence'), ('master', 'Master'), ('Ingénieur', 'Ingénieur')], default='licence', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ProfileSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='talent_map_app.userprofile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_links', to='talent_map_app.skill')),
+            ],
+            options={
+                'verbose_name': 'Compétence du profil',
+                'verbose_name_plural': 'Compétences des profils',
+            },
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='indexed_skills',
+            field=models.ManyToManyField(blank=True, related_name='profiles', through='talent_map_app.ProfileSkill', to='talent_map_app.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='profileskill',
+            index=models.Index(fields=['skill', 'profile'], name='profileskill_skill_profile'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='profileskill',
+            unique_together={('profile', 'skill')},
+        ),
+    ]
@@ -0,0 +1,61 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+# Copies figées de talent_map_app.skills : la migration doit produire les mêmes clés
+# même si le module évolue par la suite.
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def split_list(value, sep=','):
+    if not value:
+        return []
+    return [s.strip() for s in str(value).split(sep) if s.strip()]
+
+
+def normalize_key(value):
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    return _WHITESPACE_RE.sub(' ', value).strip().casefold()
+
+
+def backfill_skill_index(apps, schema_editor):
+    """Remplit Skill / ProfileSkill à partir du texte `UserProfile.skills` existant."""
+    UserProfile = apps.get_model('talent_map_app', 'UserProfile')
+    Skill = apps.get_model('talent_map_app', 'Skill')
+    ProfileSkill = apps.get_model('talent_map_app', 'ProfileSkill')
+    db = schema_editor.connection.alias
+
+    profile_keys = {}
+    names = {}
+    rows = UserProfile.objects.using(db).exclude(skills__isnull=True).values_list('id', 'skills')
+    for profile_id, skills in rows.iterator():
+        keys = set()
+        for name in split_list(skills):
+            key = normalize_key(name)
+            if key:
+                names.setdefault(key, name[:100])
+                keys.add(key)
+        profile_keys[profile_id] = keys
+
+    Skill.objects.using(db).bulk_create(
+        [Skill(key=k, name=n) for k, n in names.items()], ignore_conflicts=True, batch_size=500,
+    )
+    skill_ids = dict(Skill.objects.using(db).values_list('key', 'id'))
+    ProfileSkill.objects.using(db).bulk_create(
+        [ProfileSkill(profile_id=pid, skill_id=skill_ids[k]) for pid, keys in profile_keys.items() for k in keys],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0002_skill_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+import re
+import unicodedata
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Copies figées de talent_map_app.fulltext / talent_map_app.skills au moment de la
+# migration : tables, colonnes et texte indexé ne changent pas si ces modules évoluent.
+PROFILE_TABLE = 'talent_map_app_userprofile'
+POSTGRES_TABLE = 'talent_map_app_profile_search'
+SQLITE_TABLE = 'talent_map_app_profile_fts'
+INDEXED_COLUMNS = ('names', 'skills', 'passions', 'bio', 'projects')
+POSTGRES_WEIGHTS = {'names': 'A', 'skills': 'A', 'passions': 'B', 'bio': 'C', 'projects': 'D'}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_key(value):
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    return _WHITESPACE_RE.sub(' ', value).strip().casefold()
+
+
+def create_postgres_index(schema_editor, rows):
+    schema_editor.execute(
+        f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+        f"profile_id bigint PRIMARY KEY REFERENCES {PROFILE_TABLE} (id) ON DELETE CASCADE "
+        f"DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {POSTGRES_TABLE}_document_gin ON {POSTGRES_TABLE} USING gin (document)"
+    )
+    vector = ' || '.join(f"setweight(to_tsvector('simple', %s), '{POSTGRES_WEIGHTS[c]}')" for c in INDEXED_COLUMNS)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {POSTGRES_TABLE} (profile_id, document) VALUES (%s, {vector}) "
+            f"ON CONFLICT (profile_id) DO UPDATE SET document = EXCLUDED.document",
+            rows,
+        )
+
+
+def create_sqlite_index(schema_editor, rows):
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING fts5("
+            f"{', '.join(INDEXED_COLUMNS)}, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite sans FTS5 : get_search_backend() se repliera sur BasicSearchBackend
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {SQLITE_TABLE} (rowid, {', '.join(INDEXED_COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Crée l'index plein texte propre au SGBD puis le remplit avec les profils existants."""
+    create = {'postgresql': create_postgres_index, 'sqlite': create_sqlite_index}.get(schema_editor.connection.vendor)
+    if create is None:
+        return
+    UserProfile = apps.get_model('talent_map_app', 'UserProfile')
+    rows = []
+    for pk, username, first, last, *texts in UserProfile.objects.using(schema_editor.connection.alias).values_list(
+        'pk', 'user__username', 'user__first_name', 'user__last_name', 'skills', 'passions', 'bio', 'projects',
+    ).iterator():
+        names = ' '.join(filter(None, [username, first, last]))
+        rows.append((pk, *(normalize_key(value) for value in (names, *texts))))
+    create(schema_editor, rows)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {POSTGRES_TABLE}")
+    elif vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0003_backfill_skill_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
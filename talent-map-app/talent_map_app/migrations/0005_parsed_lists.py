@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 06:56
+
+from django.db import migrations, models
+
+
+# copie figée de talent_map_app.skills.split_list
+def split_list(value, sep=','):
+    if not value:
+        return []
+    return [s.strip() for s in str(value).split(sep) if s.strip()]
+
+
+def fill_parsed_lists(apps, schema_editor):
+    """Découpe une fois pour toutes les champs texte des profils existants."""
+    UserProfile = apps.get_model('talent_map_app', 'UserProfile')
+    profiles = UserProfile.objects.using(schema_editor.connection.alias)
+    batch = []
+    for profile in profiles.only('skills', 'languages', 'passions').iterator(chunk_size=500):
+        profile.parsed_skills = split_list(profile.skills)
+        profile.parsed_languages = split_list(profile.languages)
+        profile.parsed_passions = split_list(profile.passions)
+        batch.append(profile)
+        if len(batch) >= 500:
+            profiles.bulk_update(batch, ['parsed_skills', 'parsed_languages', 'parsed_passions'])
+            batch = []
+    if batch:
+        profiles.bulk_update(batch, ['parsed_skills', 'parsed_languages', 'parsed_passions'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0004_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='parsed_languages',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='parsed_passions',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='parsed_skills',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(fill_parsed_lists, migrations.RunPython.noop),
+    ]
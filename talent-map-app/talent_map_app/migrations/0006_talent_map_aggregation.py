@@ -0,0 +1,60 @@
+# Generated by Django 4.2 on 2026-10-18 07:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from talent_map_app import aggregation
+
+
+def build_talent_map(apps, schema_editor):
+    """Calcule les compteurs initiaux à partir des profils validés existants."""
+    aggregation.rebuild(
+        apps.get_model('talent_map_app', 'UserProfile'),
+        apps.get_model('talent_map_app', 'TalentMapCount'),
+        apps.get_model('talent_map_app', 'TalentMapEntry'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0005_parsed_lists'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TalentMapCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Empreinte de (niveau, langue, type, source, cible)', max_length=40, unique=True)),
+                ('education_level', models.CharField(max_length=20)),
+                ('language', models.CharField(max_length=50)),
+                ('kind', models.CharField(choices=[('node', 'Nœud'), ('edge', 'Arête')], max_length=4)),
+                ('source', models.CharField(max_length=82)),
+                ('target', models.CharField(blank=True, max_length=82)),
+                ('label', models.CharField(blank=True, max_length=100)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Compteur de la carte des talents',
+                'verbose_name_plural': 'Compteurs de la carte des talents',
+            },
+        ),
+        migrations.CreateModel(
+            name='TalentMapEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot', models.JSONField(default=dict)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='talent_map_entry', to='talent_map_app.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Contribution à la carte des talents',
+                'verbose_name_plural': 'Contributions à la carte des talents',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='talentmapcount',
+            index=models.Index(fields=['education_level', 'language', 'kind', '-count'], name='talentmap_filter_count'),
+        ),
+        migrations.RunPython(build_talent_map, migrations.RunPython.noop),
+    ]
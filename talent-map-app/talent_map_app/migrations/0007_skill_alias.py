@@ -0,0 +1,62 @@
+# Generated by Django 4.2 on 2026-10-18 07:09
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# synonymes courants ; complétables depuis l'administration
+DEFAULT_ALIASES = [
+    ('JS', 'JavaScript'),
+    ('TS', 'TypeScript'),
+    ('Py', 'Python'),
+    ('Golang', 'Go'),
+    ('K8s', 'Kubernetes'),
+    ('Postgres', 'PostgreSQL'),
+    ('ReactJS', 'React'),
+    ('NodeJS', 'Node.js'),
+    ('ML', 'Machine Learning'),
+]
+
+# copie figée de talent_map_app.skills.normalize_key
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_key(value):
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    return _WHITESPACE_RE.sub(' ', value).strip().casefold()
+
+
+def add_default_aliases(apps, schema_editor):
+    SkillAlias = apps.get_model('talent_map_app', 'SkillAlias')
+    SkillAlias.objects.using(schema_editor.connection.alias).bulk_create([
+        SkillAlias(alias=alias, key=normalize_key(alias), canonical=canonical, canonical_key=normalize_key(canonical))
+        for alias, canonical in DEFAULT_ALIASES
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0006_talent_map_aggregation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text='Ex: JS', max_length=100)),
+                ('key', models.CharField(editable=False, max_length=100, unique=True)),
+                ('canonical', models.CharField(help_text='Compétence désignée, ex: JavaScript', max_length=100)),
+                ('canonical_key', models.CharField(editable=False, max_length=100)),
+            ],
+            options={
+                'verbose_name': 'Synonyme de compétence',
+                'verbose_name_plural': 'Synonymes de compétences',
+                'ordering': ['alias'],
+            },
+        ),
+        migrations.RunPython(add_default_aliases, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0007_skill_alias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='rejected_at',
+            field=models.DateTimeField(blank=True, help_text="Refusé lors de la revue (revient dans la file s'il est modifié)", null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('is_validated', False), ('rejected_at__isnull', True)), fields=['created_at', 'id'], name='profile_review_queue'),
+        ),
+    ]
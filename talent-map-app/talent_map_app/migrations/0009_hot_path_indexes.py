@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18 07:23
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+# Index uniques insensibles à la casse sur auth_user (modèle de django.contrib.auth,
+# d'où le SQL brut) ; les e-mails vides, permis par Django, n'y figurent pas.
+CASE_INSENSITIVE_INDEXES = (
+    ('auth_user_username_ci', 'username', ''),
+    ('auth_user_email_ci', 'email', " WHERE email <> ''"),
+)
+
+
+def create_case_insensitive_indexes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    for name, column, condition in CASE_INSENSITIVE_INDEXES:
+        values = User.objects.exclude(**{column: ''}).annotate(key=Lower(column)).values_list('key', flat=True)
+        seen, duplicates = set(), set()
+        for value in values.iterator():
+            (duplicates if value in seen else seen).add(value)
+        if duplicates:
+            raise RuntimeError(
+                f"Comptes en double pour {column} (casse ignorée) : {', '.join(sorted(duplicates)[:10])}. "
+                "Fusionnez-les avant d'appliquer cette migration."
+            )
+        schema_editor.execute(f"CREATE UNIQUE INDEX {name} ON auth_user (LOWER({column})){condition}")
+
+
+def drop_case_insensitive_indexes(apps, schema_editor):
+    for name, _, _ in CASE_INSENSITIVE_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('talent_map_app', '0008_review_queue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collaboration',
+            index=models.Index(fields=['receiver', 'status', '-created_at'], name='collab_receiver_status'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['created_at', 'id'], name='profile_created'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['education_level', 'created_at', 'id'], name='profile_level_created'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('is_validated', True)), fields=['created_at', 'id'], name='profile_validated'),
+        ),
+        migrations.RunPython(create_case_insensitive_indexes, drop_case_insensitive_indexes),
+    ]
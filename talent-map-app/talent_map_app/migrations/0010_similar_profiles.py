@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-18 08:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_map_app', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField(help_text='Similarité de Jaccard (compétences, passions, langues)')),
+                ('computed_at', models.DateTimeField()),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_profiles', to='talent_map_app.userprofile')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='talent_map_app.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Profil similaire',
+                'verbose_name_plural': 'Profils similaires',
+                'unique_together': {('profile', 'rank')},
+            },
+        ),
+    ]
@@ -1,5 +1,47 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+
+from . import autocomplete, fuzzy
+from . import cache as fragment_cache
+from .skills import split_list, normalize_key
+
+
+class Skill(models.Model):
+    """Vocabulaire normalisé des compétences (une ligne par clé repliée casse/accents)."""
+
+    name = models.CharField(max_length=100, help_text="Libellé tel que saisi la première fois")
+    key = models.CharField(max_length=100, unique=True, help_text="Libellé normalisé (minuscules, sans accents)")
+
+    class Meta:
+        verbose_name = "Compétence"
+        verbose_name_plural = "Compétences"
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Synonyme d'une compétence, utilisé pour étendre les recherches (ex. 'JS' -> 'JavaScript')."""
+
+    alias = models.CharField(max_length=100, help_text="Ex: JS")
+    key = models.CharField(max_length=100, unique=True, editable=False)
+    canonical = models.CharField(max_length=100, help_text="Compétence désignée, ex: JavaScript")
+    canonical_key = models.CharField(max_length=100, editable=False)
+
+    class Meta:
+        verbose_name = "Synonyme de compétence"
+        verbose_name_plural = "Synonymes de compétences"
+        ordering = ['alias']
+
+    def __str__(self):
+        return f"{self.alias} -> {self.canonical}"
+
+    def save(self, *args, **kwargs):
+        self.key = normalize_key(self.alias)
+        self.canonical_key = normalize_key(self.canonical)
+        super().save(*args, **kwargs)
 
 class UserProfile(models.Model):
     """Modèle pour stocker les profils utilisateur avec leurs talents et compétences"""
@@ -39,25 +81,143 @@ class UserProfile(models.Model):
                                       related_name='validated_profiles', 
                                       help_text="Responsable qui a validé le profil")
     validated_at = models.DateTimeField(null=True, blank=True)
+    rejected_at = models.DateTimeField(null=True, blank=True, help_text="Refusé lors de la revue (revient dans la file s'il est modifié)")
     
     # Dates
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Listes pré-découpées (calculées à l'écriture à partir des champs texte ci-dessus)
+    parsed_skills = models.JSONField(default=list, blank=True, editable=False)
+    parsed_languages = models.JSONField(default=list, blank=True, editable=False)
+    parsed_passions = models.JSONField(default=list, blank=True, editable=False)
+
+    # Index normalisé des compétences (alimenté à partir de `skills` à chaque sauvegarde)
+    indexed_skills = models.ManyToManyField(Skill, through='ProfileSkill', related_name='profiles', blank=True)
     
     class Meta:
         verbose_name = "Profil Utilisateur"
         verbose_name_plural = "Profils Utilisateurs"
         ordering = ['-created_at']
+        indexes = [
+            # tri par défaut de la recherche et pagination par curseur (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='profile_created'),
+            # filtre "niveau d'études" + même tri
+            models.Index(fields=['education_level', 'created_at', 'id'], name='profile_level_created'),
+            # profils validés (export, carte des talents)
+            models.Index(fields=['created_at', 'id'], name='profile_validated', condition=models.Q(is_validated=True)),
+            # file de revue : seuls les profils en attente sont indexés
+            models.Index(
+                fields=['created_at', 'id'], name='profile_review_queue',
+                condition=models.Q(is_validated=False, rejected_at__isnull=True),
+            ),
+        ]
     
     def __str__(self):
         return f"Profil de {self.user.username}"
     
-    @property
+    # champ texte -> champ JSON pré-découpé
+    PARSED_FIELDS = {
+        'skills': 'parsed_skills',
+        'languages': 'parsed_languages',
+        'passions': 'parsed_passions',
+    }
+
+    def refresh_parsed_lists(self):
+        """Recalcule les listes pré-découpées et oublie les valeurs mises en cache sur l'instance."""
+        for source, target in self.PARSED_FIELDS.items():
+            setattr(self, target, split_list(getattr(self, source)))
+            self.__dict__.pop(f'{source}_list', None)
+
+    def clean(self):
+        # appelé par les ModelForm après affectation des données saisies
+        super().clean()
+        self.refresh_parsed_lists()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        self.refresh_parsed_lists()
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            update_fields |= {self.PARSED_FIELDS[f] for f in update_fields if f in self.PARSED_FIELDS}
+            kwargs['update_fields'] = update_fields
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or 'skills' in update_fields:
+                self.sync_skill_index()
+
+    def sync_skill_index(self):
+        """
+        Synchronise les lignes `ProfileSkill` avec le texte de `skills`.
+        Crée au besoin les entrées `Skill` manquantes ; ne touche qu'aux liens ajoutés/supprimés.
+        """
+        wanted = {}
+        for name in self.skills_list:
+            wanted.setdefault(normalize_key(name), name[:100])
+        wanted.pop('', None)
+
+        known = dict(Skill.objects.filter(key__in=wanted).values_list('key', 'id'))
+        missing = [Skill(key=key, name=name) for key, name in wanted.items() if key not in known]
+        new_skills = []
+        if missing:
+            Skill.objects.bulk_create(missing, ignore_conflicts=True)
+            known = dict(Skill.objects.filter(key__in=wanted).values_list('key', 'id'))
+            new_skills = [(known[s.key], s.key, s.name) for s in missing if s.key in known]
+            fuzzy.register_skills(new_skills)
+
+        wanted_ids = set(known.values())
+        current_ids = set(self.skill_links.values_list('skill_id', flat=True))
+        if current_ids - wanted_ids:
+            self.skill_links.filter(skill_id__in=current_ids - wanted_ids).delete()
+        if wanted_ids - current_ids:
+            ProfileSkill.objects.bulk_create(
+                [ProfileSkill(profile=self, skill_id=skill_id) for skill_id in wanted_ids - current_ids],
+                ignore_conflicts=True,
+            )
+        if new_skills or wanted_ids != current_ids:
+            autocomplete.record_links(wanted_ids - current_ids, current_ids - wanted_ids, new_skills)
+            fragment_cache.skill_links_changed()
+
+    @cached_property
     def skills_list(self):
-        """Retourne la liste des compétences séparées par des virgules, sans éléments vides."""
-        if not self.skills:
-            return []
-        return [s.strip() for s in str(self.skills).split(',') if s.strip()]
+        """Liste des compétences, sans éléments vides (pré-calculée à la sauvegarde)."""
+        return self.parsed_skills
+
+    @cached_property
+    def languages_list(self):
+        """Liste des langues, sans éléments vides (pré-calculée à la sauvegarde)."""
+        return self.parsed_languages
+
+    @cached_property
+    def passions_list(self):
+        """Liste des passions / domaines d'intérêt (pré-calculée à la sauvegarde)."""
+        return self.parsed_passions
+
+    def talent_data(self):
+        """Données de la carte de talents (visualisation JavaScript et API JSON)."""
+        return {
+            'skills': self.skills_list,
+            'passions': self.passions_list,
+        }
+
+
+class ProfileSkill(models.Model):
+    """Table de liaison profil <-> compétence normalisée, utilisée pour les recherches indexées."""
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_links')
+
+    class Meta:
+        verbose_name = "Compétence du profil"
+        verbose_name_plural = "Compétences des profils"
+        unique_together = ('profile', 'skill')
+        indexes = [
+            # recherche "profils ayant la compétence X" : skill_id d'abord
+            models.Index(fields=['skill', 'profile'], name='profileskill_skill_profile'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} -> {self.skill_id}"
 
 
 class Collaboration(models.Model):
@@ -86,6 +246,71 @@ class Collaboration(models.Model):
         verbose_name_plural = "Collaborations"
         ordering = ['-created_at']
         unique_together = ('requester', 'receiver')  # Évite les doublons
+        indexes = [
+            # demandes reçues par statut, les plus récentes d'abord
+            models.Index(fields=['receiver', 'status', '-created_at'], name='collab_receiver_status'),
+        ]
     
     def __str__(self):
-        return f"Collaboration: {self.requester.username} -> {self.receiver.username}"
\ No newline at end of file
+        return f"Collaboration: {self.requester.username} -> {self.receiver.username}"
+
+class TalentMapCount(models.Model):
+    """
+    Compteur agrégé de la carte des talents de l'organisation (voir aggregation.py) :
+    nombre de profils validés ayant un nœud (compétence / passion) ou une paire de nœuds,
+    par niveau d'études et par langue ('*' = tous).
+    """
+
+    KIND_CHOICES = [('node', 'Nœud'), ('edge', 'Arête')]
+
+    key = models.CharField(max_length=40, unique=True, help_text="Empreinte de (niveau, langue, type, source, cible)")
+    education_level = models.CharField(max_length=20)
+    language = models.CharField(max_length=50)
+    kind = models.CharField(max_length=4, choices=KIND_CHOICES)
+    source = models.CharField(max_length=82)
+    target = models.CharField(max_length=82, blank=True)
+    label = models.CharField(max_length=100, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Compteur de la carte des talents"
+        verbose_name_plural = "Compteurs de la carte des talents"
+        indexes = [
+            models.Index(fields=['education_level', 'language', 'kind', '-count'], name='talentmap_filter_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.source} {self.target} ({self.education_level}/{self.language}) = {self.count}"
+
+
+class TalentMapEntry(models.Model):
+    """Dernière contribution d'un profil aux compteurs, pour calculer le delta à la sauvegarde suivante."""
+
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='talent_map_entry')
+    snapshot = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = "Contribution à la carte des talents"
+        verbose_name_plural = "Contributions à la carte des talents"
+
+
+class SimilarProfile(models.Model):
+    """
+    Voisin précalculé d'un profil (commande `build_similarity`, voir similarity.py) :
+    les `NEIGHBORS` profils les plus proches au sens de Jaccard, rangés de 1 à N.
+    """
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='similar_profiles')
+    similar = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField(help_text="Similarité de Jaccard (compétences, passions, langues)")
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Profil similaire"
+        verbose_name_plural = "Profils similaires"
+        # l'index unique (profile, rank) sert aussi la lecture du panneau de la page détail
+        unique_together = ('profile', 'rank')
+
+    def __str__(self):
+        return f"{self.profile_id} ~ {self.similar_id} ({self.score:.2f})"
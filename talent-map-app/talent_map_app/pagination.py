@@ -0,0 +1,101 @@
+"""
+Pagination des résultats de recherche.
+
+- Tri par date (défaut / 'newest' / 'oldest') : pagination par curseur (keyset) sur
+  (`created_at`, `id`). Chaque page est une requête `WHERE (created_at, id) < curseur
+  ORDER BY ... LIMIT n` : le coût ne dépend pas de la profondeur de la page.
+- Tri par pertinence : le score n'est pas stable d'une requête à l'autre, on garde
+  un simple décalage (`?page=`), sans COUNT(*) (on lit une ligne de plus pour savoir
+  s'il existe une page suivante).
+- Résultats en cache (liste ordonnée d'ids) : on découpe la liste et on n'hydrate
+  que les profils de la page (`id_list_page`), avec les mêmes paramètres de page.
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class ResultPage:
+    """Page de résultats : `object_list`, `has_next` et les paramètres GET de la page suivante."""
+
+    def __init__(self, object_list, has_next, next_params=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.next_params = next_params or {}
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def encode_cursor(created_at, pk):
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Retourne (created_at, pk) ou None si le curseur est absent ou invalide."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if created_at is None:
+        return None
+    return created_at, pk
+
+
+def keyset_page(qs, cursor, per_page, descending=True):
+    """Page suivant `cursor` (jeton opaque) d'un QuerySet trié par (created_at, id)."""
+    position = decode_cursor(cursor)
+    if descending:
+        qs = qs.order_by('-created_at', '-pk')
+        if position:
+            created_at, pk = position
+            qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    else:
+        qs = qs.order_by('created_at', 'pk')
+        if position:
+            created_at, pk = position
+            qs = qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+
+    items = list(qs[:per_page + 1])
+    has_next = len(items) > per_page
+    items = items[:per_page]
+    next_params = {'cursor': encode_cursor(items[-1].created_at, items[-1].pk)} if has_next else {}
+    return ResultPage(items, has_next, next_params)
+
+
+def offset_page(qs, page, per_page):
+    """Page numérotée (à partir de 1) sans requête COUNT."""
+    try:
+        page = max(int(page or 1), 1)
+    except (TypeError, ValueError):
+        page = 1
+    start = (page - 1) * per_page
+    items = list(qs[start:start + per_page + 1])
+    has_next = len(items) > per_page
+    return ResultPage(items[:per_page], has_next, {'page': str(page + 1)} if has_next else {})
+
+
+def id_list_page(qs, ids, start, per_page, next_params):
+    """
+    Page d'une liste d'ids déjà triée : une requête `in_bulk` pour les `per_page` profils.
+    `next_params(items, start)` fournit les paramètres GET de la page suivante.
+    """
+    page_ids = ids[start:start + per_page]
+    objects = qs.in_bulk(page_ids)
+    items = [objects[pk] for pk in page_ids if pk in objects]
+    has_next = start + per_page < len(ids)
+    return ResultPage(items, has_next, next_params(items, start) if has_next and items else {})
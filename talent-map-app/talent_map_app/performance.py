@@ -0,0 +1,323 @@
+"""
+Mesures par requête : durée totale, requêtes SQL (nombre et durée), rendu des gabarits
+et taille de la réponse.
+
+- `PerformanceMiddleware` ouvre une mesure par requête (variable de contexte, donc suivie
+  par `sync_to_async` jusque dans les threads des vues asynchrones), l'ajoute à l'en-tête
+  `Server-Timing` et aux histogrammes du processus, et journalise les requêtes lentes
+  (`SLOW_REQUEST_MS`) avec leurs requêtes SQL. Le détail de `Server-Timing` (SQL, gabarits)
+  n'est envoyé qu'en DEBUG, au staff ou avec `SERVER_TIMING_DETAIL` ; sinon, `total` seul.
+- Les requêtes SQL sont comptées par un `execute_wrapper` posé sur chaque connexion à sa
+  création (`record_query`) ; hors requête HTTP (commandes, tâches), il ne fait rien.
+- Le rendu des gabarits est mesuré par le moteur `DjangoTemplates` de ce module.
+
+Les histogrammes sont propres à chaque processus (un worker gunicorn = une série) et
+exposés au format texte Prometheus par `/metrics/` (staff ou jeton `METRICS_TOKEN`) :
+cumulés depuis le démarrage (Prometheus en tire les débits avec `rate()`), et sur une
+fenêtre glissante de `METRICS_WINDOW_SECONDS` pour une lecture directe de la page.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.backends import django as django_backend
+from django.template.exceptions import TemplateDoesNotExist
+from django.utils.functional import empty
+
+from . import cache as fragment_cache
+
+logger = logging.getLogger(__name__)
+
+# bornes (secondes) de l'histogramme des durées de requête
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# requêtes SQL conservées par requête HTTP pour le journal des requêtes lentes
+MAX_RECORDED_QUERIES = 200
+LOGGED_QUERIES = 10
+# tranches de la fenêtre glissante : elle avance par pas de METRICS_WINDOW_SECONDS / WINDOW_SLOTS
+WINDOW_SLOTS = 10
+
+_current = contextvars.ContextVar('talent_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('started', 'db_count', 'db_time', 'template_time', 'template_depth', 'queries')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.queries = []
+
+
+def current():
+    return _current.get()
+
+
+# --- Requêtes SQL ---
+
+def record_query(execute, sql, params, many, context):
+    """`execute_wrapper` : durée et texte de chaque requête SQL de la requête HTTP en cours."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.db_count += 1
+        metrics.db_time += elapsed
+        if len(metrics.queries) < MAX_RECORDED_QUERIES:
+            metrics.queries.append((elapsed, sql))
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """Récepteur de `connection_created` (une seule fois par objet connexion, reconnexions comprises)."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# --- Gabarits ---
+
+class TimedTemplate(django_backend.Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        # gabarits rendus depuis un autre (fragments en cache) : comptés dans le parent
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - start
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Moteur Django standard dont les rendus sont chronométrés (voir settings.TEMPLATES)."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+# --- Histogrammes du processus ---
+
+def _new_counts():
+    return [0] * (len(BUCKETS) + 1)
+
+
+def _count(counts, duration):
+    for i, bound in enumerate(BUCKETS):
+        if duration <= bound:
+            counts[i] += 1
+    counts[-1] += 1
+
+
+class Registry:
+    """
+    Compteurs cumulés par vue, au sens Prometheus (ne décroissent qu'au redémarrage), plus
+    l'histogramme des durées des `METRICS_WINDOW_SECONDS` dernières secondes, tenu par
+    tranches (`WINDOW_SLOTS`) : les tranches sorties de la fenêtre sont oubliées.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.buckets = defaultdict(_new_counts)
+            self.sums = defaultdict(float)
+            self.requests = defaultdict(int)
+            self.totals = defaultdict(float)
+            self.slots = {}  # numéro de tranche -> {vue: compteurs}
+
+    def _slot_seconds(self):
+        return max(getattr(settings, 'METRICS_WINDOW_SECONDS', 300), 1) / WINDOW_SLOTS
+
+    def _prune(self, slot):
+        for old in [s for s in self.slots if s <= slot - WINDOW_SLOTS]:
+            del self.slots[old]
+
+    def observe(self, view, status, duration, metrics, size):
+        slot = int(time.monotonic() // self._slot_seconds())
+        with self._lock:
+            counts = self.buckets[view]
+            _count(counts, duration)
+            self._prune(slot)
+            _count(self.slots.setdefault(slot, defaultdict(_new_counts))[view], duration)
+            self.sums[view] += duration
+            self.requests[(view, status)] += 1
+            self.totals[('db_queries', view)] += metrics.db_count
+            self.totals[('db_seconds', view)] += metrics.db_time
+            self.totals[('template_seconds', view)] += metrics.template_time
+            self.totals[('response_bytes', view)] += size
+
+    def snapshot(self):
+        with self._lock:
+            return (
+                {view: list(counts) for view, counts in self.buckets.items()},
+                dict(self.sums), dict(self.requests), dict(self.totals),
+            )
+
+    def window(self):
+        """Histogramme par vue des requêtes de la fenêtre glissante."""
+        slot = int(time.monotonic() // self._slot_seconds())
+        merged = defaultdict(_new_counts)
+        with self._lock:
+            self._prune(slot)
+            for views in self.slots.values():
+                for view, counts in views.items():
+                    merged[view] = [a + b for a, b in zip(merged[view], counts)]
+        return dict(merged)
+
+
+registry = Registry()
+
+COUNTERS = (
+    ('db_queries', 'talent_db_queries_total', "Requêtes SQL exécutées"),
+    ('db_seconds', 'talent_db_seconds_total', "Temps passé dans les requêtes SQL"),
+    ('template_seconds', 'talent_template_seconds_total', "Temps de rendu des gabarits (requêtes SQL paresseuses comprises)"),
+    ('response_bytes', 'talent_response_bytes_total', "Taille des corps de réponse"),
+)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_text():
+    """Histogrammes et compteurs du processus au format d'exposition texte Prometheus."""
+    buckets, sums, requests, totals = registry.snapshot()
+    lines = [
+        "# HELP talent_request_duration_seconds Durée des requêtes HTTP par vue.",
+        "# TYPE talent_request_duration_seconds histogram",
+    ]
+    for view in sorted(buckets):
+        counts = buckets[view]
+        for bound, count in zip(BUCKETS + ('+Inf',), counts):
+            lines.append(f'talent_request_duration_seconds_bucket{{view="{_label(view)}",le="{bound}"}} {count}')
+        lines.append(f'talent_request_duration_seconds_sum{{view="{_label(view)}"}} {_number(sums[view])}')
+        lines.append(f'talent_request_duration_seconds_count{{view="{_label(view)}"}} {counts[-1]}')
+    window = getattr(settings, 'METRICS_WINDOW_SECONDS', 300)
+    lines += [
+        f"# HELP talent_recent_requests Requêtes HTTP des {window} dernières secondes par vue et durée maximale (le).",
+        "# TYPE talent_recent_requests gauge",
+    ]
+    for view, counts in sorted(registry.window().items()):
+        for bound, count in zip(BUCKETS + ('+Inf',), counts):
+            lines.append(f'talent_recent_requests{{view="{_label(view)}",le="{bound}"}} {count}')
+    lines += ["# HELP talent_requests_total Requêtes HTTP par vue et statut.", "# TYPE talent_requests_total counter"]
+    for (view, status), count in sorted(requests.items()):
+        lines.append(f'talent_requests_total{{view="{_label(view)}",status="{status}"}} {count}')
+    for key, name, help_text in COUNTERS:
+        lines += [f"# HELP {name} {help_text}.", f"# TYPE {name} counter"]
+        for (kind, view), value in sorted(totals.items()):
+            if kind == key:
+                lines.append(f'{name}{{view="{_label(view)}"}} {_number(value)}')
+    lines += ["# HELP talent_cache_events_total Accès aux caches applicatifs (processus courant).",
+              "# TYPE talent_cache_events_total counter"]
+    for key, value in sorted(fragment_cache.cache_stats().items()):
+        kind, _, outcome = key.rpartition('_')
+        if kind:  # les totaux "hits" / "misses" se déduisent des séries par type
+            lines.append(f'talent_cache_events_total{{kind="{_label(kind)}",outcome="{_label(outcome)}"}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+# --- Middleware ---
+
+def server_timing(metrics, total, detail=True):
+    values = [f'total;dur={total * 1000:.1f}']
+    if detail:
+        values += [
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_count} queries"',
+            f'tpl;dur={metrics.template_time * 1000:.1f}',
+        ]
+    return ', '.join(values)
+
+
+def timing_detail_allowed(request):
+    """
+    Détail SQL/gabarits de `Server-Timing` : en DEBUG, avec `SERVER_TIMING_DETAIL`, ou pour
+    un membre du staff déjà chargé par la requête (l'en-tête n'ajoute aucune requête SQL).
+    """
+    if settings.DEBUG or getattr(settings, 'SERVER_TIMING_DETAIL', False):
+        return True
+    user = getattr(request, 'user', None)
+    if user is None or getattr(user, '_wrapped', user) is empty:
+        return False
+    return user.is_staff
+
+
+class PerformanceMiddleware:
+    """À placer en tête de `MIDDLEWARE` (après WhiteNoise : les fichiers statiques ne sont pas mesurés)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFORMANCE_METRICS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or 'unresolved'
+        size = 0 if response.streaming else len(response.content)
+        response['Server-Timing'] = server_timing(metrics, total, timing_detail_allowed(request))
+        registry.observe(view, response.status_code, total, metrics, size)
+        if total * 1000 >= getattr(settings, 'SLOW_REQUEST_MS', 500):
+            log_slow_request(request, view, response.status_code, total, metrics, size)
+        return response
+
+
+def log_slow_request(request, view, status, total, metrics, size):
+    slowest = sorted(metrics.queries, reverse=True)[:LOGGED_QUERIES]
+    logger.warning(
+        "Requête lente %s %s (%s, %s) : %.0f ms, %d requêtes SQL en %.0f ms, gabarits %.0f ms, %d octets%s",
+        request.method, request.get_full_path(), view, status, total * 1000,
+        metrics.db_count, metrics.db_time * 1000, metrics.template_time * 1000, size,
+        ''.join(f"\n  {elapsed * 1000:7.1f} ms  {sql}" for elapsed, sql in slowest),
+    )
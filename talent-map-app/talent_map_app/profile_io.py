@@ -0,0 +1,270 @@
+"""
+Import / export en masse des profils (commandes `import_profiles` et `export_profiles`).
+
+Formats : CSV (en-tête = noms de colonnes) ou JSON Lines (un objet par ligne), lus et
+écrits en flux : la mémoire ne dépend que de la taille d'un lot, pas du fichier.
+
+L'import crée utilisateurs et profils par lots avec `bulk_create` (une transaction par
+lot). Les doublons (nom d'utilisateur ou e-mail, sans tenir compte de la casse) sont
+détectés par une seule requête par lot et par des ensembles en mémoire pour le fichier
+lui-même. `bulk_create` n'appelle ni `save()` ni les signaux : les données dérivées
+(listes pré-découpées, index des compétences, index plein texte, carte des talents,
+cache des recherches) sont alimentées ici, par lot également.
+"""
+import csv
+import json
+from collections import namedtuple
+
+from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator, validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from . import aggregation, autocomplete, fuzzy
+from .cache import bump_search_generation, skill_links_changed
+from .fulltext import get_search_backend, profile_document
+from .models import ProfileSkill, Skill, UserProfile
+from .skills import normalize_key
+
+USER_COLUMNS = ('username', 'email', 'first_name', 'last_name')
+PROFILE_COLUMNS = (
+    'education_level', 'bio', 'skills', 'languages', 'passions', 'projects',
+    'linkedin', 'github', 'youtube', 'website', 'is_validated',
+)
+COLUMNS = USER_COLUMNS + PROFILE_COLUMNS
+URL_COLUMNS = ('linkedin', 'github', 'youtube', 'website')
+FORMATS = ('csv', 'jsonl')
+
+ImportReport = namedtuple('ImportReport', 'created skipped errors')
+
+_validate_username = UnicodeUsernameValidator()
+_validate_url = URLValidator()
+
+
+def guess_format(path, default='csv'):
+    for fmt in FORMATS:
+        if path and path.lower().endswith(f'.{fmt}'):
+            return fmt
+    return default
+
+
+# --- Lecture / écriture en flux ---
+
+def read_records(stream, fmt):
+    """Itère sur les enregistrements (dict) d'un flux texte CSV ou JSONL."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def write_records(stream, fmt, records, columns=COLUMNS):
+    """Écrit les enregistrements au fur et à mesure ; retourne leur nombre."""
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for count, record in enumerate(records, 1):
+            writer.writerow(record)
+        return count
+    for count, record in enumerate(records, 1):
+        stream.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+    return count
+
+
+def export_records(queryset=None, chunk_size=1000):
+    """Profils (avec leur utilisateur) sous forme de dicts, lus par paquets via `.iterator()`."""
+    queryset = UserProfile.objects.all() if queryset is None else queryset
+    fields = [f'user__{c}' for c in USER_COLUMNS] + list(PROFILE_COLUMNS)
+    rows = queryset.order_by('pk').values_list(*fields)
+    for row in rows.iterator(chunk_size=chunk_size):
+        record = dict(zip(COLUMNS, row))
+        for column in COLUMNS:
+            if record[column] is None:
+                record[column] = ''
+        yield record
+
+
+# --- Import ---
+
+def _text(record, column):
+    value = record.get(column)
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in ('1', 'true', 'yes', 'oui', 'vrai', 'x')
+
+
+def build_profile(record):
+    """(User, UserProfile) non sauvegardés à partir d'un enregistrement ; ValidationError si invalide."""
+    if not isinstance(record, dict):
+        raise ValidationError("objet JSON attendu")
+    username = _text(record, 'username')
+    email = _text(record, 'email')
+    if not username:
+        raise ValidationError("username manquant")
+    _validate_username(username)
+    if len(username) > 150:
+        raise ValidationError("username trop long")
+    validate_email(email)
+
+    education_level = _text(record, 'education_level') or 'licence'
+    if education_level not in dict(UserProfile.EDUCATION_CHOICES):
+        raise ValidationError(f"niveau d'études inconnu : {education_level}")
+    links = {}
+    for column in URL_COLUMNS:
+        value = _text(record, column)
+        if value:
+            _validate_url(value)
+        links[column] = value or None
+
+    user = User(
+        username=username, email=email,
+        first_name=_text(record, 'first_name')[:150], last_name=_text(record, 'last_name')[:150],
+    )
+    user.set_unusable_password()  # le mot de passe est choisi via « mot de passe oublié »
+    profile = UserProfile(
+        user=user, education_level=education_level,
+        bio=_text(record, 'bio') or None, skills=_text(record, 'skills') or None,
+        languages=_text(record, 'languages') or None, passions=_text(record, 'passions') or None,
+        projects=_text(record, 'projects') or None,
+        is_validated=_flag(record.get('is_validated')), **links,
+    )
+    return user, profile
+
+
+def existing_identities(usernames, emails):
+    """Noms d'utilisateur et e-mails (en minuscules) déjà présents en base, en une requête."""
+    rows = User.objects.annotate(lower_username=Lower('username'), lower_email=Lower('email')).filter(
+        Q(lower_username__in=usernames) | Q(lower_email__in=emails)
+    ).values_list('lower_username', 'lower_email')
+    taken_usernames, taken_emails = set(), set()
+    for username, email in rows:
+        taken_usernames.add(username)
+        taken_emails.add(email)
+    return taken_usernames, taken_emails
+
+
+def create_profiles(pairs):
+    """
+    Insère des couples (User, UserProfile) non sauvegardés et met à jour les données
+    dérivées. À appeler dans une transaction.
+    """
+    users = User.objects.bulk_create([user for user, _ in pairs])
+    profiles = []
+    for user, (_, profile) in zip(users, pairs):
+        profile.user = user
+        profile.refresh_parsed_lists()
+        profiles.append(profile)
+    profiles = UserProfile.objects.bulk_create(profiles)
+    index_skills(profiles)
+    get_search_backend().index_rows([
+        (profile.pk, *profile_document(
+            ' '.join(filter(None, [profile.user.username, profile.user.first_name, profile.user.last_name])),
+            profile.skills, profile.passions, profile.bio, profile.projects,
+        ))
+        for profile in profiles
+    ])
+    aggregation.add_profiles(profiles)
+    bump_search_generation()
+    transaction.on_commit(bump_search_generation)
+    return profiles
+
+
+def index_skills(profiles):
+    """Équivalent groupé de `UserProfile.sync_skill_index()` pour des profils neufs."""
+    names = {}
+    links = []
+    for profile in profiles:
+        keys = set()
+        for name in profile.skills_list:
+            key = normalize_key(name)
+            if key:
+                names.setdefault(key, name[:100])
+                keys.add(key)
+        links.append((profile.pk, keys))
+    if not names:
+        return
+    known = set(Skill.objects.filter(key__in=names).values_list('key', flat=True))
+    Skill.objects.bulk_create(
+        [Skill(key=k, name=n) for k, n in names.items() if k not in known], ignore_conflicts=True, batch_size=500,
+    )
+    skill_ids = dict(Skill.objects.filter(key__in=names).values_list('key', 'id'))
+    new_skills = [(skill_ids[k], k, names[k]) for k in names if k not in known and k in skill_ids]
+    fuzzy.register_skills(new_skills)
+    ProfileSkill.objects.bulk_create(
+        [ProfileSkill(profile_id=pid, skill_id=skill_ids[k]) for pid, keys in links for k in keys],
+        ignore_conflicts=True, batch_size=500,
+    )
+    autocomplete.record_links([skill_ids[k] for _, keys in links for k in keys], (), new_skills)
+    skill_links_changed()
+
+
+def import_records(records, batch_size=500, dry_run=False):
+    """
+    Importe un flux d'enregistrements par lots de `batch_size`.
+    Les lignes invalides ou en doublon sont ignorées et signalées dans `errors` (numéro, message).
+    """
+    created = skipped = 0
+    errors = []
+    seen_usernames, seen_emails = set(), set()
+    batch = []
+
+    def flush():
+        nonlocal created, skipped
+        taken_usernames, taken_emails = existing_identities(
+            {u.username.lower() for _, u, _ in batch}, {u.email.lower() for _, u, _ in batch},
+        )
+        pairs = []
+        for number, user, profile in batch:
+            if user.username.lower() in taken_usernames:
+                errors.append((number, f"nom d'utilisateur déjà utilisé : {user.username}"))
+            elif user.email.lower() in taken_emails:
+                errors.append((number, f"e-mail déjà utilisé : {user.email}"))
+            else:
+                pairs.append((user, profile))
+        skipped += len(batch) - len(pairs)
+        batch.clear()
+        if not pairs or dry_run:
+            created += len(pairs)
+            return
+        try:
+            with transaction.atomic():
+                create_profiles(pairs)
+        except IntegrityError as exc:  # insertion concurrente : le lot entier est annulé
+            errors.append((None, f"lot de {len(pairs)} profils annulé : {exc}"))
+            skipped += len(pairs)
+        else:
+            created += len(pairs)
+
+    for number, record in enumerate(records, 1):
+        try:
+            user, profile = build_profile(record)
+        except ValidationError as exc:
+            errors.append((number, '; '.join(exc.messages)))
+            skipped += 1
+            continue
+        username, email = user.username.lower(), user.email.lower()
+        if username in seen_usernames or email in seen_emails:
+            errors.append((number, f"doublon dans le fichier : {user.username} / {user.email}"))
+            skipped += 1
+            continue
+        seen_usernames.add(username)
+        seen_emails.add(email)
+        batch.append((number, user, profile))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return ImportReport(created, skipped, errors)
@@ -0,0 +1,131 @@
+"""
+Lectures sur réplique(s) pour les vues de consultation (recherche, détail, carte, API JSON).
+
+Sans `DATABASE_REPLICA_URLS`, rien ne change : tout passe par `default`. Avec une ou
+plusieurs URL, settings.py déclare les alias `replica1`, `replica2`... et installe
+`ReplicaRouter` :
+
+- seules les vues décorées par `@read_replica` lisent sur une réplique, tirée au hasard
+  une fois par requête ; partout ailleurs (inscription, édition, admin, commandes, tâches
+  de fond), lectures et écritures restent sur `default` ;
+- sessions et utilisateurs (`PRIMARY_APPS`) sont toujours lus sur `default` : une
+  connexion ne dépend jamais du retard de réplication (lectures par clé primaire, de
+  toute façon en cache avec `AUTH_USER_CACHE_TIMEOUT`, voir sessions.py) ;
+- une écriture pendant une vue de lecture (session enregistrée, par ex.) ramène les
+  lectures suivantes de la même requête sur `default`, de même qu'une transaction ouverte ;
+- lecture de ses propres écritures d'une requête à l'autre : toute requête non sûre
+  (POST...) pose le cookie `PIN_COOKIE` pendant `REPLICA_PIN_SECONDS` (à régler au-dessus
+  du retard de réplication). La page affichée après la redirection de `profile_edit`
+  est donc lue sur `default`, comme les suivantes, le temps que la réplique rattrape.
+
+Les répliques ne reçoivent aucune migration (`allow_migrate`) : leur schéma vient de la
+réplication. En local, la commande `sync_replicas` copie la base SQLite principale vers
+chaque réplique SQLite, ce qui simule une réplication avec un retard choisi.
+
+Les caches par génération (recherche, facettes, carte) peuvent être remplis à partir
+d'une réplique en retard juste après une écriture : un retard de réplication faible
+devant `SEARCH_CACHE_TTL` et `GENERATION_CACHE_TIMEOUT` le rend négligeable.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+PIN_COOKIE = 'talent_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+# applications dont les modèles sont toujours lus sur la base principale
+PRIMARY_APPS = {'auth', 'sessions'}
+
+
+class _ReadState:
+    """Réplique choisie pour la requête en cours ; `wrote` dès la première écriture."""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.wrote = False
+
+
+_state = ContextVar('replica_read_state', default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def choose_replica(request):
+    """Alias de réplique pour `request`, None si aucune ou si le visiteur vient d'écrire."""
+    replicas = replica_aliases()
+    if not replicas or request.COOKIES.get(PIN_COOKIE):
+        return None
+    return random.choice(replicas)
+
+
+def read_replica(view):
+    """Décorateur (vue synchrone ou asynchrone) : lectures de la vue sur une réplique."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            # variable de contexte : copiée par sync_to_async dans les threads de l'ORM
+            token = _state.set(_ReadState(choose_replica(request)))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _state.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _state.set(_ReadState(choose_replica(request)))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _state.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Routeur de `DATABASE_ROUTERS` : écritures et migrations sur `default`, lectures selon `read_replica`."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.alias is None or state.wrote or model._meta.app_label in PRIMARY_APPS:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # mêmes données partout : un profil lu sur une réplique peut être relié à un objet de default
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def copy_sqlite(source, target):
+    """Copie complète de la base SQLite `source` vers `target` (connexions Django), par l'API de sauvegarde."""
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """Après une requête non sûre, les lectures du visiteur restent sur `default` (`REPLICA_PIN_SECONDS`)."""
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and replica_aliases():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
@@ -0,0 +1,89 @@
+"""
+Revue des profils par les responsables : file d'attente et validation / refus en masse.
+
+La décision est écrite par un seul `UPDATE ... WHERE id IN (...)`. Comme `update()`
+n'appelle pas les signaux, le travail dérivé (carte des talents, caches, e-mails) est
+confié au pool de tâches de fond (`tasks.defer`) : la requête répond aussitôt.
+"""
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.utils import timezone
+
+from . import aggregation
+from . import cache as fragment_cache
+from .models import UserProfile
+from .pagination import keyset_page
+from .tasks import defer
+
+VALIDATE, REJECT = 'validate', 'reject'
+ACTIONS = (VALIDATE, REJECT)
+# taille maximale d'un lot (une requête UPDATE)
+MAX_BATCH = 500
+
+QUEUE_FIELDS = (
+    'id', 'user_id', 'education_level', 'parsed_skills', 'bio', 'created_at', 'updated_at',
+    'user__id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+)
+
+
+def review_queue():
+    """Profils en attente, du plus ancien au plus récent (index partiel `profile_review_queue`)."""
+    return (
+        UserProfile.objects.filter(is_validated=False, rejected_at__isnull=True)
+        .select_related('user').only(*QUEUE_FIELDS).order_by('created_at', 'pk')
+    )
+
+
+def queue_page(cursor=None, per_page=None):
+    return keyset_page(review_queue(), cursor, per_page or settings.SEARCH_PAGE_SIZE, descending=False)
+
+
+def apply_review(profile_ids, action, reviewer):
+    """
+    Valide ou refuse les profils `profile_ids` en une requête ; retourne le nombre de profils modifiés.
+    Les suites (compteurs, caches, notifications) s'exécutent après commit, en arrière-plan.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Action inconnue : {action}")
+    profile_ids = sorted(set(profile_ids))[:MAX_BATCH]
+    if not profile_ids:
+        return 0
+    previous = dict(UserProfile.objects.filter(pk__in=profile_ids).values_list('pk', 'updated_at'))
+    now = timezone.now()
+    values = {'validated_by': reviewer, 'updated_at': now}
+    if action == VALIDATE:
+        values.update(is_validated=True, validated_at=now, rejected_at=None)
+    else:
+        values.update(is_validated=False, validated_at=None, rejected_at=now)
+    updated = UserProfile.objects.filter(pk__in=previous).update(**values)
+    defer(after_review, list(previous.items()), action)
+    return updated
+
+
+def after_review(versions, action):
+    """Tâche de fond : carte des talents, fragments en cache et e-mails des profils revus."""
+    profiles = (
+        UserProfile.objects.filter(pk__in=[pk for pk, _ in versions]).select_related('user')
+        .only('id', 'is_validated', 'education_level', 'languages', 'skills', 'passions', 'user__email', 'user__username')
+    )
+    messages = []
+    for profile in profiles:
+        aggregation.update_profile(profile)
+        if profile.user.email:
+            messages.append(notification(profile, action))
+    for pk, updated_at in versions:
+        fragment_cache.invalidate_profile(pk, updated_at)
+    fragment_cache.bump_search_generation()
+    if messages:
+        send_mass_mail(messages, fail_silently=True)
+
+
+def notification(profile, action):
+    if action == VALIDATE:
+        subject = "Votre profil a été validé"
+        body = "Bonjour {name},\n\nVotre profil Talent Map a été validé par un responsable."
+    else:
+        subject = "Votre profil n'a pas été validé"
+        body = ("Bonjour {name},\n\nVotre profil Talent Map n'a pas été validé. "
+                "Complétez-le puis enregistrez-le pour qu'il soit de nouveau examiné.")
+    return subject, body.format(name=profile.user.username), settings.DEFAULT_FROM_EMAIL, [profile.user.email]
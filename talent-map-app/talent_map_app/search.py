@@ -0,0 +1,166 @@
+"""
+Construction de la recherche de profils (partagée par la vue HTML et les autres points d'entrée).
+
+`search_criteria()` normalise les données d'un `SearchForm` validé en un tuple
+hashable (`SearchCriteria`), utilisé à la fois pour construire le QuerySet et comme
+clé du cache de résultats (`cache.cached_search_ids`).
+"""
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import Count, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .cache import cached_search_ids
+from .fulltext import get_search_backend
+from .fuzzy import expand_keys
+from .models import ProfileSkill, UserProfile
+from .pagination import decode_cursor, encode_cursor, id_list_page, keyset_page, offset_page
+from .skills import normalize_key
+
+# Bonus de pertinence par compétence correspondant exactement à un terme recherché
+SKILL_MATCH_WEIGHT = 1.0
+
+# Colonnes lues par search/_results_page.html (+ created_at pour le curseur de pagination,
+# updated_at pour la clé du fragment en cache)
+SEARCH_CARD_FIELDS = (
+    'id', 'user_id', 'education_level', 'parsed_skills', 'bio', 'created_at', 'updated_at',
+    'user__id', 'user__username', 'user__first_name', 'user__last_name',
+)
+
+_TERM_SPLIT_RE = re.compile(r'[,;]\s*|\s+')
+
+SearchCriteria = namedtuple('SearchCriteria', 'terms skill_keys education_level language sort_by')
+
+
+def search_criteria(cleaned_data=None):
+    """
+    Normalise les filtres de recherche : termes repliés et triés (l'ordre n'a pas
+    d'incidence sur le résultat), clés de compétences (mots et expressions entre virgules,
+    complétés par les compétences proches, voir fuzzy.py),
+    langue en minuscules, tri explicite ('relevance' si des termes sont saisis, sinon 'newest').
+    """
+    cleaned_data = cleaned_data or {}
+    q = (cleaned_data.get('q') or '').strip()
+    terms = {normalize_key(t) for t in _TERM_SPLIT_RE.split(q) if t}
+    terms.discard('')
+    skill_keys = terms | {normalize_key(p) for p in re.split(r'[,;]', q)}
+    skill_keys.discard('')
+    # fautes de frappe et synonymes ("Djnago", "JS") -> compétences connues du vocabulaire
+    expanded = expand_keys(skill_keys)
+    skill_keys |= expanded
+    terms |= {key for key in expanded if ' ' not in key}
+
+    sort_by = cleaned_data.get('sort_by') or ''
+    if sort_by in ('', 'relevance'):
+        sort_by = 'relevance' if terms else 'newest'
+
+    return SearchCriteria(
+        terms=tuple(sorted(terms)),
+        skill_keys=tuple(sorted(skill_keys)),
+        education_level=cleaned_data.get('education_level') or '',
+        language=(cleaned_data.get('language') or '').strip().lower(),
+        sort_by=sort_by,
+    )
+
+
+def search_queryset(criteria, only_fields=SEARCH_CARD_FIELDS):
+    """
+    Retourne le QuerySet trié correspondant aux critères (tous profils, y compris le visiteur).
+    Tri 'relevance' : score plein texte + correspondances exactes dans l'index des compétences ;
+    sinon tri par (created_at, id), compatible avec la pagination par curseur.
+    """
+    # une seule requête pour la page : user joint, uniquement les colonnes affichées par les cartes
+    qs = UserProfile.objects.select_related('user').only(*only_fields)
+
+    if criteria.terms:
+        # compétences : recherche exacte sur la clé normalisée (index) au lieu d'un LIKE
+        skill_matches = ProfileSkill.objects.filter(skill__key__in=criteria.skill_keys)
+        skill_hits = Subquery(
+            skill_matches.filter(profile=OuterRef('pk')).order_by()
+            .values('profile').annotate(n=Count('pk')).values('n')
+        )
+        # bio, passions, projets et noms : index plein texte (tsvector / FTS5)
+        backend = get_search_backend()
+        qs = qs.filter(
+            Q(pk__in=skill_matches.values('profile_id')) | backend.match(criteria.terms)
+        ).annotate(
+            relevance=(
+                Coalesce(backend.rank(criteria.terms), Value(0.0), output_field=FloatField())
+                + Coalesce(skill_hits, 0, output_field=FloatField()) * SKILL_MATCH_WEIGHT
+            ),
+        )
+
+    qs = filter_profiles(qs, criteria)
+
+    if criteria.sort_by == 'relevance':
+        return qs.order_by('-relevance', '-created_at', '-pk')
+    # tri par date : created_at (indexable, même ordre que la date d'inscription)
+    if criteria.sort_by == 'oldest':
+        return qs.order_by('created_at', 'pk')
+    return qs.order_by('-created_at', '-pk')
+
+
+def filter_profiles(qs, criteria):
+    """Filtres niveau d'études et langue des critères (partagés avec les facettes)."""
+    if criteria.education_level:
+        qs = qs.filter(education_level=criteria.education_level)
+    if criteria.language:
+        qs = qs.filter(languages__icontains=criteria.language)
+    return qs
+
+
+def _result_ids(qs):
+    """Ids (profil, utilisateur) du résultat complet, ou None s'il dépasse SEARCH_CACHE_MAX_IDS."""
+    limit = getattr(settings, 'SEARCH_CACHE_MAX_IDS', 5000)
+    rows = list(qs.values_list('pk', 'user_id')[:limit + 1])
+    return rows if len(rows) <= limit else None
+
+
+def search_page(criteria, params, exclude_user_id=None, per_page=None, only_fields=SEARCH_CARD_FIELDS):
+    """
+    Page de résultats pour `criteria` à partir des paramètres GET (`page` ou `cursor`).
+    Chemin rapide : liste d'ids en cache, seule la page est chargée depuis la base.
+    Sinon (résultat trop gros, curseur inconnu) : pagination directement en base.
+    `only_fields` : colonnes chargées pour les profils de la page (cartes HTML par défaut).
+    """
+    per_page = per_page or getattr(settings, 'SEARCH_PAGE_SIZE', 20)
+    qs = search_queryset(criteria, only_fields)
+    ranked = criteria.sort_by == 'relevance'
+
+    rows = cached_search_ids(criteria, lambda: _result_ids(qs))
+    if rows is not None:
+        ids = [pk for pk, user_id in rows if user_id != exclude_user_id]
+        start = _cached_start(ids, params, ranked, per_page)
+        if start is not None:
+            hydrate = UserProfile.objects.select_related('user').only(*only_fields)
+            if ranked:
+                def next_params(items, start):
+                    return {'page': str(start // per_page + 2)}
+            else:
+                def next_params(items, start):
+                    return {'cursor': encode_cursor(items[-1].created_at, items[-1].pk)}
+            return id_list_page(hydrate, ids, start, per_page, next_params)
+
+    if exclude_user_id is not None:
+        qs = qs.exclude(user_id=exclude_user_id)
+    if ranked:
+        return offset_page(qs, params.get('page'), per_page)
+    return keyset_page(qs, params.get('cursor'), per_page, descending=criteria.sort_by != 'oldest')
+
+
+def _cached_start(ids, params, ranked, per_page):
+    """Position de départ dans la liste en cache, ou None si le curseur n'y figure pas."""
+    if ranked:
+        try:
+            return (max(int(params.get('page') or 1), 1) - 1) * per_page
+        except (TypeError, ValueError):
+            return 0
+    position = decode_cursor(params.get('cursor'))
+    if position is None:
+        return 0
+    try:
+        return ids.index(position[1]) + 1
+    except ValueError:
+        return None
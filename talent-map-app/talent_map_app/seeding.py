@@ -0,0 +1,75 @@
+"""
+Profils synthétiques pour les mesures de performance (`seed_profiles`, `benchmark`).
+
+Les distributions imitent une vraie promotion : quelques compétences très répandues et
+une longue traîne (loi de Zipf sur le vocabulaire), le français presque partout,
+l'anglais souvent, les autres langues rarement. Le générateur est déterministe pour une
+graine donnée ; les enregistrements passent par `profile_io.import_records`, comme un
+import réel (validation, doublons, données dérivées).
+"""
+import random
+from itertools import accumulate
+
+SKILLS = (
+    'Python', 'JavaScript', 'SQL', 'Git', 'Java', 'HTML', 'CSS', 'Linux', 'React', 'Django',
+    'Docker', 'TypeScript', 'Node.js', 'C', 'C++', 'PHP', 'Excel', 'Pandas', 'Machine Learning', 'Kubernetes',
+    'AWS', 'PostgreSQL', 'MongoDB', 'Flask', 'Vue.js', 'Angular', 'C#', '.NET', 'Spring', 'Go',
+    'Rust', 'Kotlin', 'Swift', 'Flutter', 'Dart', 'TensorFlow', 'PyTorch', 'scikit-learn', 'NumPy', 'R',
+    'Power BI', 'Tableau', 'Figma', 'UX Design', 'Photoshop', 'Illustrator', 'Blender', 'Unity', 'Unreal Engine', 'Arduino',
+    'Raspberry Pi', 'MATLAB', 'Simulink', 'SolidWorks', 'AutoCAD', 'Terraform', 'Ansible', 'Jenkins', 'GitLab CI', 'Bash',
+    'Redis', 'Elasticsearch', 'Kafka', 'Spark', 'Hadoop', 'Airflow', 'GraphQL', 'REST', 'FastAPI', 'Laravel',
+    'Symfony', 'WordPress', 'Next.js', 'Svelte', 'Tailwind', 'Bootstrap', 'jQuery', 'Scala', 'Haskell', 'Elixir',
+    'Ruby', 'Rails', 'Perl', 'Lua', 'Julia', 'Solidity', 'Cybersécurité', 'Réseaux', 'Cisco', 'Wireshark',
+    'SAP', 'Salesforce', 'Jira', 'Scrum', 'Gestion de projet', 'Statistiques', 'Data Visualisation', 'NLP', 'Vision par ordinateur', 'Robotique',
+)
+LANGUAGES = (('Français', 0.95), ('Anglais', 0.75), ('Espagnol', 0.15), ('Arabe', 0.12), ('Allemand', 0.08),
+             ('Wolof', 0.05), ('Portugais', 0.04), ('Italien', 0.04), ('Chinois', 0.02))
+PASSIONS = ('IA', 'Web', 'Mobile', 'Jeux', 'Robotique', 'Musique', 'Photographie', 'Sport', 'Lecture', 'Voyage',
+            'Entrepreneuriat', 'Open source', 'Écologie', 'Cinéma', 'Design', 'Cuisine')
+EDUCATION = (('licence', 0.45), ('master', 0.3), ('bac', 0.15), ('Ingénieur', 0.1))
+FIRST_NAMES = ('Awa', 'Moussa', 'Fatou', 'Ibrahima', 'Léa', 'Hugo', 'Chloé', 'Lucas', 'Aïcha', 'Omar',
+               'Inès', 'Yanis', 'Manon', 'Karim', 'Sarah', 'Théo', 'Mariam', 'Adam', 'Emma', 'Nadia')
+LAST_NAMES = ('Diop', 'Ndiaye', 'Martin', 'Bernard', 'Fall', 'Traoré', 'Dubois', 'Sow', 'Moreau', 'Diallo',
+              'Laurent', 'Ba', 'Simon', 'Camara', 'Michel', 'Faye', 'Garcia', 'Cissé', 'Roux', 'Kane')
+ROLES = ('Développeur', 'Étudiante', 'Data analyst', 'Ingénieure', 'Designer', 'Chef de projet', 'Administrateur système')
+
+# poids de Zipf (s = 1) : la 1re compétence est 100 fois plus citée que la 100e
+SKILL_WEIGHTS = tuple(accumulate(1 / rank for rank in range(1, len(SKILLS) + 1)))
+
+
+def _pick_skills(rng, count):
+    chosen = []
+    while len(chosen) < count:
+        skill = rng.choices(SKILLS, cum_weights=SKILL_WEIGHTS)[0]
+        if skill not in chosen:
+            chosen.append(skill)
+    return chosen
+
+
+def synthetic_record(rng, number, prefix='seed'):
+    """Un enregistrement au format de `profile_io.COLUMNS`."""
+    skills = _pick_skills(rng, rng.randint(2, 8))
+    languages = [name for name, share in LANGUAGES if rng.random() < share] or ['Français']
+    passions = rng.sample(PASSIONS, rng.randint(1, 3))
+    username = f'{prefix}_{number}'
+    return {
+        'username': username,
+        'email': f'{username}@example.com',
+        'first_name': rng.choice(FIRST_NAMES),
+        'last_name': rng.choice(LAST_NAMES),
+        'education_level': rng.choices([level for level, _ in EDUCATION], [share for _, share in EDUCATION])[0],
+        'bio': f"{rng.choice(ROLES)} passionné(e) de {passions[0]}, à l'aise en {skills[0]} et {skills[-1]}.",
+        'skills': ', '.join(skills),
+        'languages': ', '.join(languages),
+        'passions': ', '.join(passions),
+        'projects': f"Projet {skills[0]} - {rng.choice(PASSIONS)}" if rng.random() < 0.6 else '',
+        'github': f'https://github.com/{username}' if rng.random() < 0.4 else '',
+        'is_validated': rng.random() < 0.7,
+    }
+
+
+def synthetic_records(count, seed=0, start=0, prefix='seed'):
+    """`count` enregistrements numérotés à partir de `start` (même graine, mêmes profils)."""
+    rng = random.Random(f'{seed}:{start}')
+    for number in range(start, start + count):
+        yield synthetic_record(rng, number, prefix)
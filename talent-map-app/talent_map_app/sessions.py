@@ -0,0 +1,115 @@
+"""
+Sessions et authentification à moindre coût pour les vues `login_required`.
+
+Avec le moteur de sessions en base, chaque requête authentifiée coûte deux requêtes SQL
+avant même la vue : lecture de la session, puis de l'utilisateur. Deux réglages les
+suppriment (voir settings.py) :
+
+- `SESSION_ENGINE` (`SESSION_MODE`) : `cached_db` lit la session dans le cache et ne
+  retombe sur la base qu'en cas d'absence ; `signed_cookies` la garde entièrement dans
+  le cookie signé (aucune table, mais une session ne peut plus être révoquée côté
+  serveur avant expiration) ;
+- `AUTH_USER_CACHE_TIMEOUT` : l'utilisateur connecté est gardé dans le cache Django par
+  `CachedAuthenticationMiddleware`. Seules les colonnes `CACHED_USER_FIELDS` et l'empreinte
+  de session (HMAC du mot de passe) sont mises en cache, jamais le hachage du mot de passe
+  lui-même ; les colonnes absentes sont différées (relues en base si une vue les lit).
+  L'empreinte enregistrée dans la session est toujours vérifiée, comme le fait
+  `django.contrib.auth.get_user` ; l'entrée est supprimée à chaque sauvegarde ou
+  suppression de l'utilisateur (signals.py).
+
+Ces deux caches ne sont sûrs qu'avec un backend partagé par tous les processus (Redis,
+Memcached, fichiers) : avec locmem, une déconnexion ou un compte désactivé ne seraient
+vus par les autres workers qu'à l'expiration. Ils sont donc désactivés par défaut avec
+`CACHE_BACKEND=locmem`.
+
+`current_profile(request)` charge au plus une fois par requête le profil du visiteur.
+La commande `purge_sessions` supprime par lots les sessions expirées de la table.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import router
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .cache import KEY_PREFIX
+
+# colonnes de l'utilisateur gardées dans le cache (jamais `password`)
+CACHED_USER_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email',
+    'is_active', 'is_staff', 'is_superuser', 'last_login', 'date_joined',
+)
+
+
+def user_cache_key(user_id):
+    return f'{KEY_PREFIX}:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def _cache_entry(user):
+    """Valeurs de `CACHED_USER_FIELDS` et empreinte de session, sans le hachage du mot de passe."""
+    return {field: getattr(user, field) for field in CACHED_USER_FIELDS}, user.get_session_auth_hash()
+
+
+def _cached_user(values):
+    """Utilisateur reconstruit depuis le cache ; les autres colonnes sont différées."""
+    model = auth.get_user_model()
+    # from_db attend les valeurs dans l'ordre des colonnes du modèle
+    fields = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db(router.db_for_read(model), fields, [values[field] for field in fields])
+
+
+def _cached_session_user(request):
+    """Utilisateur de la session lu dans le cache ; None si absent ou session non valide pour lui."""
+    try:
+        user_id = auth._get_user_session_key(request)
+    except KeyError:
+        return None
+    backend_path = request.session.get(auth.BACKEND_SESSION_KEY)
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return None
+    entry = cache.get(user_cache_key(user_id))
+    if entry is None:
+        return None
+    values, auth_hash = entry
+    # même contrôle que get_user : un changement de mot de passe invalide les autres sessions
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(session_hash, auth_hash):
+        return None
+    return _cached_user(values)
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        timeout = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 0)
+        user = _cached_session_user(request) if timeout else None
+        if user is None:
+            user = auth.get_user(request)
+            if timeout and user.is_authenticated:
+                cache.set(user_cache_key(user.pk), _cache_entry(user), timeout)
+        request._cached_user = user
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """`AuthenticationMiddleware` dont l'utilisateur est lu dans le cache (`AUTH_USER_CACHE_TIMEOUT`)."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+
+
+def current_profile(request):
+    """Profil du visiteur connecté (None sans profil ou anonyme), chargé au plus une fois par requête."""
+    if not hasattr(request, '_cached_profile'):
+        from .models import UserProfile
+        user = getattr(request, 'user', AnonymousUser())
+        request._cached_profile = (
+            UserProfile.objects.filter(user_id=user.pk).first() if user.is_authenticated else None
+        )
+    return request._cached_profile
@@ -0,0 +1,92 @@
+"""
+Récepteurs de signaux : maintiennent les index et caches dérivés des profils à jour
+de façon incrémentale (un profil à la fois, dans la transaction de l'écriture).
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import aggregation, autocomplete, fuzzy, sessions
+from . import cache as fragment_cache
+from .fulltext import get_search_backend
+from .models import SkillAlias, UserProfile
+
+# champs de User affichés dans les cartes et indexés par la recherche plein texte
+USER_DISPLAY_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def invalidate_search_results():
+    # tout de suite (même transaction) et après commit : une recherche lancée entre les deux
+    # par un autre processus ne doit pas garder en cache un résultat antérieur à l'écriture
+    fragment_cache.bump_search_generation()
+    transaction.on_commit(fragment_cache.bump_search_generation)
+
+
+@receiver(pre_save, sender=UserProfile, dispatch_uid='cache_remember_profile_version')
+def remember_profile_version(sender, instance, raw=False, **kwargs):
+    # updated_at n'est pas encore mis à jour (auto_now) : c'est la version actuellement en cache
+    instance._cached_updated_at = instance.updated_at
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='fulltext_index_profile')
+def index_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    get_search_backend().index_profile(instance)
+    aggregation.update_profile(instance)
+    invalidate_search_results()
+    previous = getattr(instance, '_cached_updated_at', None)
+    if previous:
+        fragment_cache.invalidate_profile(instance.pk, previous)
+
+
+@receiver(pre_delete, sender=UserProfile, dispatch_uid='talent_map_remove_profile')
+def remove_talent_map_contribution(sender, instance, **kwargs):
+    # avant la suppression en cascade de TalentMapEntry, qui mémorise la contribution à retirer
+    aggregation.remove_profile(instance.pk)
+
+
+@receiver(post_delete, sender=UserProfile, dispatch_uid='fulltext_remove_profile')
+def remove_profile(sender, instance, **kwargs):
+    get_search_backend().remove_profile(instance.pk)
+    autocomplete.invalidate()  # liens ProfileSkill supprimés en cascade : popularités à recompter
+    fragment_cache.skill_links_changed()
+    invalidate_search_results()
+    fragment_cache.invalidate_profile(instance.pk, instance.updated_at)
+
+
+@receiver(post_save, sender=User, dispatch_uid='fulltext_index_user')
+def index_user_profile(sender, instance, raw=False, created=False, **kwargs):
+    """
+    Les noms de l'utilisateur font partie du document indexé et des fragments en cache :
+    on réindexe le profil et on avance son `updated_at` (nouvelle clé de cache, nouvel ETag).
+    """
+    if raw or created:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not USER_DISPLAY_FIELDS & set(update_fields):
+        return  # ex. mise à jour de last_login à la connexion
+    profile = UserProfile.objects.filter(user=instance).first()
+    if profile is not None:
+        fragment_cache.invalidate_profile(profile.pk, profile.updated_at)
+        profile.updated_at = timezone.now()
+        UserProfile.objects.filter(pk=profile.pk).update(updated_at=profile.updated_at)
+        profile.user = instance
+        get_search_backend().index_profile(profile)
+        invalidate_search_results()
+
+
+@receiver(post_save, sender=User, dispatch_uid='sessions_invalidate_user_saved')
+@receiver(post_delete, sender=User, dispatch_uid='sessions_invalidate_user_deleted')
+def invalidate_cached_user(sender, instance, **kwargs):
+    # droits, mot de passe (empreinte de session) ou compte désactivé : relu en base à la requête suivante
+    sessions.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=SkillAlias, dispatch_uid='fuzzy_alias_saved')
+@receiver(post_delete, sender=SkillAlias, dispatch_uid='fuzzy_alias_deleted')
+def skill_aliases_changed(sender, **kwargs):
+    fuzzy.aliases_changed()
+    invalidate_search_results()
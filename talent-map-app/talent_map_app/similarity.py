@@ -0,0 +1,244 @@
+"""
+Profils similaires : pour chaque profil, les `NEIGHBORS` profils les plus proches au sens
+de la similarité de Jaccard sur l'ensemble de ses compétences, passions et langues
+(clés normalisées, préfixées par leur nature : « python » compétence ≠ « python » passion).
+
+Comparer toutes les paires serait quadratique. On passe par MinHash + LSH :
+
+- chaque élément reçoit une fois pour toutes `PERMUTATIONS` valeurs de hachage
+  (h_i(x) = a_i·x + b_i mod 2^61 - 1) ; la signature d'un profil est le minimum, élément
+  par élément, des valeurs de ses éléments. Deux signatures coïncident sur une position
+  avec une probabilité égale à la similarité de Jaccard des deux ensembles ;
+- la signature est découpée en `BANDS` bandes de `ROWS` valeurs ; deux profils qui
+  partagent une bande complète tombent dans le même seau et deviennent candidats.
+  Avec 20 bandes de 3, une paire à 0,5 est candidate dans 93 % des cas, à 0,7 dans
+  99,9 %, à 0,3 dans 42 %, à 0,2 dans 15 % ;
+- seuls les candidats sont comparés, avec la similarité de Jaccard exacte.
+
+Un seau très peuplé (profils réduits à une compétence courante, par ex.) ne produit
+pas tous ses couples : chaque membre n'y voit que ses `MAX_BUCKET` voisins dans l'ordre
+des ids. Le coût reste ainsi linéaire en nombre de profils.
+
+Les résultats sont stockés dans `SimilarProfile` (une ligne par voisin, rang 1 à N) ;
+la page détail les lit en une requête sur l'index unique (profile, rank).
+
+La commande `build_similarity` recalcule tout (tâche nocturne) ou, avec
+`--incremental`, seulement les profils modifiés depuis le dernier calcul, ceux qui les
+comptaient parmi leurs voisins et ceux dont ils intègrent désormais la liste. Les
+signatures, peu coûteuses, sont toujours recalculées pour tous les profils.
+"""
+import hashlib
+import heapq
+import random
+from bisect import bisect_left
+from collections import Counter, namedtuple
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from .models import SimilarProfile, UserProfile
+from .skills import normalize_key
+
+PERMUTATIONS = 60
+BANDS = 20
+ROWS = PERMUTATIONS // BANDS
+NEIGHBORS = 10
+# en dessous, deux profils ne sont pas présentés comme similaires
+MIN_SCORE = 0.2
+MAX_BUCKET = 200
+# candidats comparés exactement, par voisin demandé
+SHORTLIST = 10
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20261018)  # graine fixe : signatures identiques d'une exécution à l'autre
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(PERMUTATIONS)]
+
+Neighbor = namedtuple('Neighbor', 'profile score common_skills')
+
+
+def profile_tokens(skills, passions, languages):
+    """Ensemble des éléments comparés : 's:python', 'p:ia', 'l:anglais'..."""
+    tokens = set()
+    for prefix, items in (('s', skills), ('p', passions), ('l', languages)):
+        for item in items or ():
+            key = normalize_key(item)
+            if key:
+                tokens.add(f'{prefix}:{key}')
+    return frozenset(tokens)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+class MinHasher:
+    """Signatures MinHash ; les valeurs de hachage de chaque élément sont calculées une seule fois."""
+
+    def __init__(self):
+        self._hashes = {}
+
+    def token_hashes(self, token):
+        hashes = self._hashes.get(token)
+        if hashes is None:
+            x = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'big')
+            hashes = self._hashes[token] = tuple((a * x + b) % _PRIME for a, b in _COEFFICIENTS)
+        return hashes
+
+    def signature(self, tokens):
+        """Minimum élément par élément des hachages (None pour un ensemble vide)."""
+        if not tokens:
+            return None
+        return tuple(map(min, zip(*(self.token_hashes(t) for t in tokens))))
+
+
+def estimate(signature_a, signature_b):
+    """Similarité de Jaccard estimée à partir de deux signatures."""
+    return sum(x == y for x, y in zip(signature_a, signature_b)) / PERMUTATIONS
+
+
+class SimilarityIndex:
+    """Ensembles et seaux LSH de tous les profils ; calcule les voisins de n'importe lequel d'entre eux."""
+
+    def __init__(self, profiles):
+        """`profiles` : couples (profile_id, ensemble d'éléments), triés par id."""
+        hasher = MinHasher()
+        self.tokens = {}
+        self.buckets = {}
+        self.bucket_keys = {}
+        for profile_id, tokens in profiles:
+            signature = hasher.signature(tokens)
+            if signature is None:
+                continue
+            self.tokens[profile_id] = tokens
+            keys = [hash((band, signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+            self.bucket_keys[profile_id] = keys
+            for key in keys:
+                self.buckets.setdefault(key, []).append(profile_id)
+
+    @classmethod
+    def from_database(cls):
+        rows = UserProfile.objects.order_by('pk').values_list(
+            'pk', 'parsed_skills', 'parsed_passions', 'parsed_languages',
+        )
+        return cls((pk, profile_tokens(*lists)) for pk, *lists in rows.iterator(chunk_size=2000))
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def candidates(self, profile_id):
+        """
+        Profils partageant au moins un seau avec `profile_id` (fenêtre de MAX_BUCKET dans les
+        gros seaux), avec le nombre de seaux partagés : Counter {profile_id: seaux}.
+        """
+        found = Counter()
+        for key in self.bucket_keys.get(profile_id, ()):
+            members = self.buckets[key]
+            if len(members) > MAX_BUCKET:
+                # membres ajoutés par ids croissants : la liste est triée
+                position = bisect_left(members, profile_id)
+                start = max(0, min(position - MAX_BUCKET // 2, len(members) - MAX_BUCKET))
+                members = members[start:start + MAX_BUCKET]
+            found.update(members)
+        del found[profile_id]
+        return found
+
+    def neighbors(self, profile_id, n=NEIGHBORS, min_score=MIN_SCORE):
+        """Les `n` profils les plus similaires : [(profile_id, score)], score décroissant puis id croissant."""
+        tokens = self.tokens.get(profile_id)
+        if not tokens:
+            return []
+        candidates = self.candidates(profile_id)
+        if len(candidates) > n * SHORTLIST:
+            # le nombre de seaux partagés croît avec la similarité : seuls les mieux placés sont comparés
+            candidates = dict(candidates.most_common(n * SHORTLIST))
+        scored = ((jaccard(tokens, self.tokens[other]), other) for other in candidates)
+        best = heapq.nsmallest(n, ((-score, other) for score, other in scored if score >= min_score))
+        return [(other, round(-score, 4)) for score, other in best]
+
+
+def _store(index, profile_ids, computed_at, chunk_size=500):
+    """
+    Remplace les voisins de `profile_ids` par paquets : une courte transaction par paquet,
+    pour ne pas bloquer les écritures pendant tout le calcul. La page détail voit pour chaque
+    profil soit l'ancienne liste, soit la nouvelle.
+    """
+    for i in range(0, len(profile_ids), chunk_size):
+        chunk = profile_ids[i:i + chunk_size]
+        rows = [
+            SimilarProfile(profile_id=profile_id, similar_id=other, rank=rank, score=score, computed_at=computed_at)
+            for profile_id in chunk
+            for rank, (other, score) in enumerate(index.neighbors(profile_id), start=1)
+        ]
+        with transaction.atomic():
+            SimilarProfile.objects.filter(profile_id__in=chunk).delete()
+            SimilarProfile.objects.bulk_create(rows, batch_size=500)
+
+
+def last_build():
+    """Date du dernier calcul (None si la table est vide)."""
+    return SimilarProfile.objects.aggregate(last=Max('computed_at'))['last']
+
+
+def build(index=None):
+    """Recalcule les voisins de tous les profils ; renvoie le nombre de profils traités."""
+    computed_at = timezone.now()  # avant la lecture : une modification concurrente sera reprise au prochain passage
+    index = index or SimilarityIndex.from_database()
+    _store(index, list(index.tokens), computed_at)
+    # profils vidés (plus aucun élément comparable) depuis le calcul précédent
+    SimilarProfile.objects.filter(computed_at__lt=computed_at).delete()
+    return len(index)
+
+
+def update(since, index=None):
+    """
+    Recalcule les voisins des profils modifiés depuis `since` et des profils concernés par
+    ces modifications ; renvoie le nombre de profils recalculés.
+    """
+    computed_at = timezone.now()
+    changed = list(UserProfile.objects.filter(updated_at__gt=since).values_list('pk', flat=True))
+    if not changed:
+        return 0
+    index = index or SimilarityIndex.from_database()
+    affected = set(changed)
+    # profils qui les comptaient parmi leurs voisins (score périmé)
+    for i in range(0, len(changed), 500):
+        affected.update(SimilarProfile.objects.filter(similar_id__in=changed[i:i + 500]).values_list('profile_id', flat=True))
+    # profils dont la liste accueillerait désormais un profil modifié : score au moins égal à leur N-ième voisin
+    scores = {}
+    for profile_id in changed:
+        for other, score in index.neighbors(profile_id, n=NEIGHBORS * SHORTLIST):
+            scores[other] = max(score, scores.get(other, 0.0))
+    others = list(scores)
+    floor = {}
+    for i in range(0, len(others), 500):
+        floor.update(SimilarProfile.objects.filter(profile_id__in=others[i:i + 500], rank=NEIGHBORS)
+                     .values_list('profile_id', 'score'))
+    affected.update(other for other, score in scores.items() if score >= floor.get(other, 0.0))
+    affected = sorted(affected)
+    _store(index, affected, computed_at)
+    return len(affected)
+
+
+def similar_profiles(profile, limit=NEIGHBORS):
+    """
+    Voisins précalculés d'un profil, avec jusqu'à trois compétences communes.
+    Une requête (index unique profile, rank), évaluée au premier accès (rendu du gabarit).
+    """
+    def load():
+        keys = {normalize_key(skill) for skill in profile.skills_list}
+        rows = (
+            SimilarProfile.objects.filter(profile=profile).order_by('rank')
+            .select_related('similar__user')
+            .only('score', 'similar__user_id', 'similar__education_level', 'similar__parsed_skills',
+                  'similar__user__username', 'similar__user__first_name', 'similar__user__last_name')
+        )[:limit]
+        return [
+            Neighbor(row.similar, row.score, [s for s in row.similar.skills_list if normalize_key(s) in keys][:3])
+            for row in rows
+        ]
+    return SimpleLazyObject(load)
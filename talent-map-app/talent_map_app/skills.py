@@ -0,0 +1,37 @@
+"""
+Outils de normalisation des listes saisies en texte libre (compétences, langues, passions).
+
+Les clés normalisées (minuscules, sans accents, espaces compactés) servent
+d'identifiant stable pour l'index des compétences : "Python", " python " et
+"PYTHON" pointent vers la même entrée `Skill`.
+"""
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def split_list(value, sep=','):
+    """Découpe une chaîne séparée par `sep` en éléments stripés (éléments vides exclus)."""
+    if not value:
+        return []
+    return [s.strip() for s in str(value).split(sep) if s.strip()]
+
+
+def normalize_key(value):
+    """Retourne la clé repliée (casse + accents) d'un libellé : 'Réseaux ' -> 'reseaux'."""
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    return _WHITESPACE_RE.sub(' ', value).strip().casefold()
+
+
+def unique_by_key(items):
+    """Supprime les doublons (au sens de `normalize_key`) en conservant le premier libellé rencontré."""
+    seen = set()
+    result = []
+    for item in items:
+        key = normalize_key(item)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
@@ -0,0 +1,93 @@
+"""
+Démarrage du conteneur (voir `start.sh`) : attente active de la base, détection des
+migrations manquantes et mesure du temps de démarrage.
+
+- `wait_for_database` ouvre une connexion et exécute `SELECT 1` jusqu'à réussir, avec
+  un intervalle croissant (borné) entre les tentatives : le serveur démarre dès que la
+  base répond, au lieu d'attendre une durée fixe.
+- `unapplied_migrations` lit le graphe des migrations et la table `django_migrations`
+  (une requête) : sans migration en attente, l'étape de mise en production ne coûte
+  que le chargement de Django.
+- `measure_startup` est exécuté dans un processus neuf par la commande
+  `startup_report` : import de Django et des réglages, `django.setup()`, chargement des
+  middlewares et des URL, puis première et deuxième requête sur chaque chemin.
+"""
+import importlib
+import os
+import time
+
+# intervalle maximal entre deux tentatives de connexion (secondes)
+MAX_INTERVAL = 2.0
+
+
+def wait_for_database(connection, timeout=30.0, interval=0.1):
+    """
+    Attend que `connection` accepte une requête ; renvoie le nombre de tentatives.
+    Lève OperationalError (la dernière reçue) si la base ne répond pas avant `timeout` secondes.
+    """
+    from django.db import OperationalError
+    deadline = time.monotonic() + timeout
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            connection.ensure_connection()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return attempts
+        except OperationalError:
+            connection.close()
+            if time.monotonic() + interval > deadline:
+                raise
+        time.sleep(interval)
+        interval = min(interval * 2, MAX_INTERVAL)
+
+
+def unapplied_migrations(connection):
+    """Migrations non appliquées, dans l'ordre d'application : [(app, nom)]."""
+    from django.db.migrations.executor import MigrationExecutor
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [(migration.app_label, migration.name) for migration, backwards in plan if not backwards]
+
+
+def measure_startup(paths):
+    """
+    Durées (ms) des étapes du démarrage, mesurées dans le processus courant, qui ne doit
+    pas encore avoir importé Django ; première et deuxième requête GET sur chaque chemin.
+    """
+    report = {'phases': {}, 'requests': {}}
+    phases = report['phases']
+
+    def phase(name, fn):
+        t = time.perf_counter()
+        result = fn()
+        phases[name] = round((time.perf_counter() - t) * 1000, 1)
+        return result
+
+    phase('import', lambda: importlib.import_module('django.core.wsgi'))
+    import django
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+    phase('settings', lambda: settings.INSTALLED_APPS)
+    phase('setup', django.setup)
+    phase('middleware', get_wsgi_application)
+    from django.urls import get_resolver
+    phase('urls', lambda: get_resolver().url_patterns)
+
+    from django.test import Client, override_settings
+    overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+    # sans collectstatic (développement), les gabarits ne trouveraient pas le manifeste
+    report['collected'] = os.path.exists(os.path.join(settings.STATIC_ROOT, 'staticfiles.json'))
+    if not report['collected']:
+        overrides['STATICFILES_STORAGE'] = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    client = Client()
+    with override_settings(**overrides):
+        for path in paths:
+            timings = []
+            for _ in range(2):
+                t = time.perf_counter()
+                status = client.get(path).status_code
+                timings.append(round((time.perf_counter() - t) * 1000, 1))
+            report['requests'][path] = {'status': status, 'first': timings[0], 'second': timings[1]}
+    return report
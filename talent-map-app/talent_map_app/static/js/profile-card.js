@@ -0,0 +1,42 @@
+// Fiche profil : apparition, flottement et inclinaison de la carte.
+(function () {
+    // --- Profile card animations: entrance, float and tilt ---
+    const card = document.querySelector('.profile-card');
+    if (card) {
+        setTimeout(() => {
+            card.classList.add('animate-in');
+            setTimeout(() => card.classList.add('float'), 800);
+        }, 80);
+
+        const skills = card.querySelectorAll('.skill-badge');
+        skills.forEach((el, i) => setTimeout(() => el.classList.add('animate'), 140 * i));
+
+        const accentBtn = card.querySelector('.btn-accent');
+        if (accentBtn) accentBtn.classList.add('pulse');
+
+        let rect = null;
+        function onMove(e) {
+            if (!rect) rect = card.getBoundingClientRect();
+            const clientX = e.clientX || (e.touches && e.touches[0].clientX);
+            const clientY = e.clientY || (e.touches && e.touches[0].clientY);
+            if (clientX == null || clientY == null) return;
+            const cx = rect.left + rect.width / 2;
+            const cy = rect.top + rect.height / 2;
+            const dx = (clientX - cx) / (rect.width / 2);
+            const dy = (clientY - cy) / (rect.height / 2);
+            const rotX = (dy * 6);
+            const rotY = -(dx * 8);
+            card.style.transform = `perspective(900px) rotateX(${rotX}deg) rotateY(${rotY}deg)`;
+            card.style.boxShadow = `${-rotY}px ${Math.abs(rotX) + 8}px 30px rgba(16,24,40,0.08)`;
+        }
+        function resetTilt() {
+            card.style.transform = '';
+            card.style.boxShadow = '';
+            rect = null;
+        }
+        card.addEventListener('mousemove', onMove);
+        card.addEventListener('touchmove', onMove, { passive: true });
+        card.addEventListener('mouseleave', resetTilt);
+        card.addEventListener('touchend', resetTilt);
+    }
+}());
@@ -0,0 +1,88 @@
+// Page de recherche : validation du formulaire et chargement des pages suivantes.
+(function () {
+    // --- Search form validation (safe guard) ---
+    const form = document.getElementById('search-form');
+    if (form) {
+        const qInput = form.querySelector('[name="q"]');
+        form.addEventListener('submit', function (e) {
+            if (!qInput) return;
+            // un filtre (niveau, langue) suffit à lancer la recherche
+            const hasFilter = Array.from(form.querySelectorAll('select, input')).some(
+                el => el !== qInput && el.name !== 'sort_by' && el.value.trim() !== ''
+            );
+            if (qInput.value.trim() === '' && !hasFilter) {
+                e.preventDefault();
+                qInput.classList.add('is-invalid');
+                let fb = qInput.parentNode.querySelector('.invalid-feedback');
+                if (!fb) {
+                    fb = document.createElement('div');
+                    fb.className = 'invalid-feedback';
+                    fb.textContent = "Veuillez saisir un terme de recherche ou une compétence.";
+                    qInput.parentNode.appendChild(fb);
+                }
+                qInput.focus();
+            }
+        });
+        if (qInput) {
+            qInput.addEventListener('input', function () {
+                qInput.classList.remove('is-invalid');
+                const fb = qInput.parentNode.querySelector('.invalid-feedback');
+                if (fb) fb.remove();
+            });
+        }
+    }
+
+    // --- Search results: "Charger plus" + défilement infini ---
+    // Le serveur renvoie uniquement le fragment de la page suivante (?partial=1),
+    // qui contient lui-même le lien vers la page d'après.
+    const results = document.getElementById('search-results');
+    if (results) {
+        let loading = false;
+
+        function loadMore(block) {
+            const link = block.querySelector('[data-next-url]');
+            if (!link || loading) return;
+            loading = true;
+            link.classList.add('disabled');
+            const url = new URL(link.dataset.nextUrl, window.location.href);
+            url.searchParams.set('partial', '1');
+            fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' }, credentials: 'same-origin' })
+                .then(r => {
+                    if (!r.ok) throw new Error(r.status);
+                    return r.text();
+                })
+                .then(html => {
+                    block.remove();
+                    results.insertAdjacentHTML('beforeend', html);
+                    observeLoadMore();
+                })
+                .catch(() => link.classList.remove('disabled'))
+                .finally(() => { loading = false; });
+        }
+
+        results.addEventListener('click', function (e) {
+            const link = e.target.closest('[data-load-more] [data-next-url]');
+            if (link) {
+                e.preventDefault();
+                loadMore(link.closest('[data-load-more]'));
+            }
+        });
+
+        const observer = 'IntersectionObserver' in window
+            ? new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        observer.unobserve(entry.target);
+                        loadMore(entry.target);
+                    }
+                });
+            }, { rootMargin: '300px' })
+            : null;
+
+        function observeLoadMore() {
+            const block = results.querySelector('[data-load-more]');
+            if (block && observer) observer.observe(block);
+        }
+        observeLoadMore();
+    }
+}());
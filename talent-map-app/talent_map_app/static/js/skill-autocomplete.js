@@ -0,0 +1,43 @@
+// Suggestions de compétences (datalist partagée, requêtes anti-rebond + cache).
+// Module chargé par skills.js (import dynamique) au premier focus d'un champ de compétence.
+const AUTOCOMPLETE_URL = '/skills/autocomplete/';
+const suggestions = new Map();  // préfixe normalisé -> libellés
+const datalist = document.createElement('datalist');
+datalist.id = 'skill-suggestions';
+document.body.appendChild(datalist);
+let timer = null;
+
+function showSuggestions(values) {
+    datalist.replaceChildren(...values.map(value => {
+        const option = document.createElement('option');
+        option.value = value;
+        return option;
+    }));
+}
+
+function fetchSuggestions(prefix) {
+    if (suggestions.has(prefix)) {
+        showSuggestions(suggestions.get(prefix));
+        return;
+    }
+    const url = new URL(AUTOCOMPLETE_URL, window.location.href);
+    url.searchParams.set('prefix', prefix);
+    fetch(url)
+        .then(r => (r.ok ? r.json() : { results: [] }))
+        .then(data => {
+            suggestions.set(prefix, data.results);
+            showSuggestions(data.results);
+        })
+        .catch(() => {});
+}
+
+document.addEventListener('input', function (e) {
+    const input = e.target.closest('.skill-input');
+    if (!input) return;
+    input.setAttribute('list', datalist.id);
+    input.setAttribute('autocomplete', 'off');
+    const prefix = input.value.trim().toLowerCase();
+    clearTimeout(timer);
+    if (prefix.length < 1) return;
+    timer = setTimeout(() => fetchSuggestions(prefix), 150);
+});
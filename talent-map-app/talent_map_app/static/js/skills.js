@@ -0,0 +1,86 @@
+// Champs de compétences (inscription, création de profil) : ajout, suppression, nettoyage.
+(function () {
+    // utilitaire : créer un item skill
+    function createSkillItem(value = '') {
+        const wrapper = document.createElement('div');
+        wrapper.className = 'input-group mb-2 skill-item';
+
+        const input = document.createElement('input');
+        input.type = 'text';
+        input.name = 'skills';
+        input.className = 'form-control skill-input';
+        input.placeholder = 'Ex: Python';
+        input.value = value;
+
+        const btn = document.createElement('button');
+        btn.type = 'button';
+        btn.className = 'btn btn-outline-danger btn-remove';
+        btn.title = 'Supprimer';
+        btn.innerHTML = '×';
+
+        wrapper.appendChild(input);
+        wrapper.appendChild(btn);
+        return wrapper;
+    }
+
+    // Gérer tous les conteneurs possibles (id ou class)
+    document.querySelectorAll('#skills-list, .skills-list').forEach(function (skillsList) {
+        // trouver le bouton "add" proche (dans le même parent) - supporte id et class
+        let addBtn = null;
+        const parent = skillsList.parentElement;
+        if (parent) {
+            addBtn = parent.querySelector('#add-skill') || parent.querySelector('.add-skill') || parent.querySelector('[data-add-skill]');
+        }
+        // si pas trouvé dans le parent, chercher globalement (fallback)
+        if (!addBtn) {
+            addBtn = document.querySelector('#add-skill') || document.querySelector('.add-skill') || document.querySelector('[data-add-skill]');
+        }
+
+        // délégation pour suppression (fonctionnera pour boutons existants et ajoutés)
+        skillsList.addEventListener('click', function (e) {
+            const rem = e.target.closest('.btn-remove');
+            if (rem) {
+                e.preventDefault();
+                const item = rem.closest('.skill-item');
+                if (item) item.remove();
+            }
+        });
+
+        // clic sur "+ Plus"
+        if (addBtn) {
+            addBtn.addEventListener('click', function (e) {
+                e.preventDefault();
+                const item = createSkillItem('');
+                skillsList.appendChild(item);
+                // focus sur le dernier input
+                const inputs = skillsList.querySelectorAll('.skill-input');
+                const last = inputs[inputs.length - 1];
+                if (last) last.focus();
+            });
+        }
+
+        // nettoyage avant soumission : trim + suppression des vides
+        const parentForm = skillsList.closest('form');
+        if (parentForm) {
+            parentForm.addEventListener('submit', function () {
+                skillsList.querySelectorAll('.skill-input').forEach(input => {
+                    if (!input.value || !input.value.trim()) {
+                        input.closest('.skill-item')?.remove();
+                    } else {
+                        input.value = input.value.trim();
+                    }
+                });
+            });
+        }
+    });
+
+    // suggestions : module chargé au premier focus d'un champ (URL à empreinte donnée par le gabarit)
+    const autocompleteUrl = document.currentScript && document.currentScript.dataset.autocomplete;
+    if (autocompleteUrl && document.querySelector('#skills-list, .skills-list')) {
+        document.addEventListener('focusin', function load(e) {
+            if (!e.target.closest('.skill-input')) return;
+            document.removeEventListener('focusin', load);
+            import(autocompleteUrl).catch(() => {});
+        });
+    }
+}());
@@ -1,228 +1,94 @@
-// This file contains JavaScript code for generating and interacting with the talent map visualization.
-
-document.addEventListener('DOMContentLoaded', function () {
-
-    // --- Talent map container (stub) ---
+// Carte des talents (organisation) : graphe SVG chargé depuis l'URL `data-source`.
+(function () {
     const talentMapContainer = document.getElementById('talent-map');
-    if (talentMapContainer) {
-        initializeTalentMap();
-    }
-    function initializeTalentMap() {
-        // placeholder: logique de visualisation
-        // console.log('initializeTalentMap');
+    if (talentMapContainer && talentMapContainer.dataset.source) {
+        initializeTalentMap(talentMapContainer);
     }
+    function initializeTalentMap(container) {
+        // graphe agrégé (/api/talent-map/) : {"nodes": [[id, label, kind, count]], "edges": [[i, j, w]]}
+        const filters = document.getElementById('talent-map-filters');
+        const SVG_NS = 'http://www.w3.org/2000/svg';
+        const COLORS = { skill: '#2563eb', passion: '#f97316' };
+
+        function svgEl(name, attrs) {
+            const el = document.createElementNS(SVG_NS, name);
+            Object.entries(attrs).forEach(([k, v]) => el.setAttribute(k, v));
+            return el;
+        }
 
-    // --- Search form validation (safe guard) ---
-    const form = document.getElementById('search-form');
-    if (form) {
-        const qInput = form.querySelector('[name="q"]');
-        form.addEventListener('submit', function (e) {
-            if (!qInput) return;
-            if (qInput.value.trim() === '') {
-                e.preventDefault();
-                qInput.classList.add('is-invalid');
-                let fb = qInput.parentNode.querySelector('.invalid-feedback');
-                if (!fb) {
-                    fb = document.createElement('div');
-                    fb.className = 'invalid-feedback';
-                    fb.textContent = "Veuillez saisir un terme de recherche ou une compétence.";
-                    qInput.parentNode.appendChild(fb);
-                }
-                qInput.focus();
+        function render(graph) {
+            container.textContent = '';
+            if (!graph.nodes.length) {
+                container.innerHTML = '<div class="alert alert-info">Aucun profil validé pour ces filtres.</div>';
+                return;
             }
-        });
-        if (qInput) {
-            qInput.addEventListener('input', function () {
-                qInput.classList.remove('is-invalid');
-                const fb = qInput.parentNode.querySelector('.invalid-feedback');
-                if (fb) fb.remove();
+            const width = container.clientWidth || 800;
+            const height = container.clientHeight || 600;
+            const cx = width / 2, cy = height / 2;
+            const maxCount = graph.nodes[0][3] || 1;
+            // disposition radiale : les éléments les plus fréquents au centre
+            const points = graph.nodes.map((node, i) => {
+                const ring = Math.sqrt(i / graph.nodes.length);
+                const angle = i * 2.39996;  // angle d'or
+                return {
+                    x: cx + Math.cos(angle) * ring * (width / 2 - 40),
+                    y: cy + Math.sin(angle) * ring * (height / 2 - 30),
+                    r: 4 + 14 * Math.sqrt(node[3] / maxCount),
+                };
             });
-        }
-    }
-
-    // --- Profile card animations: entrance, float and tilt ---
-    const card = document.querySelector('.profile-card');
-    if (card) {
-        setTimeout(() => {
-            card.classList.add('animate-in');
-            setTimeout(() => card.classList.add('float'), 800);
-        }, 80);
-
-        const skills = card.querySelectorAll('.skill-badge');
-        skills.forEach((el, i) => setTimeout(() => el.classList.add('animate'), 140 * i));
-
-        const accentBtn = card.querySelector('.btn-accent');
-        if (accentBtn) accentBtn.classList.add('pulse');
-
-        let rect = null;
-        function onMove(e) {
-            if (!rect) rect = card.getBoundingClientRect();
-            const clientX = e.clientX || (e.touches && e.touches[0].clientX);
-            const clientY = e.clientY || (e.touches && e.touches[0].clientY);
-            if (clientX == null || clientY == null) return;
-            const cx = rect.left + rect.width / 2;
-            const cy = rect.top + rect.height / 2;
-            const dx = (clientX - cx) / (rect.width / 2);
-            const dy = (clientY - cy) / (rect.height / 2);
-            const rotX = (dy * 6);
-            const rotY = -(dx * 8);
-            card.style.transform = `perspective(900px) rotateX(${rotX}deg) rotateY(${rotY}deg)`;
-            card.style.boxShadow = `${-rotY}px ${Math.abs(rotX) + 8}px 30px rgba(16,24,40,0.08)`;
-        }
-        function resetTilt() {
-            card.style.transform = '';
-            card.style.boxShadow = '';
-            rect = null;
-        }
-        card.addEventListener('mousemove', onMove);
-        card.addEventListener('touchmove', onMove, { passive: true });
-        card.addEventListener('mouseleave', resetTilt);
-        card.addEventListener('touchend', resetTilt);
-    }
-
-    // --- Dynamic skills inputs (create/edit/signup) ---
-    // Remplacement : supporte plusieurs conteneurs, délégation d'événements et gestion robuste des boutons
-    (function () {
-        // Crée un élément "skill-item"
-        function createSkillItem(value = '') {
-            const wrapper = document.createElement('div');
-            wrapper.className = 'input-group mb-2 skill-item';
-
-            const input = document.createElement('input');
-            input.type = 'text';
-            input.name = 'skills';
-            input.className = 'form-control skill-input';
-            input.placeholder = 'Ex: Python';
-            input.value = value;
-
-            const btn = document.createElement('button');
-            btn.type = 'button';
-            btn.className = 'btn btn-outline-danger btn-remove';
-            btn.title = 'Supprimer';
-            btn.innerHTML = '×';
-
-            wrapper.appendChild(input);
-            wrapper.appendChild(btn);
-            return wrapper;
-        }
-
-        // Pour chaque conteneur skills-list sur la page
-        document.querySelectorAll('#skills-list').forEach(function (skillsList) {
-            // recherche du bouton "+ Plus" dans le même parent (structure des templates)
-            const addBtn = skillsList.parentElement.querySelector('#add-skill') ||
-                           skillsList.parentElement.querySelector('.add-skill');
-
-            // Délégation : gestion des clics sur les boutons de suppression
-            skillsList.addEventListener('click', function (e) {
-                const rem = e.target.closest('.btn-remove');
-                if (rem) {
-                    e.preventDefault();
-                    const item = rem.closest('.skill-item');
-                    if (item) item.remove();
+            const svg = svgEl('svg', { width: width, height: height, viewBox: `0 0 ${width} ${height}` });
+            const maxWeight = Math.max(1, ...graph.edges.map(e => e[2]));
+            graph.edges.forEach(([i, j, w]) => {
+                svg.appendChild(svgEl('line', {
+                    x1: points[i].x, y1: points[i].y, x2: points[j].x, y2: points[j].y,
+                    stroke: '#94a3b8', 'stroke-opacity': 0.15 + 0.6 * (w / maxWeight), 'stroke-width': 1,
+                }));
+            });
+            graph.nodes.forEach(([id, label, kind, count], i) => {
+                const g = svgEl('g', {});
+                const circle = svgEl('circle', { cx: points[i].x, cy: points[i].y, r: points[i].r, fill: COLORS[kind] });
+                const title = svgEl('title', {});
+                title.textContent = `${label} (${count})`;
+                circle.appendChild(title);
+                g.appendChild(circle);
+                if (i < 30) {
+                    const text = svgEl('text', {
+                        x: points[i].x, y: points[i].y - points[i].r - 3, 'text-anchor': 'middle', 'font-size': 11,
+                    });
+                    text.textContent = label;
+                    g.appendChild(text);
                 }
+                svg.appendChild(g);
             });
+            container.appendChild(svg);
+        }
 
-            // Si des boutons remove déjà rendus côté serveur, pas besoin d'attacher individuellement (délégation gère)
-            // Gestion du bouton "+ Plus"
-            if (addBtn) {
-                addBtn.addEventListener('click', function (e) {
-                    e.preventDefault();
-                    const item = createSkillItem('');
-                    skillsList.appendChild(item);
-                    const input = item.querySelector('.skill-input');
-                    if (input) input.focus();
+        function load() {
+            const url = new URL(container.dataset.source, window.location.href);
+            if (filters) {
+                new FormData(filters).forEach((value, name) => {
+                    if (value) url.searchParams.set(name, value);
                 });
             }
-
-            // Avant l'envoi du formulaire : nettoyer inputs vides et trim les valeurs
-            const parentForm = skillsList.closest('form');
-            if (parentForm) {
-                parentForm.addEventListener('submit', function () {
-                    skillsList.querySelectorAll('.skill-input').forEach(input => {
-                        if (!input.value || !input.value.trim()) {
-                            input.closest('.skill-item')?.remove();
-                        } else {
-                            input.value = input.value.trim();
-                        }
-                    });
+            fetch(url, { credentials: 'same-origin' })
+                .then(r => {
+                    if (!r.ok) throw new Error(r.status);
+                    return r.json();
+                })
+                .then(render)
+                .catch(() => {
+                    container.innerHTML = '<div class="alert alert-warning">Impossible de charger la carte.</div>';
                 });
-            }
-        });
-    }());
-
-    // utilitaire : créer un item skill
-    function createSkillItem(value = '') {
-        const wrapper = document.createElement('div');
-        wrapper.className = 'input-group mb-2 skill-item';
-
-        const input = document.createElement('input');
-        input.type = 'text';
-        input.name = 'skills';
-        input.className = 'form-control skill-input';
-        input.placeholder = 'Ex: Python';
-        input.value = value;
-
-        const btn = document.createElement('button');
-        btn.type = 'button';
-        btn.className = 'btn btn-outline-danger btn-remove';
-        btn.title = 'Supprimer';
-        btn.innerHTML = '×';
-
-        wrapper.appendChild(input);
-        wrapper.appendChild(btn);
-        return wrapper;
-    }
-
-    // Gérer tous les conteneurs possibles (id ou class)
-    document.querySelectorAll('#skills-list, .skills-list').forEach(function (skillsList) {
-        // trouver le bouton "add" proche (dans le même parent) - supporte id et class
-        let addBtn = null;
-        const parent = skillsList.parentElement;
-        if (parent) {
-            addBtn = parent.querySelector('#add-skill') || parent.querySelector('.add-skill') || parent.querySelector('[data-add-skill]');
-        }
-        // si pas trouvé dans le parent, chercher globalement (fallback)
-        if (!addBtn) {
-            addBtn = document.querySelector('#add-skill') || document.querySelector('.add-skill') || document.querySelector('[data-add-skill]');
         }
 
-        // délégation pour suppression (fonctionnera pour boutons existants et ajoutés)
-        skillsList.addEventListener('click', function (e) {
-            const rem = e.target.closest('.btn-remove');
-            if (rem) {
-                e.preventDefault();
-                const item = rem.closest('.skill-item');
-                if (item) item.remove();
-            }
-        });
-
-        // clic sur "+ Plus"
-        if (addBtn) {
-            addBtn.addEventListener('click', function (e) {
+        if (filters) {
+            filters.addEventListener('submit', function (e) {
                 e.preventDefault();
-                const item = createSkillItem('');
-                skillsList.appendChild(item);
-                // focus sur le dernier input
-                const inputs = skillsList.querySelectorAll('.skill-input');
-                const last = inputs[inputs.length - 1];
-                if (last) last.focus();
+                const params = new URLSearchParams(new FormData(filters));
+                history.replaceState(null, '', `?${params}`);
+                load();
             });
         }
-
-        // nettoyage avant soumission : trim + suppression des vides
-        const parentForm = skillsList.closest('form');
-        if (parentForm) {
-            parentForm.addEventListener('submit', function () {
-                skillsList.querySelectorAll('.skill-input').forEach(input => {
-                    if (!input.value || !input.value.trim()) {
-                        input.closest('.skill-item')?.remove();
-                    } else {
-                        input.value = input.value.trim();
-                    }
-                });
-            });
-        }
-    });
-
-    // (Conserver ici d'autres handlers existants — p.ex. animations, search validation, etc.)
-});
\ No newline at end of file
+        load();
+    }
+}());
@@ -0,0 +1,53 @@
+"""
+Tâches de fond sans broker externe : un pool de threads par processus.
+
+`defer(fn, ...)` planifie `fn` après le commit de la transaction courante (le thread
+voit alors les données écrites) ; la requête n'attend pas son exécution. Chaque tâche
+ferme ses connexions à la base en fin d'exécution.
+
+Limite assumée : les tâches en attente sont perdues si le processus s'arrête. Elles ne
+doivent donc porter que du travail rejouable (caches, compteurs dérivés,
+notifications), jamais l'écriture principale.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'TASK_WORKERS', 2), thread_name_prefix='talent-task',
+            )
+        return _executor
+
+
+def _run(fn, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception("Échec de la tâche de fond %s", getattr(fn, '__name__', fn))
+    finally:
+        connections.close_all()
+
+
+def submit(fn, *args, **kwargs):
+    """Exécute `fn` dans le pool (ou tout de suite si `TASKS_EAGER`)."""
+    if getattr(settings, 'TASKS_EAGER', False):
+        return fn(*args, **kwargs)
+    return executor().submit(_run, fn, args, kwargs)
+
+
+def defer(fn, *args, **kwargs):
+    """Exécute `fn` en arrière-plan après le commit de la transaction courante."""
+    transaction.on_commit(lambda: submit(fn, *args, **kwargs))
@@ -0,0 +1,32 @@
+from django import template
+
+from talent_map_app.cache import get_or_render_fragment
+
+register = template.Library()
+
+
+class ProfileCacheNode(template.Node):
+    def __init__(self, nodelist, kind, profile):
+        self.nodelist = nodelist
+        self.kind = kind
+        self.profile = profile
+
+    def render(self, context):
+        kind = self.kind.resolve(context)
+        profile = self.profile.resolve(context)
+        return get_or_render_fragment(kind, profile, lambda: self.nodelist.render(context))
+
+
+@register.tag
+def profilecache(parser, token):
+    """
+    Met en cache le contenu du bloc pour un profil (clé : type + id + updated_at).
+    Usage : {% profilecache 'card' profile %} ... {% endprofilecache %}
+    Le bloc ne doit rien contenir de propre au visiteur (jeton CSRF, boutons conditionnels...).
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' attend deux arguments : le type de fragment et le profil.")
+    nodelist = parser.parse(('endprofilecache',))
+    parser.delete_first_token()
+    return ProfileCacheNode(nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2]))
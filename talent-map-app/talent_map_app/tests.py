@@ -1,62 +1,1246 @@
-from django.test import TestCase
+import logging
+from io import StringIO
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import TestCase, TransactionTestCase, override_settings
+from . import fuzzy
 from .models import UserProfile
 
-class UserProfileModelTest(TestCase):
+# Le manifeste WhiteNoise n'existe qu'après collectstatic : stockage simple pour les tests de vues
+plain_static = override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+
+PASSWORD = 'pass12345'
+
+# requêtes lentes (hachage des mots de passe...) : pas de journal pendant les tests, hors assertLogs
+logging.getLogger('talent_map_app.performance').setLevel(logging.ERROR)
+
+
+class ProfileFixtures:
+    """Profils de test : utilisateur + profil en un appel, visiteur 'viewer' connecté."""
+
+    def create_profile(self, username, user_fields=None, **fields):
+        """Crée l'utilisateur `username` (champs `user_fields`) et son profil (`fields`)."""
+        return UserProfile.objects.create(user=User.objects.create_user(username, **(user_fields or {})), **fields)
+
+    def create_viewer(self, login=True, **fields):
+        """Crée l'utilisateur 'viewer' (mot de passe PASSWORD), avec un profil si `fields`, et le connecte."""
+        self.viewer = User.objects.create_user('viewer', password=PASSWORD)
+        if fields:
+            UserProfile.objects.create(user=self.viewer, **fields)
+        if login:
+            self.client.login(username='viewer', password=PASSWORD)
+        return self.viewer
+
+
+class UserProfileModelTest(ProfileFixtures, TestCase):
     def setUp(self):
-        self.user_profile = UserProfile.objects.create(
-            username='testuser',
+        self.user_profile = self.create_profile(
+            'testuser',
             skills='Python, Django',
-            talents='Web Development',
+            passions='Web Development',
             languages='English, French',
-            verified=True
+            is_validated=True
         )
 
     def test_user_profile_creation(self):
-        self.assertEqual(self.user_profile.username, 'testuser')
+        self.assertEqual(self.user_profile.user.username, 'testuser')
         self.assertEqual(self.user_profile.skills, 'Python, Django')
-        self.assertEqual(self.user_profile.talents, 'Web Development')
-        self.assertEqual(self.user_profile.languages, 'English, French')
-        self.assertTrue(self.user_profile.verified)
+        self.assertEqual(self.user_profile.parsed_skills, ['Python', 'Django'])
+        self.assertEqual(self.user_profile.parsed_languages, ['English', 'French'])
+        self.assertEqual(self.user_profile.education_level, 'licence')
+        self.assertTrue(self.user_profile.is_validated)
 
     def test_user_profile_str(self):
-        self.assertEqual(str(self.user_profile), 'testuser')
+        self.assertEqual(str(self.user_profile), 'Profil de testuser')
 
-class UserProfileViewTest(TestCase):
+@plain_static
+class UserProfileViewTest(ProfileFixtures, TestCase):
     def setUp(self):
-        self.user_profile = UserProfile.objects.create(
-            username='testuser',
+        self.user_profile = self.create_profile(
+            'testuser', {'password': PASSWORD},
+            bio='Développeur web',
             skills='Python, Django',
-            talents='Web Development',
             languages='English, French',
-            verified=True
         )
+        self.user = self.user_profile.user
+        self.client.login(username='testuser', password=PASSWORD)
 
     def test_profile_detail_view(self):
-        response = self.client.get(f'/profile/{self.user_profile.id}/')
+        response = self.client.get(f'/profile/{self.user.id}/')
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'testuser')
-        self.assertContains(response, 'Python, Django')
+        self.assertContains(response, 'Django')
 
     def test_profile_create_view(self):
+        User.objects.create_user('newuser', password=PASSWORD)
+        self.client.login(username='newuser', password=PASSWORD)
         response = self.client.post('/profile/create/', {
-            'username': 'newuser',
+            'bio': 'Intégratrice',
             'skills': 'JavaScript',
-            'talents': 'Frontend Development',
+            'education_level': 'master',
             'languages': 'English',
-            'verified': False
         })
         self.assertEqual(response.status_code, 302)  # Redirect after successful creation
-        self.assertTrue(UserProfile.objects.filter(username='newuser').exists())
+        self.assertEqual(UserProfile.objects.get(user__username='newuser').skills, 'JavaScript')
 
     def test_profile_edit_view(self):
-        response = self.client.post(f'/profile/edit/{self.user_profile.id}/', {
-            'username': 'updateduser',
+        response = self.client.post(f'/profile/{self.user.id}/edit/', {
+            'bio': 'Développeur full stack',
             'skills': 'Python, Django, React',
-            'talents': 'Full Stack Development',
+            'education_level': 'licence',
             'languages': 'English, Spanish',
-            'verified': True
         })
+        self.assertEqual(response.status_code, 302)
         self.user_profile.refresh_from_db()
-        self.assertEqual(self.user_profile.username, 'updateduser')
         self.assertEqual(self.user_profile.skills, 'Python, Django, React')
-        self.assertTrue(self.user_profile.verified)
\ No newline at end of file
+        self.assertEqual(self.user_profile.parsed_languages, ['English', 'Spanish'])
+
+@plain_static
+class SkillIndexTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer()
+        self.profile = self.create_profile('alice', skills='Python, Réseaux, python')
+
+    def test_skills_are_indexed_with_folded_keys(self):
+        from .models import Skill
+        self.assertEqual(
+            sorted(self.profile.indexed_skills.values_list('key', flat=True)),
+            ['python', 'reseaux'],
+        )
+        self.profile.skills = 'Reseaux'
+        self.profile.save()
+        self.assertEqual(list(self.profile.indexed_skills.values_list('key', flat=True)), ['reseaux'])
+        self.assertEqual(Skill.objects.count(), 2)
+
+    def test_search_matches_indexed_skill(self):
+        response = self.client.get('/search/', {'q': 'RESEAUX'})
+        self.assertEqual(list(response.context['results']), [self.profile])
+        response = self.client.get('/search/', {'q': 'Rust'})
+        self.assertEqual(list(response.context['results']), [])
+
+
+@plain_static
+class FullTextSearchTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer()
+        self.expert = self.create_profile('expert', skills='Django, Python', bio='Développeur Django depuis dix ans')
+        self.mention = self.create_profile('mention', skills='Java', projects='Migration vers django')
+        self.other = self.create_profile('other', {'first_name': 'Zoé'}, skills='Rust', passions='Robotique')
+
+    def search(self, **params):
+        return list(self.client.get('/search/', params).context['results'])
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.search(q='django', sort_by='relevance'), [self.expert, self.mention])
+
+    def test_index_follows_profile_and_user_updates(self):
+        self.assertEqual(self.search(q='robot'), [self.other])
+        self.other.passions = 'Jardinage'
+        self.other.save()
+        self.assertEqual(self.search(q='robot'), [])
+        self.other.user.first_name = 'Zoe'
+        self.other.user.save()
+        self.assertEqual(self.search(q='ZOE'), [self.other])
+
+
+@plain_static
+@override_settings(SEARCH_PAGE_SIZE=2)
+class SearchPaginationTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer()
+        self.profiles = [self.create_profile(f'user{i}', skills='Python') for i in range(5)]
+
+    def walk(self, params):
+        """Suit les liens "Charger plus" (fragments) et retourne tous les profils rencontrés."""
+        response = self.client.get('/search/', params)
+        seen = list(response.context['results'])
+        next_url = response.context['next_url']
+        while next_url:
+            response = self.client.get(next_url + '&partial=1')
+            self.assertTemplateUsed(response, 'search/_results_page.html')
+            self.assertTemplateNotUsed(response, 'search/search.html')
+            seen += list(response.context['results'])
+            next_url = response.context['next_url']
+        return seen
+
+    def test_keyset_pages_cover_all_profiles_once(self):
+        self.assertEqual(self.walk({}), self.profiles[::-1])
+        self.assertEqual(self.walk({'sort_by': 'oldest'}), self.profiles)
+
+    def test_relevance_pages(self):
+        self.assertEqual(len(self.walk({'q': 'python'})), 5)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        response = self.client.get('/search/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(list(response.context['results']), self.profiles[::-1][:2])
+
+
+@plain_static
+class QueryCountTest(ProfileFixtures, TestCase):
+    """Garde-fou N+1 : le nombre de requêtes des vues chaudes ne doit pas dépendre du nombre de profils."""
+
+    # session + utilisateur connecté (AuthenticationMiddleware)
+    AUTH_QUERIES = 2
+
+    def setUp(self):
+        self.create_viewer(skills='Python')
+        self.add_profiles(3)
+        fuzzy.skill_index()  # index des compétences déjà chargé par le worker
+
+    def add_profiles(self, count):
+        start = UserProfile.objects.count()
+        for i in range(start, start + count):
+            self.create_profile(f'user{i}', {'first_name': 'Prénom', 'last_name': f'Nom{i}'},
+                                skills='Python, Django', bio='Bio', passions='IA')
+
+    def test_search_queries_do_not_grow_with_results(self):
+        # résultat absent du cache : liste des ids + chargement de la page + facettes (une requête)
+        # (le dernier cas ne diffère du précédent que par le tri : facettes déjà en cache)
+        for params, facets in (({}, 1), ({'q': 'python'}, 1), ({'q': 'python', 'sort_by': 'newest'}, 0)):
+            with self.assertNumQueries(self.AUTH_QUERIES + 2 + facets):
+                self.client.get('/search/', params)
+            self.add_profiles(3)
+            with self.assertNumQueries(self.AUTH_QUERIES + 3):
+                self.client.get('/search/', params)
+            # résultat en cache : seule la page est chargée
+            with self.assertNumQueries(self.AUTH_QUERIES + 1):
+                self.client.get('/search/', params)
+
+    def test_profile_pages(self):
+        pk = UserProfile.objects.exclude(user=self.viewer).first().user_id
+        # page détail : profil + profils similaires
+        for url, queries in ((f'/profile/{pk}/', 2), (f'/profile/{pk}/edit/', 1), (f'/profile/{pk}/map/', 1)):
+            with self.assertNumQueries(self.AUTH_QUERIES + queries):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class ParsedListsTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.profile = self.create_profile(
+            'alice', skills='Python, , Django ', languages='Français,Anglais', passions='IA',
+        )
+
+    def test_lists_are_parsed_once_on_save(self):
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual(profile.parsed_skills, ['Python', 'Django'])
+        with self.assertNumQueries(0):
+            self.assertEqual(profile.skills_list, ['Python', 'Django'])
+            self.assertEqual(profile.languages_list, ['Français', 'Anglais'])
+            self.assertEqual(profile.passions_list, ['IA'])
+
+    def test_partial_save_refreshes_matching_list(self):
+        self.assertEqual(self.profile.skills_list, ['Python', 'Django'])
+        self.profile.skills = 'Rust'
+        self.profile.save(update_fields=['skills'])
+        self.assertEqual(self.profile.skills_list, ['Rust'])
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).parsed_skills, ['Rust'])
+
+
+@plain_static
+class FragmentCacheTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from . import cache as fragment_cache
+        cache.clear()
+        fragment_cache.reset_cache_stats()
+        self.stats = fragment_cache.cache_stats
+        self.create_viewer()
+        self.profile = self.create_profile('alice', {'first_name': 'Alice'}, skills='Python')
+
+    def test_detail_fragment_is_reused_then_invalidated(self):
+        url = f'/profile/{self.profile.user_id}/'
+        self.client.get(url)
+        self.assertContains(self.client.get(url), 'Python')
+        self.assertEqual((self.stats()['detail_hits'], self.stats()['detail_misses']), (1, 1))
+
+        self.profile.skills = 'Rust'
+        self.profile.save()
+        self.assertContains(self.client.get(url), 'Rust')
+        self.assertEqual(self.stats()['detail_misses'], 2)
+
+        self.profile.user.first_name = 'Alicia'
+        self.profile.user.save()
+        self.assertContains(self.client.get(url), 'Alicia')
+        self.assertEqual(self.stats()['detail_misses'], 3)
+
+    def test_anonymous_home_page_is_cached(self):
+        self.client.logout()
+        self.client.get('/')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/').status_code, 200)
+        self.assertEqual(self.stats()['page_home_anonymous_hits'], 1)
+
+
+@plain_static
+@override_settings(SEARCH_PAGE_SIZE=2)
+class SearchResultCacheTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer(skills='Python')
+        self.viewer_profile = self.viewer.profile
+        self.profiles = [self.create_profile(f'dev{i}', skills='Python') for i in range(3)]
+
+    def test_equivalent_queries_share_an_entry(self):
+        from .search import search_criteria
+        self.assertEqual(
+            search_criteria({'q': 'Django,  PYTHON', 'language': ' Français'}),
+            search_criteria({'q': 'python, django', 'language': 'français', 'sort_by': 'relevance'}),
+        )
+
+    def test_cached_pages_exclude_viewer_and_follow_writes(self):
+        response = self.client.get('/search/', {'q': 'python'})
+        first = list(response.context['results'])
+        response = self.client.get(response.context['next_url'])
+        self.assertEqual(len(first + list(response.context['results'])), 3)
+        self.assertNotIn(self.viewer_profile, first + list(response.context['results']))
+
+        self.profiles[0].skills = 'Rust'
+        self.profiles[0].save()
+        response = self.client.get('/search/', {'q': 'python'})
+        self.assertIsNone(response.context['next_url'])
+        self.assertNotIn(self.profiles[0], list(response.context['results']))
+
+    def test_lru_evicts_least_recently_used(self):
+        from .cache import LRUCache
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+
+class JsonApiTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer()
+        self.profile = self.create_profile(
+            'alice', {'first_name': 'Alice'}, skills='Python, Django', passions='IA', bio='Bio',
+        )
+
+    def test_list_search_and_field_selection(self):
+        data = self.client.get('/api/search/', {'q': 'django', 'fields': 'username,skills,unknown'}).json()
+        self.assertEqual(data, {'results': [{'username': 'alice', 'skills': ['Python', 'Django']}], 'next': None})
+        self.assertEqual(self.client.get('/api/profiles/', {'sort_by': 'bogus'}).status_code, 400)
+
+    def test_detail_and_map(self):
+        url = f'/api/profiles/{self.profile.user_id}/'
+        self.assertEqual(self.client.get(url).json()['name'], 'Alice')
+        self.assertEqual(self.client.get(url + 'map/').json(), {'skills': ['Python', 'Django'], 'passions': ['IA']})
+        self.assertEqual(self.client.get('/api/profiles/999/').status_code, 404)
+
+    def test_conditional_get_returns_304_until_profile_changes(self):
+        url = f'/api/profiles/{self.profile.user_id}/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(3):  # session, utilisateur, updated_at
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.profile.bio = 'Nouvelle bio'
+        self.profile.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        list_etag = self.client.get('/api/profiles/')['ETag']
+        self.assertEqual(self.client.get('/api/profiles/', HTTP_IF_NONE_MATCH=list_etag).status_code, 304)
+
+    def test_search_etag_changes_with_skill_aliases(self):
+        from .models import SkillAlias
+        search = {'q': 'dj', 'fields': 'username'}
+        etag = self.client.get('/api/search/', search)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            SkillAlias.objects.create(alias='DJ', canonical='Django')
+        response = self.client.get('/api/search/', search, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [{'username': 'alice'}])
+
+    def test_anonymous_gets_401(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 401)
+
+
+@plain_static
+class TalentMapAggregationTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer()
+        self.alice = self.create_profile(
+            'alice', skills='Python, Django', passions='IA',
+            languages='Français', education_level='master', is_validated=True,
+        )
+        self.bob = self.create_profile(
+            'bob', skills='python', languages='English', education_level='licence', is_validated=True,
+        )
+
+    def graph(self, **filters):
+        from . import aggregation
+        from .models import TalentMapCount
+        payload = aggregation.graph_payload(TalentMapCount, **filters)
+        nodes = {node[0]: node[3] for node in payload['nodes']}
+        edges = {(payload['nodes'][i][0], payload['nodes'][j][0]): n for i, j, n in payload['edges']}
+        return nodes, edges
+
+    def test_counts_follow_saves_validation_and_deletes(self):
+        nodes, edges = self.graph()
+        self.assertEqual(nodes, {'s:python': 2, 's:django': 1, 'p:ia': 1})
+        self.assertEqual(edges[('p:ia', 's:django')], 1)
+
+        self.bob.skills = 'Python, Django'
+        self.bob.save()
+        self.assertEqual(self.graph()[0]['s:django'], 2)
+
+        self.alice.is_validated = False
+        self.alice.save()
+        self.assertEqual(self.graph()[0], {'s:python': 1, 's:django': 1})
+
+        self.bob.delete()
+        self.assertEqual(self.graph(), ({}, {}))
+
+    def test_concurrent_updates_start_from_the_stored_snapshot(self):
+        from . import aggregation
+        # tâche de validation et sauvegarde concurrente partant du même profil lu avant la revue
+        stale = UserProfile.objects.get(pk=self.bob.pk)
+        UserProfile.objects.filter(pk=self.bob.pk).update(skills='Python, Rust')
+        aggregation.update_profile(stale)
+        aggregation.update_profile(stale)
+        self.assertEqual(self.graph()[0], {'s:python': 2, 's:django': 1, 's:rust': 1, 'p:ia': 1})
+
+    def test_filters_and_rebuild(self):
+        from django.core.management import call_command
+        from .models import TalentMapCount
+        self.assertEqual(self.graph(education_level='licence')[0], {'s:python': 1})
+        self.assertEqual(self.graph(language='francais')[0], {'s:python': 1, 's:django': 1, 'p:ia': 1})
+
+        before = sorted(TalentMapCount.objects.values_list('key', 'count'))
+        TalentMapCount.objects.all().delete()
+        call_command('rebuild_talent_map', stdout=open('/dev/null', 'w'))
+        self.assertEqual(sorted(TalentMapCount.objects.values_list('key', 'count')), before)
+
+    def test_api_and_page(self):
+        data = self.client.get('/api/talent-map/', {'education_level': 'master'}).json()
+        self.assertEqual([node[1] for node in data['nodes']], ['IA', 'Django', 'Python'])
+        self.assertEqual(len(data['edges']), 3)
+        self.assertEqual(self.client.get('/api/talent-map/', {'education_level': 'x'}).status_code, 400)
+        self.assertContains(self.client.get('/talent-map/'), 'data-source="/api/talent-map/"')
+
+
+class ProfileImportExportTest(TestCase):
+    CSV = (
+        "username,email,first_name,education_level,skills,passions,is_validated\n"
+        "alice,alice@example.com,Alice,master,\"Python, Django\",IA,oui\n"
+        "bob,bob@example.com,,licence,Python,,\n"
+        "ALICE,other@example.com,,,,,\n"
+        "carol,EXISTING@example.com,,,,,\n"
+        "dave,dave@example.com,,doctorat,,,\n"
+    )
+
+    def setUp(self):
+        User.objects.create_user('existing', email='existing@example.com')
+
+    def run_import(self, content, suffix='.csv', *args):
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        with tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8') as f:
+            f.write(content)
+        out, err = StringIO(), StringIO()
+        try:
+            call_command('import_profiles', f.name, *args, stdout=out, stderr=err)
+        finally:
+            os.unlink(f.name)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_creates_profiles_in_batches_and_reports_rejects(self):
+        from .models import ProfileSkill, TalentMapCount
+        from .search import search_criteria, search_queryset
+        out, err = self.run_import(self.CSV, '.csv', '--batch-size', '2')
+        self.assertIn('2 profils créés, 3 ignorés', out)
+        self.assertIn('ligne 3 : doublon dans le fichier', err)
+        self.assertIn('ligne 4 : e-mail déjà utilisé', err)
+        self.assertIn("ligne 5 : niveau d'études inconnu", err)
+
+        alice = UserProfile.objects.get(user__username='alice')
+        self.assertEqual((alice.parsed_skills, alice.is_validated, alice.user.has_usable_password()),
+                         (['Python', 'Django'], True, False))
+        self.assertEqual(ProfileSkill.objects.filter(profile=alice).count(), 2)
+        self.assertTrue(TalentMapCount.objects.filter(source='s:django').exists())
+        criteria = search_criteria({'q': 'django'})
+        self.assertEqual([p.user.username for p in search_queryset(criteria)], ['alice'])
+
+    def test_export_round_trip_jsonl(self):
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        self.run_import(self.CSV)
+        out = StringIO()
+        with self.assertNumQueries(1):
+            call_command('export_profiles', '--format', 'jsonl', '--chunk-size', '1', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+
+        UserProfile.objects.all().delete()
+        User.objects.exclude(username='existing').delete()
+        _, err = self.run_import(out.getvalue(), '.jsonl', '--dry-run')
+        self.assertEqual(err, '')
+        self.assertEqual(UserProfile.objects.count(), 0)
+        self.run_import(out.getvalue(), '.jsonl')
+        self.assertEqual(UserProfile.objects.get(user__username='alice').passions, 'IA')
+
+
+class MatchingTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer(skills='Python, Rust')
+        skills = {
+            'alice': 'Python, Django, Rust',
+            'bob': 'Python',
+            'carol': 'Python, Excel, Word, PowerPoint',
+            'dave': 'Java',
+        }
+        self.profiles = {name: self.create_profile(name, skills=value) for name, value in skills.items()}
+
+    def test_matrix_ranks_rare_skills_and_small_profiles_first(self):
+        from .matching import SkillMatrix, match_profiles
+        ranked = [m.profile_id for m in match_profiles('python, RUST', k=3)]
+        p = self.profiles
+        self.assertEqual(ranked[:2], [UserProfile.objects.get(user=self.viewer).pk, p['alice'].pk])
+        self.assertEqual(ranked[2], p['bob'].pk)  # bob (1 compétence) passe devant carol (4)
+        self.assertEqual(match_profiles('Cobol'), [])
+
+        matrix = SkillMatrix([(1, 10), (2, 10), (2, 11)], {'a': 10, 'b': 11})
+        self.assertEqual(list(matrix.indptr), [0, 2, 3])
+        self.assertEqual([m.profile_id for m in matrix.top_k(['b'], k=5)], [2])
+
+    def test_matrix_follows_profile_writes(self):
+        from .matching import match_profiles
+        self.profiles['dave'].skills = 'Java, Rust'
+        self.profiles['dave'].save()
+        self.assertIn(self.profiles['dave'].pk, [m.profile_id for m in match_profiles('Rust')])
+
+    def test_matrix_is_kept_on_bio_edits_and_refreshed_in_the_background(self):
+        from . import cache
+        from .matching import get_matrix, match_profiles
+        from .models import ProfileSkill, Skill
+        matrix = get_matrix()
+        self.profiles['dave'].bio = 'Nouvelle bio'
+        self.profiles['dave'].save()
+        self.assertIs(get_matrix(), matrix)
+        # lien écrit par un autre worker : aucun compteur du cache local n'a changé
+        skill = Skill.objects.create(key='zigzagtech', name='Zigzagtech')
+        ProfileSkill.objects.bulk_create([ProfileSkill(profile=self.profiles['dave'], skill=skill)])
+        with self.assertNumQueries(0):
+            self.assertEqual(match_profiles('Zigzagtech'), [])
+        cache.check_indexes()
+        self.assertEqual([m.profile_id for m in match_profiles('Zigzagtech')], [self.profiles['dave'].pk])
+
+    def test_api_excludes_requester(self):
+        from .models import Collaboration
+        data = self.client.get('/api/match/', {'skills': 'Python, Rust', 'k': 2}).json()
+        self.assertEqual([r['username'] for r in data['results']], ['alice', 'bob'])
+        self.assertEqual(data['results'][0]['matched_skills'], 2)
+
+        collaboration = Collaboration.objects.create(
+            requester=self.viewer, receiver=self.profiles['dave'].user, title='T', description='D',
+            required_skills='Django',
+        )
+        url = f'/api/collaborations/{collaboration.pk}/matches/'
+        self.assertEqual([r['username'] for r in self.client.get(url).json()['results']], ['alice'])
+        self.client.force_login(self.profiles['bob'].user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class FuzzySkillTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.alice = self.create_profile('alice', skills='Django, JavaScript')
+        self.bob = self.create_profile('bob', skills='Python', bio='Scripts')
+
+    def search(self, q):
+        from .search import search_criteria, search_queryset
+        return [p.user.username for p in search_queryset(search_criteria({'q': q}))]
+
+    def test_typos_and_aliases_expand_to_known_skills(self):
+        self.assertEqual(self.search('Djnago'), ['alice'])
+        self.assertEqual(self.search('pyhton'), ['bob'])
+        self.assertEqual(self.search('JS'), ['alice'])  # synonyme livré par la migration
+        self.assertEqual(self.search('zzzz'), [])
+
+    def test_index_picks_up_new_skills_and_aliases(self):
+        from .models import SkillAlias
+        fuzzy.skill_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_profile('carol', skills='Kubernetes, Rust')
+        with self.assertNumQueries(0):
+            self.assertEqual(fuzzy.expand_keys({'kubernets'}), {'kubernetes'})
+        SkillAlias.objects.create(alias='Oxyde', canonical='Rust')
+        self.assertEqual(self.search('oxyde'), ['carol'])
+
+    def test_index_ignores_rolled_back_skills_and_refreshes_in_the_background(self):
+        from django.db import transaction
+        from . import cache
+        from .models import Skill, SkillAlias
+        fuzzy._index = None  # ids réutilisés d'un test à l'autre (base remise à zéro) : index neuf
+        fuzzy.skill_index()
+        try:
+            with transaction.atomic():
+                self.alice.skills = 'Django, Terraform'
+                self.alice.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(fuzzy.expand_keys({'terrafrom'}), set())
+        # compétence et synonyme créés par un autre worker : aucun compteur du cache local n'a changé
+        Skill.objects.create(key='zigzagtech', name='Zigzagtech')
+        SkillAlias.objects.bulk_create([SkillAlias(alias='ZZ', key='zz', canonical='Zigzagtech', canonical_key='zigzagtech')])
+        with self.assertNumQueries(0):
+            self.assertEqual(fuzzy.expand_keys({'zigzagtek', 'zz'}), set())
+        generation = fuzzy.vocabulary_generation()
+        cache.check_indexes()
+        self.assertEqual(fuzzy.expand_keys({'zigzagtek', 'zz'}), {'zigzagtech'})
+        self.assertNotEqual(fuzzy.vocabulary_generation(), generation)
+
+    def test_edit_distance_is_bounded(self):
+        self.assertEqual(fuzzy.edit_distance('djnago', 'django', 2), 1)
+        self.assertEqual(fuzzy.edit_distance('kitten', 'sitting', 1), 2)
+        self.assertEqual(fuzzy.max_distance('js'), 0)
+
+
+class SkillAutocompleteTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        from . import autocomplete
+        for i, skills in enumerate(['Python, PHP', 'Python, Pandas', 'Python', 'PHP']):
+            self.create_profile(f'user{i}', skills=skills)
+        autocomplete.invalidate()  # l'index du processus a pu voir les données d'un autre test
+
+    def test_suggestions_are_ranked_by_popularity_without_queries(self):
+        from . import autocomplete
+        autocomplete.prefix_index()
+        with self.assertNumQueries(0):
+            data = self.client.get('/skills/autocomplete/', {'prefix': 'p'}).json()
+        self.assertEqual(data['results'], ['Python', 'PHP', 'Pandas'])
+        self.assertEqual(self.client.get('/skills/autocomplete/', {'prefix': 'PA'}).json()['results'], ['Pandas'])
+        self.assertEqual(self.client.get('/skills/autocomplete/').json()['results'], [])
+
+    def test_profile_saves_update_popularity(self):
+        from . import autocomplete
+        autocomplete.prefix_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                self.create_profile(f'new{i}', skills='Pandas, Perl')
+            profile = UserProfile.objects.get(user__username='user2')
+            profile.skills = 'Rust'
+            profile.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(autocomplete.suggest('p'), ['Pandas', 'Perl', 'PHP', 'Python'])
+            self.assertEqual(autocomplete.suggest('r'), ['Rust'])
+
+    def test_rolled_back_saves_and_other_workers(self):
+        from django.db import transaction
+        from . import autocomplete, cache
+        from .models import ProfileSkill, Skill
+        autocomplete.prefix_index()
+        try:
+            with transaction.atomic():
+                self.create_profile('ghost', skills='Pascal')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(autocomplete.suggest('pas'), [])
+        # lien écrit par un autre worker : aucun compteur du cache local n'a changé
+        skill = Skill.objects.create(key='pascal', name='Pascal')
+        ProfileSkill.objects.bulk_create([ProfileSkill(profile=UserProfile.objects.first(), skill=skill)])
+        with self.assertNumQueries(0):
+            self.assertEqual(autocomplete.suggest('pas'), [])
+        cache.check_indexes()
+        self.assertEqual(autocomplete.suggest('pas'), ['Pascal'])
+
+
+@plain_static
+@override_settings(TASKS_EAGER=True)
+class ReviewWorkflowTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user('staff', password=PASSWORD, is_staff=True)
+        self.profiles = [
+            self.create_profile(f'user{i}', {'email': f'u{i}@example.com'}, skills='Python') for i in range(3)
+        ]
+        self.client.login(username='staff', password=PASSWORD)
+
+    def test_bulk_validation_is_one_update_and_follow_ups_run_after_commit(self):
+        from django.core import mail
+        from .models import TalentMapCount
+        from . import review
+        ids = [p.pk for p in self.profiles[:2]]
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertNumQueries(2):  # updated_at actuels + UPDATE
+                self.assertEqual(review.apply_review(ids, review.VALIDATE, self.staff), 2)
+        self.assertEqual(len(mail.outbox), 0)  # rien avant le commit
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(TalentMapCount.objects.get(kind='node', education_level='*', language='*').count, 2)
+        self.assertEqual(list(review.review_queue()), [self.profiles[2]])
+        self.assertEqual(UserProfile.objects.get(pk=ids[0]).validated_by, self.staff)
+
+    def test_queue_view_and_api(self):
+        response = self.client.get('/review/')
+        self.assertContains(response, 'user0')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/review/', {'action': 'reject', 'profiles': [self.profiles[0].pk]})
+        self.assertNotContains(self.client.get('/review/'), 'user0')
+        self.assertIsNotNone(UserProfile.objects.get(pk=self.profiles[0].pk).rejected_at)
+
+        response = self.client.post(
+            '/api/review/', {'action': 'validate', 'ids': [self.profiles[1].pk]}, content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'updated': 1})
+        self.assertEqual(self.client.post('/api/review/', {'action': 'x'}, content_type='application/json').status_code, 400)
+        self.client.force_login(self.profiles[2].user)
+        self.assertEqual(self.client.post('/api/review/', {'action': 'validate'}, content_type='application/json').status_code, 403)
+        self.assertEqual(self.client.get('/review/').status_code, 302)
+
+    def test_task_runner_closes_connections_and_logs_failures(self):
+        from . import tasks
+        with self.settings(TASKS_EAGER=False), self.assertLogs('talent_map_app.tasks', 'ERROR'):
+            tasks.submit(lambda: 1 / 0).result()
+
+
+@plain_static
+@override_settings(ASYNC_SEARCH_THREADS=0)  # le pool dédié ne verrait pas la transaction du test
+class AsyncViewsTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer(login=False)
+        self.anonymous = AnonymousUser()
+        self.profile = self.create_profile('alice', skills='Python, Django')
+
+    def call(self, view, path, user, **kwargs):
+        from asgiref.sync import async_to_sync
+        from django.contrib.messages.storage.fallback import FallbackStorage
+        from django.contrib.sessions.backends.db import SessionStore
+        from django.test import RequestFactory
+        request = RequestFactory().get(path)
+        request.user, request.session = user, SessionStore()
+        request._messages = FallbackStorage(request)
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_read_views_match_sync_versions(self):
+        from django.conf import settings
+        from django.http import Http404
+        from . import async_views
+        response = self.call(async_views.search_profiles, '/search/?q=django', self.viewer)
+        self.assertContains(response, 'alice')
+        self.assertEqual(self.call(async_views.profile_detail, '/', self.viewer, pk=self.profile.user_id).status_code, 200)
+        self.assertEqual(self.call(async_views.profile_detail, '/', self.viewer, pk=0)['Location'], '/')
+        self.assertEqual(self.call(async_views.talent_map, '/', self.viewer, pk=self.profile.user_id).status_code, 200)
+        with self.assertRaises(Http404):
+            self.call(async_views.talent_map, '/', self.viewer, pk=0)
+        response = self.call(async_views.search_profiles, '/search/', self.anonymous)
+        self.assertTrue(response['Location'].startswith(settings.LOGIN_URL))
+
+
+class DatabaseTuningTest(TestCase):
+    def test_pragmas_are_applied_to_new_sqlite_connections(self):
+        import os
+        import tempfile
+        from django.db import connection
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+        from . import db
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': os.path.join(directory, 'tuning.sqlite3')}, 'tuning')
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                    cursor.execute('PRAGMA busy_timeout')
+                    self.assertEqual(cursor.fetchone()[0], 5000)
+            finally:
+                wrapper.close()
+        values = db.effective_settings()
+        self.assertEqual((values['synchronous'], values['busy_timeout']), ('normal', 5000))
+        self.assertEqual(db.check_database_settings(databases=['default']), [])
+        with self.settings(SQLITE_PRAGMAS={'synchronous': 'full'}):
+            self.assertEqual([w.id for w in db.check_database_settings(databases=['default'])], ['talent_map_app.W001'])
+            with self.settings(SQLITE_PRAGMAS={'journal_mode': 'wal; DROP TABLE auth_user'}), self.assertRaises(ValueError):
+                db.sqlite_pragmas()
+
+
+@plain_static
+class SignupUniquenessTest(TestCase):
+    def setUp(self):
+        User.objects.create_user('alice', email='alice@example.com', password=PASSWORD)
+
+    def signup(self, username, email):
+        return self.client.post('/signup/', {
+            'username': username, 'email': email, 'password1': 'Sup3r-secret-pw', 'password2': 'Sup3r-secret-pw',
+            'bio': 'Développeuse', 'skills': 'Python', 'education_level': 'licence',
+        })
+
+    def test_database_rejects_case_insensitive_duplicates(self):
+        from django.db import IntegrityError, transaction
+        for fields in ({'username': 'ALICE'}, {'username': 'bob', 'email': 'Alice@Example.com'}):
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                User.objects.create_user(**fields)
+        User.objects.create_user('carol')
+        User.objects.create_user('dave')  # e-mails vides : hors de l'index
+
+    def test_signup_maps_conflicts_to_fields(self):
+        self.assertEqual(self.signup('Alice', 'new@example.com').context['user_form'].errors['username'],
+                         ["Le nom d'utilisateur est déjà utilisé. Choisissez-en un autre."])
+        self.assertIn('email', self.signup('bob', 'ALICE@example.com').context['user_form'].errors)
+        self.assertFalse(User.objects.filter(username='bob').exists())
+        response = self.signup('bob', 'bob@example.com')
+        self.assertRedirects(response, f"/profile/{User.objects.get(username='bob').pk}/", fetch_redirect_response=False)
+
+    def test_conflict_field_comes_from_the_index_name(self):
+        from django.db import IntegrityError
+        from .forms import UserRegistrationForm
+        User.objects.create_user('email.fan', email='fan@example.com')
+        errors = self.signup('EMAIL.fan', 'other@example.com').context['user_form'].errors
+        self.assertEqual(list(errors), ['username'])
+
+        # PostgreSQL : valeur en conflit dans le message (DETAIL), index dans le diagnostic psycopg
+        class Diagnostic:
+            constraint_name = 'auth_user_username_ci'
+        cause = Exception()
+        cause.diag = Diagnostic()
+        exc = IntegrityError('duplicate key value violates unique constraint "auth_user_username_ci"\n'
+                             'DETAIL:  Key (lower(username::text))=(email.fan) already exists.')
+        exc.__cause__ = cause
+        form = UserRegistrationForm({})
+        form.full_clean()
+        form.add_integrity_error(exc)
+        self.assertIn("Le nom d'utilisateur est déjà utilisé. Choisissez-en un autre.", form.errors['username'])
+        self.assertFalse([e for e in form.errors.get('email', []) if e.startswith('Un compte')])
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        from django.db import IntegrityError
+        from .forms import UserRegistrationForm
+        form = UserRegistrationForm({})
+        form.full_clean()
+        exc = IntegrityError('NOT NULL constraint failed: talent_map_app_userprofile.user_id')
+        with self.assertRaises(IntegrityError) as raised:
+            form.add_integrity_error(exc)
+        self.assertIs(raised.exception, exc)
+        self.assertNotIn("Le nom d'utilisateur est déjà utilisé. Choisissez-en un autre.", form.errors['username'])
+
+
+@plain_static
+class SeedAndBenchmarkTest(TestCase):
+    def test_seed_is_deterministic_and_appends(self):
+        from django.core.management import call_command
+        from .seeding import synthetic_records
+        self.assertEqual(list(synthetic_records(5, seed=3)), list(synthetic_records(5, seed=3)))
+        call_command('seed_profiles', '--count', '12', '--batch-size', '5', stdout=StringIO())
+        call_command('seed_profiles', '--count', '3', stdout=StringIO())
+        self.assertEqual(UserProfile.objects.filter(user__username__startswith='seed_').count(), 15)
+        self.assertTrue(UserProfile.objects.filter(user__username='seed_14', parsed_languages__isnull=False).exists())
+
+    def test_benchmark_reports_and_detects_regressions(self):
+        import json
+        import os
+        import tempfile
+        from django.core.management import CommandError, call_command
+        call_command('seed_profiles', '--count', '5', stdout=StringIO())
+        scenarios = ['--scenario', 'search_single', '--scenario', 'profile_detail', '--scenario', 'signup']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            out = StringIO()
+            call_command('benchmark', '--iterations', '2', '--warmup', '0', *scenarios, '--save', path, stdout=out)
+            self.assertIn('profile_detail', out.getvalue())
+            with open(path) as f:
+                baseline = json.load(f)
+            self.assertEqual(baseline['profiles'], 5)
+            self.assertEqual(baseline['results']['profile_detail']['n'], 2)
+            self.assertFalse(User.objects.filter(username__startswith='bench_signup').exists())
+
+            baseline['results']['profile_detail']['queries'] = 0
+            with open(path, 'w') as f:
+                json.dump(baseline, f)
+            with self.assertRaisesMessage(CommandError, 'profile_detail'):
+                call_command('benchmark', '--iterations', '1', '--warmup', '0', '--scenario', 'profile_detail',
+                             '--compare', path, stdout=StringIO())
+
+
+@plain_static
+class PerformanceMiddlewareTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        from . import autocomplete, performance
+        performance.registry.reset()
+        autocomplete.invalidate()
+        self.create_viewer(login=False)
+        self.staff = User.objects.create_user('staff', password=PASSWORD, is_staff=True)
+        self.create_profile('alice', skills='Python, Django')
+
+    def test_server_timing_and_metrics_endpoint(self):
+        import re
+        self.client.login(username='viewer', password=PASSWORD)
+        response = self.client.get('/search/', {'q': 'python'})
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+$')
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+        self.client.login(username='staff', password=PASSWORD)
+        timing = self.client.get('/search/', {'q': 'python'})['Server-Timing']
+        self.assertRegex(timing, r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+$')
+        self.assertGreater(int(re.search(r'"(\d+) queries"', timing).group(1)), 0)
+        body = self.client.get('/metrics/').content.decode()
+        self.assertIn('talent_request_duration_seconds_bucket{view="search",le="+Inf"} 2', body)
+        self.assertIn('talent_recent_requests{view="search",le="+Inf"} 2', body)
+        self.assertIn('talent_requests_total{view="search",status="200"} 2', body)
+        self.assertRegex(body, r'talent_db_queries_total\{view="search"\} [1-9]')
+        self.assertIn('talent_cache_events_total{kind="search",outcome="misses"}', body)
+        self.client.logout()
+        with self.settings(METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+            self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer other').status_code, 403)
+
+    def test_slow_requests_are_logged_with_their_sql(self):
+        self.client.login(username='viewer', password=PASSWORD)
+        with self.settings(SLOW_REQUEST_MS=0), self.assertLogs('talent_map_app.performance', 'WARNING') as logs:
+            self.client.get('/search/', {'q': 'django'})
+        self.assertIn('/search/?q=django', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+    def test_recent_histogram_forgets_old_requests(self):
+        from . import performance
+        with self.settings(METRICS_WINDOW_SECONDS=10):
+            performance.registry.slots[0] = {'search': [1] * (len(performance.BUCKETS) + 1)}
+            self.client.get('/')
+            self.assertEqual(list(performance.registry.window()), ['home'])
+            self.assertEqual(performance.registry.snapshot()[0]['home'][-1], 1)
+
+    @override_settings(SERVER_TIMING_DETAIL=True)
+    async def test_queries_are_counted_under_asgi(self):
+        response = await self.async_client.get('/skills/autocomplete/', {'prefix': 'py'})
+        self.assertEqual(response.json()['results'], ['Python'])
+        self.assertNotIn('desc="0 queries"', response['Server-Timing'])
+
+
+class StaticAssetsTest(TestCase):
+    def test_minifiers_keep_strings_templates_and_regexes(self):
+        from .assets import minify_css, minify_js
+        js = (
+            "const url = 'http://x/*y*/'; // commentaire\n"
+            "const t = `a  ${ {b: 1}.b } // pas un commentaire`;\n"
+            "/* bloc */ let r = s.replace(/\\/\\/+/g, '/') / 2;\n"
+            "function f() {\n    return\n        value\n}\n"
+        )
+        self.assertEqual(minify_js(js), (
+            "const url='http://x/*y*/';const t=`a  ${{b:1}.b} // pas un commentaire`;"
+            "let r=s.replace(/\\/\\/+/g,'/')/ 2;function f(){return\nvalue}\n"
+        ))
+        css = '/* thème */\na :hover, b > i {\n  content: "/* {x} */";\n  margin: 0 auto;\n}\n'
+        self.assertEqual(minify_css(css), 'a :hover,b>i{content:"/* {x} */";margin:0 auto}\n')
+
+    def test_postfix_operators_before_division_and_unreadable_sources(self):
+        import os
+        import tempfile
+        from django.core.files.storage import FileSystemStorage
+        from .assets import MinifiedManifestStaticFilesStorage, minify_js
+        self.assertEqual(minify_js('let i = 0\ni++ / 2\nj-- / 3 // fin\n'), 'let i=0\ni++ / 2\nj-- / 3\n')
+        # source que le minifieur ne sait pas lire : copiée telle quelle
+        with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as root:
+            source = "let s = 'non terminée\n;   \n"
+            os.makedirs(os.path.join(source_dir, 'js'))
+            with open(os.path.join(source_dir, 'js', 'bad.js'), 'w', encoding='utf-8') as f:
+                f.write(source)
+            storage = MinifiedManifestStaticFilesStorage(location=root)
+            os.makedirs(os.path.join(root, 'js'))
+            with self.assertLogs('talent_map_app.assets', 'WARNING'):
+                self.assertTrue(storage.minify('js/bad.js', FileSystemStorage(location=source_dir), 'js/bad.js'))
+            with open(os.path.join(root, 'js', 'bad.js'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), source)
+
+    def test_collectstatic_minifies_precompresses_and_serves_immutable(self):
+        import json
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from django.conf import settings
+        from .assets import brotli
+
+        with tempfile.TemporaryDirectory() as root, self.settings(STATIC_ROOT=root):
+            call_command('collectstatic', interactive=False, ignore_patterns=['admin'], verbosity=0)
+            with open(os.path.join(root, 'staticfiles.json')) as f:
+                hashed = json.load(f)['paths']['js/search.js']
+            source = os.path.join(settings.BASE_DIR, 'talent_map_app', 'static', 'js', 'search.js')
+            self.assertLess(os.path.getsize(os.path.join(root, hashed)), os.path.getsize(source))
+            self.assertTrue(os.path.exists(os.path.join(root, hashed + '.gz')))
+            self.assertEqual(os.path.exists(os.path.join(root, hashed + '.br')), brotli is not None)
+
+            response = self.client.get(settings.STATIC_URL + hashed)
+            self.assertIn('immutable', response['Cache-Control'])
+            response.close()
+
+            # chaque page ne charge que son module, en différé
+            self.client.force_login(User.objects.create_user('viewer'))
+            page = self.client.get('/search/').content.decode()
+            self.assertIn(f'src="{settings.STATIC_URL}{hashed}" defer', page)
+            self.assertNotIn('js/talent-map', page)
+            self.assertNotIn(settings.STATIC_URL + 'js/', self.client.get('/').content.decode())
+
+
+@plain_static
+class FacetCountsTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.create_viewer(login=False)
+        for name, level, languages, skills in (
+            ('alice', 'master', 'Français, Anglais', 'Python, Django'),
+            ('bob', 'master', 'Anglais', 'Python, SQL'),
+            ('carol', 'licence', 'Espagnol, ANGLAIS', 'Java'),
+            ('dave', 'bac', 'Français', 'Python'),
+        ):
+            self.create_profile(name, education_level=level, languages=languages, skills=skills)
+
+    def facets(self, **data):
+        from .facets import search_facets
+        from .forms import SearchForm
+        from .search import search_criteria
+        form = SearchForm(data)
+        form.is_valid()
+        return search_facets(search_criteria(form.cleaned_data))
+
+    def test_counts_in_one_query_ignoring_own_filter(self):
+        fuzzy.skill_index()  # index des compétences déjà chargé par le worker
+        with self.assertNumQueries(1):
+            facets = self.facets(q='python', education_level='master', language='anglais')
+        # niveaux : python + anglais ; langues : python + master ; compétences : tous les filtres
+        self.assertEqual(facets.education_level, [
+            ('bac', 'Baccalauréat', 0), ('licence', 'Licence', 0), ('master', 'Master', 2), ('Ingénieur', 'Ingénieur', 0),
+        ])
+        self.assertEqual(facets.language, [('Anglais', 2), ('Français', 1)])
+        self.assertEqual(facets.skills, [('Python', 2), ('Django', 1), ('SQL', 1)])
+        # graphies regroupées sous la plus fréquente, sans filtre
+        self.assertEqual(self.facets().language, [('Anglais', 3), ('Français', 2), ('Espagnol', 1)])
+
+    def test_cached_per_criteria_until_a_profile_changes(self):
+        self.facets(q='python', sort_by='oldest')
+        fuzzy.skill_index()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.facets(q='Python ', sort_by='newest').skills[0], ('Python', 3))
+        profile = UserProfile.objects.get(user__username='carol')
+        profile.skills = 'Java, Python'
+        profile.save()
+        self.assertEqual(self.facets(q='python').skills[0], ('Python', 4))
+
+    def test_search_page_shows_counts(self):
+        self.client.login(username='viewer', password=PASSWORD)
+        page = self.client.get('/search/', {'q': 'python'}).content.decode()
+        self.assertIn('<option value="master">Master (2)</option>', page)
+        self.assertIn('href="/search/?q=python&amp;language=Fran%C3%A7ais"', page)
+
+
+@plain_static
+class SimilarProfilesTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        self.create_viewer(login=False)
+        self.profiles = {}
+        for name, skills, passions, languages in (
+            ('alice', 'Python, Django, SQL', 'IA', 'Français'),
+            ('bob', 'python, DJANGO, sql', 'ia', 'francais'),
+            ('carol', 'Python, Django, SQL', 'Web', 'Français'),
+            ('dave', 'Cobol', 'Pêche', 'Allemand'),
+        ):
+            self.profiles[name] = self.create_profile(name, skills=skills, passions=passions, languages=languages)
+
+    def neighbors(self, name):
+        return list(self.profiles[name].similar_profiles.order_by('rank').values_list('similar__user__username', 'score'))
+
+    def test_minhash_estimates_jaccard(self):
+        from .similarity import MinHasher, estimate, jaccard
+        a = frozenset(f'x{i}' for i in range(100))
+        b = frozenset(f'x{i}' for i in range(50, 150))
+        hasher = MinHasher()
+        self.assertAlmostEqual(jaccard(a, b), 1 / 3)
+        self.assertAlmostEqual(estimate(hasher.signature(a), hasher.signature(b)), 1 / 3, delta=0.15)
+        self.assertEqual(estimate(hasher.signature(a), hasher.signature(set(a))), 1.0)
+
+    def test_build_and_incremental_update(self):
+        from django.core.management import call_command
+        call_command('build_similarity', stdout=StringIO())
+        # mêmes éléments à la casse et aux accents près ; carol : 4 communs sur 6
+        self.assertEqual(self.neighbors('alice'), [('bob', 1.0), ('carol', 0.6667)])
+        self.assertEqual(self.neighbors('dave'), [])
+
+        dave = self.profiles['dave']
+        dave.skills, dave.passions, dave.languages = 'Python, Django, SQL', 'Web', 'Français'
+        dave.save()
+        out = StringIO()
+        call_command('build_similarity', '--incremental', stdout=out)
+        self.assertIn('4 profils recalculés', out.getvalue())
+        self.assertEqual(self.neighbors('dave'), [('carol', 1.0), ('alice', 0.6667), ('bob', 0.6667)])
+        self.assertEqual(self.neighbors('carol')[0], ('dave', 1.0))
+
+    def test_detail_page_panel(self):
+        from django.core.management import call_command
+        call_command('build_similarity', stdout=StringIO())
+        self.client.login(username='viewer', password=PASSWORD)
+        page = self.client.get(f"/profile/{self.profiles['alice'].user_id}/").content.decode()
+        self.assertIn('id="similar-profiles"', page)
+        self.assertIn(f'href="/profile/{self.profiles["bob"].user_id}/"', page)
+        self.assertIn('100 %', page)
+        page = self.client.get(f"/profile/{self.profiles['dave'].user_id}/").content.decode()
+        self.assertNotIn('similar-profiles', page)
+
+
+class StartupTest(TestCase):
+    def test_wait_for_database_retries_then_gives_up(self):
+        import os
+        import tempfile
+        from django.db import OperationalError, connection
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+        from .startup import wait_for_database
+        self.assertEqual(wait_for_database(connection), 1)
+        with tempfile.TemporaryDirectory() as directory:
+            missing = os.path.join(directory, 'absent', 'db.sqlite3')
+            wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': missing}, 'missing')
+            with self.assertRaises(OperationalError):
+                wait_for_database(wrapper, timeout=0.5, interval=0.1)
+
+    def test_release_check(self):
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('release', '--check', stdout=out)
+        self.assertIn('Aucune migration en attente', out.getvalue())
+
+    def test_startup_report_runs_in_a_fresh_process(self):
+        import json
+        import os
+        import tempfile
+        from django.core.management import call_command
+        out = StringIO()
+        previous = os.environ.get('DATABASE_URL')
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'startup.sqlite3')}"
+            try:
+                call_command('startup_report', '--json', '--path', '/login/', stdout=out, stderr=StringIO())
+            finally:
+                if previous is None:
+                    del os.environ['DATABASE_URL']
+                else:
+                    os.environ['DATABASE_URL'] = previous
+        report = json.loads(out.getvalue())
+        self.assertEqual(list(report['phases']), ['interpreter', 'import', 'settings', 'setup', 'middleware', 'urls'])
+        self.assertEqual(report['requests']['/login/']['status'], 200)
+        self.assertGreater(report['total'], sum(report['phases'].values()))
+
+
+@plain_static
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db', AUTH_USER_CACHE_TIMEOUT=300)
+class SessionCachingTest(ProfileFixtures, TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.create_viewer(skills='Python')
+        self.create_profile('alice', skills='Python')
+        fuzzy.skill_index()
+
+    def test_cached_session_and_user_skip_auth_queries(self):
+        self.client.get('/search/', {'q': 'python'})
+        # session et utilisateur en cache, résultats de recherche en cache : seule la page est chargée
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/search/', {'q': 'python'}).status_code, 200)
+        self.viewer.is_staff = True
+        self.viewer.save(update_fields=['is_staff'])
+        with self.assertNumQueries(2):
+            response = self.client.get('/search/', {'q': 'python'})
+        self.assertTrue(response.wsgi_request.user.is_staff)
+
+    def test_cached_user_leaves_out_the_password_hash(self):
+        from django.core.cache import cache
+        from .sessions import user_cache_key
+        self.client.get('/search/')
+        self.assertNotIn(self.viewer.password, repr(cache.get(user_cache_key(self.viewer.pk))))
+        user = self.client.get('/search/').wsgi_request.user
+        self.assertEqual((user.pk, user.username, user.is_active), (self.viewer.pk, 'viewer', True))
+        self.assertIn('password', user.get_deferred_fields())
+        with self.assertNumQueries(1):  # relu en base à la demande
+            self.assertEqual(user.password, self.viewer.password)
+
+    def test_password_change_ends_other_sessions(self):
+        self.client.get('/search/')
+        self.viewer.set_password('another-pass-456')
+        self.viewer.save()
+        self.assertEqual(self.client.get('/search/').status_code, 302)
+
+    def test_current_profile_is_loaded_once(self):
+        from django.test import RequestFactory
+        from .sessions import current_profile
+        request = RequestFactory().get('/')
+        request.user = self.viewer
+        with self.assertNumQueries(1):
+            self.assertEqual(current_profile(request).user_id, self.viewer.pk)
+            current_profile(request)
+
+    def test_purge_sessions(self):
+        from datetime import timedelta
+        from django.contrib.sessions.models import Session
+        from django.core.management import call_command
+        from django.utils import timezone
+        for i in range(5):
+            Session.objects.create(session_key=f'expired{i}', session_data='', expire_date=timezone.now() - timedelta(days=1))
+        out = StringIO()
+        call_command('purge_sessions', '--batch-size', '2', stdout=out)
+        self.assertIn('5 session(s)', out.getvalue())
+        self.assertEqual(Session.objects.count(), 1)  # session du visiteur connecté
+
+
+@plain_static
+@override_settings(DATABASE_REPLICAS=['replica1'], DATABASE_ROUTERS=['talent_map_app.replicas.ReplicaRouter'])
+class ReadReplicaTest(ProfileFixtures, TransactionTestCase):
+    """Deux bases SQLite : la base de test (principale) et une réplique dans un fichier temporaire."""
+
+    @classmethod
+    def setUpClass(cls):
+        import tempfile
+        from django.db import connections
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.settings['replica1'] = {
+            **connections.settings['default'], 'NAME': f'{cls.directory.name}/replica.sqlite3', 'TEST': {},
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        from django.db import connections
+        connections['replica1'].close()
+        del connections['replica1']
+        del connections.settings['replica1']
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.core.management import call_command
+        cache.clear()
+        self.create_viewer(bio='Première version', skills='Python')
+        call_command('sync_replicas', stdout=StringIO())
+        # écrite après la copie : absente de la réplique
+        self.bob = self.create_profile('bob', skills='Python').user
+
+    def test_read_views_use_replica(self):
+        self.assertEqual(self.client.get(f'/api/profiles/{self.bob.pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/profile/{self.bob.pk}/map/').status_code, 404)
+        response = self.client.get('/api/profiles/')
+        self.assertEqual([p['username'] for p in response.json()['results']], [])
+        # hors des vues de lecture, tout reste sur la base principale
+        self.assertEqual(UserProfile.objects.count(), 2)
+
+    def test_reads_after_write_stay_on_primary(self):
+        from .replicas import PIN_COOKIE
+        response = self.client.post(f'/profile/{self.viewer.pk}/edit/', {
+            'bio': 'Deuxième version', 'skills': 'Python, Django', 'education_level': 'master', 'languages': 'English',
+        }, follow=True)
+        self.assertContains(response, 'Deuxième version')
+        self.assertIn(PIN_COOKIE, self.client.cookies)
+        self.assertEqual(self.client.get(f'/api/profiles/{self.bob.pk}/').status_code, 200)
+
+    def test_router_rules(self):
+        from django.db import router, transaction
+        from .replicas import read_replica
+
+        @read_replica
+        def view(request):
+            before = router.db_for_read(UserProfile)
+            with transaction.atomic():
+                in_transaction = router.db_for_read(UserProfile)
+            router.db_for_write(UserProfile)
+            return before, in_transaction, router.db_for_read(UserProfile)
+
+        from django.test import RequestFactory
+        self.assertEqual(view(RequestFactory().get('/')), ('replica1', 'default', 'default'))
+        self.assertEqual(router.db_for_read(UserProfile), 'default')
+        self.assertFalse(router.allow_migrate('replica1', 'talent_map_app'))
@@ -1,6 +1,13 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from . import views
+from . import views, api
+
+if settings.TALENT_ASYNC_VIEWS:
+    # servies par asgi.py : versions asynchrones des vues de lecture
+    from . import async_views as read_views
+else:
+    read_views = views
 
 urlpatterns = [
     # Page d'accueil
@@ -13,10 +20,29 @@ urlpatterns = [
     
     # Profil
     path('profile/create/', views.profile_create, name='profile_create'),
-    path('profile/<int:pk>/', views.profile_detail, name='profile_detail'),
+    path('profile/<int:pk>/', read_views.profile_detail, name='profile_detail'),
     path('profile/<int:pk>/edit/', views.profile_edit, name='profile_edit'),
     
     # Recherche
-    path('search/', views.search_profiles, name='search'),
-    path('profile/<int:pk>/map/', views.talent_map, name='talent_map'),
+    path('search/', read_views.search_profiles, name='search'),
+    path('profile/<int:pk>/map/', read_views.talent_map, name='talent_map'),
+    path('talent-map/', views.organization_map, name='organization_map'),
+
+    # API JSON (lecture seule)
+    path('api/profiles/', api.profiles, name='api_profiles'),
+    path('api/search/', api.profiles, name='api_search'),
+    path('api/profiles/<int:pk>/', api.profile_detail, name='api_profile_detail'),
+    path('api/profiles/<int:pk>/map/', api.talent_map, name='api_talent_map'),
+    path('api/talent-map/', api.organization_map, name='api_organization_map'),
+    path('skills/autocomplete/', api.skill_autocomplete, name='skill_autocomplete'),
+    path('api/match/', api.match, name='api_match'),
+    path('api/review/', api.review_profiles, name='api_review'),
+    path('api/collaborations/<int:pk>/matches/', api.collaboration_matches, name='api_collaboration_matches'),
+
+    # Revue des profils (staff)
+    path('review/', views.review_queue, name='review_queue'),
+
+    # Exploitation
+    path('cache/stats/', views.cache_stats, name='cache_stats'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
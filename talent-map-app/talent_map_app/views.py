@@ -1,48 +1,55 @@
 from django.shortcuts import render, redirect
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.utils.crypto import constant_time_compare
 from django.contrib import messages
 from django.contrib.auth import login
 from .models import UserProfile
+from .search import search_criteria, search_page
+from .facets import search_facets
+from .replicas import read_replica
+from .similarity import similar_profiles
+from . import cache as fragment_cache
+from . import performance, review
 from .forms import UserRegistrationForm, UserProfileForm, SearchForm
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
 from django.db import IntegrityError, transaction
-from django.contrib.auth.models import User
-import re
 
 def home(request):
-    """Page d'accueil"""
-    return render(request, 'home.html')
+    """Page d'accueil (mise en cache pour les visiteurs anonymes sans message en attente)"""
+    cacheable = not request.user.is_authenticated and not len(messages.get_messages(request))
+    if cacheable:
+        content = fragment_cache.get_page('home_anonymous')
+        if content is not None:
+            return HttpResponse(content)
+    response = render(request, 'home.html')
+    if cacheable:
+        fragment_cache.set_page('home_anonymous', response.content)
+    return response
 
 def signup(request):
     """
     Inscription : crée l'utilisateur + son profile si les deux formulaires sont valides.
-    Protection contre doublons de username (unique constraint).
+    Doublons de username / e-mail (casse ignorée) : rejetés par les index uniques de la base.
     """
     if request.method == 'POST':
         user_form = UserRegistrationForm(request.POST)
         profile_form = UserProfileForm(request.POST, request.FILES)
         if user_form.is_valid() and profile_form.is_valid():
-            username = user_form.cleaned_data.get('username')
-            email = user_form.cleaned_data.get('email', '')
-            # double-check existence avant tentative d'insertion
-            if User.objects.filter(username__iexact=username).exists():
-                messages.error(request, "Le nom d'utilisateur est déjà utilisé. Choisissez-en un autre.")
-            else:
-                try:
-                    with transaction.atomic():
-                        user = user_form.save(commit=False)
-                        user.email = email
-                        user.save()  # création user
-                        profile = profile_form.save(commit=False)
-                        profile.user = user
-                        profile.save()
-                        login(request, user)
-                        messages.success(request, "Compte créé et profil enregistré.")
-                        return redirect('profile_detail', pk=user.profile.pk)
-                except IntegrityError:
-                    # protège contre race condition ou insertion concurrente
-                    messages.error(request, "Erreur lors de la création du compte : nom d'utilisateur déjà utilisé.")
+            try:
+                with transaction.atomic():
+                    user = user_form.save()  # création user
+                    profile = profile_form.save(commit=False)
+                    profile.user = user
+                    profile.save()
+                login(request, user)
+                messages.success(request, "Compte créé et profil enregistré.")
+                return redirect('profile_detail', pk=user.pk)
+            except IntegrityError as exc:
+                # compte existant, y compris inscription concurrente ; les autres violations sont relevées
+                user_form.add_integrity_error(exc)
+                messages.error(request, "Corrigez les erreurs du formulaire.")
         else:
             messages.error(request, "Corrigez les erreurs du formulaire.")
     else:
@@ -77,22 +84,23 @@ def profile_create(request):
 
     return render(request, 'profile/create.html', {'form': form, 'profile': profile})
 
+@read_replica
 @login_required
 def profile_detail(request, pk):
     """Détail du profil"""
     try:
-        profile = UserProfile.objects.get(user__id=pk)
+        profile = UserProfile.objects.select_related('user').get(user__id=pk)
     except UserProfile.DoesNotExist:
         messages.error(request, 'Profil non trouvé.')
         return redirect('home')
     
-    return render(request, 'profile/detail.html', {'profile': profile})
+    return render(request, 'profile/detail.html', {'profile': profile, 'similar': similar_profiles(profile)})
 
 @login_required
 def profile_edit(request, pk):
     """Édition du profil"""
     try:
-        profile = UserProfile.objects.get(user__id=pk)
+        profile = UserProfile.objects.select_related('user').get(user__id=pk)
     except UserProfile.DoesNotExist:
         messages.error(request, 'Profil non trouvé.')
         return redirect('home')
@@ -100,7 +108,9 @@ def profile_edit(request, pk):
     if request.method == 'POST':
         form = UserProfileForm(request.POST, instance=profile)
         if form.is_valid():
-            form.save()
+            profile = form.save(commit=False)
+            profile.rejected_at = None  # un profil refusé puis modifié revient dans la file de revue
+            profile.save()
             messages.success(request, 'Profil mis à jour !')
             return redirect('profile_detail', pk=pk)
     else:
@@ -108,45 +118,51 @@ def profile_edit(request, pk):
     
     return render(request, 'profile/edit.html', {'form': form, 'profile': profile})
 
+def search_results(request, user_id):
+    """Gabarit et contexte de la page de recherche (partagés avec la vue asynchrone)."""
+    form = SearchForm(request.GET or None)
+    criteria = search_criteria(form.cleaned_data if form.is_valid() else None)
+    page = search_page(criteria, request.GET, exclude_user_id=user_id)
+
+    next_url = None
+    if page.has_next:
+        params = request.GET.copy()
+        for name in ('page', 'cursor', 'partial'):
+            params.pop(name, None)
+        params.update(page.next_params)
+        next_url = f"{request.path}?{params.urlencode()}"
+
+    context = {'form': form, 'results': page, 'next_url': next_url}
+    if request.GET.get('partial'):
+        # "Charger plus" : uniquement le fragment de la page suivante
+        return 'search/_results_page.html', context
+
+    facets = search_facets(criteria)
+    form.show_counts(facets)
+    context['facets'] = {
+        'language': [
+            (label, count, _facet_url(request, language=label), criteria.language == label.lower())
+            for label, count in facets.language
+        ],
+        'skills': [(label, count, _facet_url(request, q=label)) for label, count in facets.skills],
+    }
+    return 'search/search.html', context
+
+def _facet_url(request, **params):
+    """URL de la recherche courante avec `params` remplacés (retour à la première page)."""
+    query = request.GET.copy()
+    for name in ('page', 'cursor', 'partial'):
+        query.pop(name, None)
+    for name, value in params.items():
+        query[name] = value
+    return f"{request.path}?{query.urlencode()}"
+
+@read_replica
 @login_required
 def search_profiles(request):
     """Affiche tous les profils (sauf l'utilisateur connecté) et applique les filtres du SearchForm."""
-    form = SearchForm(request.GET or None)
-    qs = UserProfile.objects.all()
-    if request.user.is_authenticated:
-        qs = qs.exclude(user=request.user)
-
-    if form.is_valid():
-        q = (form.cleaned_data.get('q') or '').strip()
-        education = form.cleaned_data.get('education_level')
-        language = form.cleaned_data.get('language')
-        sort_by = form.cleaned_data.get('sort_by')
-
-        if q:
-            terms = [t for t in re.split(r'[,;]\s*|\s+', q) if t]
-            q_filter = Q()
-            for term in terms:
-                q_filter |= (
-                    Q(skills__icontains=term) |
-                    Q(bio__icontains=term) |
-                    Q(user__username__icontains=term) |
-                    Q(user__first_name__icontains=term) |
-                    Q(user__last_name__icontains=term)
-                )
-            qs = qs.filter(q_filter)
-
-        if education:
-            qs = qs.filter(education_level=education)
-
-        if language:
-            qs = qs.filter(languages__icontains=language)
-
-        if sort_by == 'newest':
-            qs = qs.order_by('-user__date_joined')
-        elif sort_by == 'oldest':
-            qs = qs.order_by('user__date_joined')
-
-    return render(request, 'search/search.html', {'form': form, 'results': qs})
+    template, context = search_results(request, request.user.pk)
+    return render(request, template, context)
 
 # exposer la même vue sous le nom attendu par les URLs
 search = search_profiles
@@ -156,18 +172,53 @@ def redirect_to_profile(request):
     """Redirige /accounts/profile/ vers le détail du profil de l'utilisateur connecté."""
     return redirect('profile_detail', pk=request.user.id)
 
+@read_replica
 @login_required
 def talent_map(request, pk):
     """
     Affiche la visualisation / carte d'un profil donné.
     URL attendue : profile/<int:pk>/map/
     """
-    profile = get_object_or_404(UserProfile, user__id=pk)
+    profile = get_object_or_404(UserProfile.objects.select_related('user'), user__id=pk)
     
     # Préparer les données pour la visualisation JavaScript
-    talent_data = {
-        'skills': profile.skills_list,
-        'passions': [p.strip() for p in (profile.passions or '').split(',') if p.strip()],
-    }
+    talent_data = profile.talent_data()
     
-    return render(request, 'talent_map/visualization.html', {'profile': profile, 'talent_data': talent_data})
\ No newline at end of file
+    return render(request, 'talent_map/visualization.html', {'profile': profile, 'talent_data': talent_data})
+
+@login_required
+def organization_map(request):
+    """Carte des talents de toute l'organisation (graphe chargé depuis /api/talent-map/)."""
+    form = SearchForm(request.GET or None)
+    return render(request, 'talent_map/organization.html', {'form': form})
+
+@user_passes_test(lambda u: u.is_staff)
+def review_queue(request):
+    """File de revue des profils en attente ; validation / refus par lot (une seule requête UPDATE)."""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        ids = [int(pk) for pk in request.POST.getlist('profiles') if pk.isdigit()]
+        if action not in review.ACTIONS or not ids:
+            messages.error(request, "Sélectionnez au moins un profil et une action.")
+        else:
+            count = review.apply_review(ids, action, request.user)
+            verb = 'validé(s)' if action == review.VALIDATE else 'refusé(s)'
+            messages.success(request, f"{count} profil(s) {verb}.")
+        return redirect('review_queue')
+
+    page = review.queue_page(request.GET.get('cursor'))
+    next_url = f"{request.path}?cursor={page.next_params['cursor']}" if page.has_next else None
+    return render(request, 'review/queue.html', {'results': page, 'next_url': next_url})
+
+@user_passes_test(lambda u: u.is_staff)
+def cache_stats(request):
+    """Compteurs hit/miss du cache de fragments (processus courant), réservé au staff."""
+    return JsonResponse(fragment_cache.cache_stats())
+
+def metrics(request):
+    """Mesures de performance du processus courant au format Prometheus (staff ou jeton METRICS_TOKEN)."""
+    token = settings.METRICS_TOKEN
+    bearer = request.headers.get('Authorization', '')
+    if not (request.user.is_staff or (token and constant_time_compare(bearer, f'Bearer {token}'))):
+        return HttpResponseForbidden()
+    return HttpResponse(performance.prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,19 @@
+"""
+ASGI config for talent_map_project.
+
+Point d'entrée des serveurs ASGI (uvicorn, ou gunicorn avec `-k uvicorn.workers.UvicornWorker`).
+Les vues de lecture (recherche, détail, carte) y sont servies par leurs versions
+asynchrones (`talent_map_app.async_views`).
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_map_project.settings')
+os.environ.setdefault('TALENT_ASYNC_VIEWS', '1')
+
+application = get_asgi_application()
+
+# vérification de fond des index en mémoire (INDEX_RECHECK_SECONDS), une par worker
+from talent_map_app.cache import start_index_watcher  # noqa: E402
+start_index_watcher()
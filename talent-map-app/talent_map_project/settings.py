@@ -53,7 +53,8 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # moteur Django standard, rendus chronométrés (talent_map_app.performance)
+        'BACKEND': 'talent_map_app.performance.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'talent_map_app', 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -72,11 +73,15 @@ TEMPLATES = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'talent_map_app.performance.PerformanceMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # AuthenticationMiddleware avec cache de l'utilisateur connecté (AUTH_USER_CACHE_TIMEOUT)
+    'talent_map_app.sessions.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    # après une écriture, lectures du visiteur sur la base principale (sans effet sans réplique)
+    'talent_map_app.replicas.PrimaryPinMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -91,9 +96,16 @@ WSGI_APPLICATION = 'talent_map_project.wsgi.application'
 
 # Utiliser PostgreSQL si DATABASE_URL est disponible, sinon SQLite pour le développement local
 DATABASE_URL = os.environ.get('DATABASE_URL')
+# Connexions persistantes (secondes, 0 = une connexion par requête), vérifiées avant réutilisation
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+# PostgreSQL : délai de connexion (s) et durée maximale d'une requête SQL (ms, 0 = illimitée)
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', '5'))
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '0'))
+# Derrière PgBouncer (mode transaction) : le pool est externe, pas de curseurs côté serveur
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', '0') == '1'
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True)
     }
 else:
     DATABASES = {
@@ -103,6 +115,123 @@ else:
         }
     }
 
+# Répliques en lecture (talent_map_app.replicas) : URL séparées par des virgules, alias replica1, replica2...
+# Seules les vues de consultation y lisent ; REPLICA_PIN_SECONDS : durée (s) pendant laquelle un
+# visiteur qui vient d'écrire lit sur la base principale (au-dessus du retard de réplication)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+DATABASE_REPLICAS = []
+for number, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    alias = f'replica{number}'
+    DATABASES[alias] = dj_database_url.parse(url, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True)
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}  # tests : même base que default
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['talent_map_app.replicas.ReplicaRouter'] if DATABASE_REPLICAS else []
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '10'))
+
+for database in DATABASES.values():
+    if database['ENGINE'] != 'django.db.backends.postgresql':
+        continue
+    pg_options = database.setdefault('OPTIONS', {})
+    pg_options['connect_timeout'] = DB_CONNECT_TIMEOUT
+    if DB_STATEMENT_TIMEOUT_MS:
+        pg_options['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+    if DB_PGBOUNCER:
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# PRAGMA appliqués à chaque nouvelle connexion SQLite (talent_map_app.db) : WAL permet de lire
+# pendant une écriture, synchronous=NORMAL suffit en WAL (pas de corruption, seul le dernier commit
+# peut être perdu en cas de coupure de courant), busy_timeout : attente (ms) d'un verrou
+# d'écriture avant l'erreur "database is locked"
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+}
+
+# Moteur de recherche plein texte : 'auto' = PostgreSQL (tsvector/GIN) ou SQLite (FTS5) selon DATABASE_URL,
+# sinon chemin pointé vers une classe de talent_map_app.fulltext
+TALENT_SEARCH_BACKEND = os.environ.get('TALENT_SEARCH_BACKEND', 'auto')
+
+# Nombre de profils par page de résultats (le reste est chargé via "Charger plus")
+SEARCH_PAGE_SIZE = int(os.environ.get('SEARCH_PAGE_SIZE', '20'))
+
+# Cache des résultats de recherche (listes d'ids par critères normalisés, LRU par processus)
+SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', '256'))  # 0 = désactivé
+SEARCH_CACHE_TTL = int(os.environ.get('SEARCH_CACHE_TTL', '60'))
+SEARCH_CACHE_MAX_IDS = int(os.environ.get('SEARCH_CACHE_MAX_IDS', '5000'))
+
+# Cache (fragments de profils, page d'accueil anonyme)
+# CACHE_BACKEND : 'locmem' (défaut), 'file' ou chemin d'un backend Django (ex. django.core.cache.backends.redis.RedisCache)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_LOCATION = os.environ.get('CACHE_LOCATION', '')
+if CACHE_BACKEND == 'locmem':
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': CACHE_LOCATION or 'talent-map',
+    }}
+elif CACHE_BACKEND == 'file':
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_LOCATION or os.path.join(BASE_DIR, '.cache'),
+    }}
+else:
+    CACHES = {'default': {'BACKEND': CACHE_BACKEND, 'LOCATION': CACHE_LOCATION}}
+
+# Durée de vie (secondes) des fragments et pages en cache
+TALENT_CACHE_TIMEOUT = int(os.environ.get('TALENT_CACHE_TIMEOUT', '600'))
+
+# Index gardés en mémoire par processus (matrice de correspondance, vocabulaire, autocomplétion) :
+# avec locmem, les compteurs de génération ne voient pas les écritures des autres workers ; un
+# thread de fond par worker compare les index à la base toutes les INDEX_RECHECK_SECONDS (0 = jamais).
+INDEX_RECHECK_SECONDS = float(os.environ.get('INDEX_RECHECK_SECONDS', '5' if CACHE_BACKEND == 'locmem' else '0'))
+
+# Sessions et utilisateur connecté (talent_map_app.sessions). SESSION_MODE : 'db' (une lecture
+# de la table par requête), 'cached_db' (cache, base en secours), 'cache' ou 'signed_cookies'
+# (aucune table, sessions non révocables côté serveur). Les modes en cache, comme le cache de
+# l'utilisateur (secondes, 0 = désactivé), supposent un cache partagé entre processus :
+# désactivés par défaut avec locmem.
+SHARED_CACHE = CACHE_BACKEND != 'locmem'
+SESSION_MODE = os.environ.get('SESSION_MODE', 'cached_db' if SHARED_CACHE else 'db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_MODE]
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', '300' if SHARED_CACHE else '0'))
+# Agrégats mis en cache par génération (facettes, carte de l'organisation) : avec locmem, les autres
+# workers ne voient pas l'invalidation et servent l'ancienne valeur jusqu'à expiration
+GENERATION_CACHE_TIMEOUT = int(os.environ.get(
+    'GENERATION_CACHE_TIMEOUT', str(TALENT_CACHE_TIMEOUT) if SHARED_CACHE else '60',
+))
+# Messages flash dans un cookie : ils n'écrivent jamais dans la session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Vues de lecture asynchrones (activé par asgi.py ; sans effet utile sous WSGI)
+TALENT_ASYNC_VIEWS = os.environ.get('TALENT_ASYNC_VIEWS', '0') == '1'
+# Threads exécutant en parallèle les recherches des vues asynchrones (par processus)
+ASYNC_SEARCH_THREADS = int(os.environ.get('ASYNC_SEARCH_THREADS', '4'))
+
+# Mesures par requête (talent_map_app.performance) : en-tête Server-Timing, histogrammes
+# exposés sur /metrics/ (staff, ou en-tête "Authorization: Bearer <METRICS_TOKEN>" pour Prometheus)
+PERFORMANCE_METRICS = os.environ.get('PERFORMANCE_METRICS', '1') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Requêtes journalisées avec leur SQL au-delà de cette durée (ms)
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', '500'))
+# Détail SQL/gabarits de Server-Timing pour tous les visiteurs (sinon DEBUG ou staff seulement)
+SERVER_TIMING_DETAIL = os.environ.get('SERVER_TIMING_DETAIL', '0') == '1'
+# Fenêtre glissante (s) de l'histogramme "talent_recent_requests" de /metrics/
+METRICS_WINDOW_SECONDS = int(os.environ.get('METRICS_WINDOW_SECONDS', '300'))
+
+# Tâches de fond (talent_map_app.tasks) : pool de threads local, sans broker.
+# TASKS_EAGER=1 les exécute immédiatement dans la requête (tests, débogage).
+TASK_WORKERS = int(os.environ.get('TASK_WORKERS', '2'))
+TASKS_EAGER = os.environ.get('TASKS_EAGER', '0') == '1'
+
+# E-mails (notifications de validation) : console par défaut, SMTP en production
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@talent-map.local')
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -141,8 +270,11 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'talent_map_app', 'static')]
 
-# WhiteNoise pour servir les fichiers statiques en production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise pour servir les fichiers statiques en production : collectstatic minifie js/ et css/,
+# ajoute l'empreinte aux noms et précompresse (gzip, brotli si le paquet Brotli est installé).
+# Fichiers à empreinte : Cache-Control immuable (10 ans) ; les autres : WHITENOISE_MAX_AGE.
+STATICFILES_STORAGE = 'talent_map_app.assets.MinifiedManifestStaticFilesStorage'
+WHITENOISE_MAX_AGE = int(os.environ.get('WHITENOISE_MAX_AGE', 0 if DEBUG else 3600))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
@@ -9,4 +9,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_map_project.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# vérification de fond des index en mémoire (INDEX_RECHECK_SECONDS), une par worker
+from talent_map_app.cache import start_index_watcher  # noqa: E402
+start_index_watcher()